@@ -0,0 +1,61 @@
+"""Compare wall time of sequential /mcp-compat/invoke calls vs one /mcp-compat/batch.
+
+Runs the XMCP app under uvicorn in front of a fake HRMS that answers every
+request after a fixed delay, then issues the same independent reads both ways.
+
+Usage::
+
+    python benchmarks/bench_batch.py [hrms_delay_ms]
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import time
+
+import httpx
+
+from bench_tool_dispatch import _start_fake_hrms, _start_xmcp
+from soak_compat_registry import _free_port
+
+ITEMS = [
+    {"name": "get_holidays", "arguments": {"leaveDate": "2025-01-01"}},
+    {"name": "get_financial_years", "arguments": {}},
+    {"name": "get_leaves", "arguments": {"fyId": "2025-26"}},
+    {"name": "get_feedback_levels", "arguments": {}},
+    {"name": "get_rm_feedbacks", "arguments": {}},
+]
+
+
+def main(delay_ms: float) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    # Measure raw fan-out, not the response cache
+    os.environ["XMCP_CACHE_ENABLED"] = "0"
+    hrms = _start_fake_hrms()
+    hrms.delay = delay_ms / 1000
+    port = _free_port()
+    os.environ["HRMS_API_BASE_URL"] = hrms.base_url
+    os.environ["XMCP_LOCAL_BASE_URL"] = f"http://127.0.0.1:{port}"
+    base_url = _start_xmcp(port)
+
+    with httpx.Client(base_url=base_url, headers={"Authorization": "Bearer bench"}, timeout=30) as client:
+        started = time.perf_counter()
+        for item in ITEMS:
+            client.post("/mcp-compat/invoke", json=item)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        response = client.post("/mcp-compat/batch", json={"items": ITEMS})
+        batched = time.perf_counter() - started
+        response.raise_for_status()
+
+    errors = [r for r in response.json()["results"] if "error" in r]
+    print(f"items={len(ITEMS)} hrms_delay={delay_ms:.0f}ms")
+    print(f"sequential invoke  {sequential * 1000:.0f}ms")
+    print(f"batch              {batched * 1000:.0f}ms  (item errors: {len(errors)})")
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 100)
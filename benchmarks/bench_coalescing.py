@@ -0,0 +1,52 @@
+"""Count HRMS requests for bursts of identical concurrent reads.
+
+Fires ``burst`` concurrent ``get_holidays`` calls for one user against a fake
+HRMS with a fixed latency, with request coalescing off and on.
+
+Usage::
+
+    python benchmarks/bench_coalescing.py [bursts] [burst]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+
+from fake_hrms import FakeHRMS
+
+import xmcp.upstream as upstream
+from xmcp.tools.leaves.client import LeavesClient
+
+
+async def _run(label: str, hrms: FakeHRMS, leaves: LeavesClient, bursts: int, burst: int) -> None:
+    hrms.reset()
+    started = time.perf_counter()
+    for _ in range(bursts):
+        await asyncio.gather(*(leaves.get_holidays(2025, "Bearer bench") for _ in range(burst)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<12} calls={bursts * burst:<6} hrms_requests={hrms.requests:<6} "
+        f"elapsed={elapsed * 1000:.0f}ms"
+    )
+
+
+async def main(bursts: int, burst: int) -> None:
+    async with FakeHRMS(delay=0.02) as hrms:
+        leaves = LeavesClient(base_url=hrms.base_url)
+        try:
+            os.environ["HRMS_COALESCE_GETS"] = "0"
+            await _run("uncoalesced", hrms, leaves, bursts, burst)
+            os.environ["HRMS_COALESCE_GETS"] = "1"
+            await _run("coalesced", hrms, leaves, bursts, burst)
+            print(upstream.coalescing_stats())
+        finally:
+            await upstream.aclose()
+
+
+if __name__ == "__main__":
+    bursts = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    burst = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    asyncio.run(main(bursts, burst))
@@ -0,0 +1,100 @@
+"""CPU per request for a typed route, validated vs passthrough.
+
+Serves ``/team-management/ledger`` in process (via ``httpx.ASGITransport``)
+in front of a fake HRMS returning a ledger of ``rows`` entries, and reports
+process CPU time per request with the route typed and in passthrough mode.
+The response cache stays on, so after the first request both modes measure
+only the proxy's own work.
+
+Usage::
+
+    python benchmarks/bench_passthrough.py [requests] [rows]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from fake_hrms import FakeHRMS
+
+import xmcp.passthrough as passthrough
+import xmcp.upstream as upstream
+import xmcp.tools.team_management.router as team_router
+
+LEDGER_PATH = "/attendance/leaves/my-team-ledger"
+
+
+def _ledger(rows: int) -> dict:
+    return {
+        "statusCode": 200,
+        "statusMessage": "OK",
+        "data": [
+            {
+                "Id": f"ledger-{i}",
+                "category": "Leave",
+                "type": "Casual",
+                "status": "Approved",
+                "employeeFinancialYearId": "fy-2025",
+                "leaveDate": "2025-04-%02d" % (i % 28 + 1),
+                "leaveCount": 1.0,
+                "comments": "Family function",
+                "approvedDate": "2025-04-01",
+                "createdAt": "2025-03-28T10:15:00.000Z",
+                "updatedAt": "2025-03-29T08:00:00.000Z",
+            }
+            for i in range(rows)
+        ],
+        "leaveBalance": {
+            "leavesAccured": 18,
+            "leavesConsumed": 6,
+            "leavesRemaining": 12,
+            "overConsumedLeaves": 0,
+            "compOffAccrued": 2,
+            "compOffConsumed": 1,
+            "compOffLapsed": 0,
+            "compOffRemaining": 1,
+        },
+    }
+
+
+async def _run(label: str, client: httpx.AsyncClient, requests: int) -> None:
+    params = {"empId": "emp-1", "fy": "fy-2025"}
+    headers = {"Authorization": "Bearer bench"}
+    (await client.get("/team-management/ledger", params=params, headers=headers)).raise_for_status()
+    cpu, wall = time.process_time(), time.perf_counter()
+    for _ in range(requests):
+        response = await client.get("/team-management/ledger", params=params, headers=headers)
+        response.raise_for_status()
+    cpu, wall = time.process_time() - cpu, time.perf_counter() - wall
+    print(
+        f"{label:<12} requests={requests:<6} cpu/request={cpu / requests * 1e6:.0f}us "
+        f"wall={wall * 1000:.0f}ms body={len(response.content)}B"
+    )
+
+
+async def main(requests: int, rows: int) -> None:
+    async with FakeHRMS(routes={LEDGER_PATH: _ledger(rows)}) as hrms:
+        team_router.client.base_url = hrms.base_url
+        app = FastAPI()
+        app.include_router(team_router.router)
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://xmcp") as client:
+                passthrough.PASSTHROUGH = frozenset()
+                await _run("validated", client, requests)
+                passthrough.PASSTHROUGH = frozenset({"team.ledger"})
+                await _run("passthrough", client, requests)
+            print(passthrough.stats())
+        finally:
+            await upstream.aclose()
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    asyncio.run(main(requests, rows))
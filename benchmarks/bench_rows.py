@@ -0,0 +1,82 @@
+"""Decode time and memory for a large ledger: pydantic models vs compact rows.
+
+Builds an HRMS team-ledger body with ``rows`` entries and decodes it with
+the public pydantic model (from bytes, and from a parsed dict as the
+clients used to) and with :mod:`xmcp.rows` (``msgspec`` structs when
+installed, and the slotted-dataclass fallback).  Reports the best decode
+time of ``repeat`` runs and the memory the decoded result holds on to.
+
+Usage::
+
+    python benchmarks/bench_rows.py [rows] [repeat]
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import xmcp.codec as codec
+import xmcp.rows as rows
+from xmcp.tools.team_management.models import TeamLedgerResponse
+
+from bench_passthrough import _ledger
+
+
+def _rows_without_msgspec() -> Any:
+    # A second copy of xmcp.rows that takes the dataclass path
+    saved = sys.modules.get("msgspec")
+    sys.modules["msgspec"] = None
+    try:
+        spec = importlib.util.spec_from_file_location("rows_dataclass", rows.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if saved is None:
+            del sys.modules["msgspec"]
+        else:
+            sys.modules["msgspec"] = saved
+
+
+def _measure(label: str, decode: Callable[[], Any], count: int, repeat: int) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    result = decode()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    print(
+        f"{label:<26} decode={best * 1000:7.1f}ms  per_row={best / count * 1e6:5.2f}us  "
+        f"held={held / 2**20:6.1f}MiB  peak={peak / 2**20:6.1f}MiB"
+    )
+
+
+def main(count: int, repeat: int) -> None:
+    body = json.dumps(_ledger(count)).encode()
+    print(f"rows={count} body={len(body) / 2**20:.1f}MiB")
+    _measure("pydantic (json bytes)", lambda: TeamLedgerResponse.model_validate_json(body), count, repeat)
+    _measure(
+        "pydantic (parsed dict)",
+        lambda: TeamLedgerResponse.model_validate(codec.loads(body)),
+        count,
+        repeat,
+    )
+    if rows.msgspec is not None:
+        _measure("rows (msgspec)", lambda: rows.decode_page(body, rows.LedgerRow), count, repeat)
+    fallback = _rows_without_msgspec()
+    _measure("rows (dataclass)", lambda: fallback.decode_page(body, fallback.LedgerRow), count, repeat)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    main(count, repeat)
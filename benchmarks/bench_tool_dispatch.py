@@ -0,0 +1,85 @@
+"""Compare ToolSpec latency for the loopback, asgi and inprocess dispatch modes.
+
+Runs the XMCP app under uvicorn (for loopback) in front of a local fake HRMS
+and times sequential ``get_holidays`` tool calls in each mode.
+
+Usage::
+
+    python benchmarks/bench_tool_dispatch.py [calls]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import date
+
+from fake_hrms import FakeHRMS
+
+HOLIDAYS = {
+    "statusCode": 200,
+    "statusMessage": "OK",
+    "data": [
+        {"holidayDate": f"2025-{m:02d}-01", "descText": f"Holiday {m}", "type": "Gazetted"}
+        for m in range(1, 13)
+    ],
+}
+
+
+def _start_fake_hrms() -> FakeHRMS:
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    hrms = FakeHRMS({"/app/employees/holidays": HOLIDAYS})
+    asyncio.run_coroutine_threadsafe(hrms.__aenter__(), loop).result()
+    return hrms
+
+
+def _start_xmcp(port: int = 0) -> str:
+    import uvicorn
+
+    import xmcp.main as main_module
+
+    server = uvicorn.Server(uvicorn.Config(main_module.app, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    return f"http://127.0.0.1:{port}"
+
+
+def _time(func, calls: int) -> list[float]:
+    func(leaveDate=date(2025, 1, 1))  # warm up connections
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        func(leaveDate=date(2025, 1, 1))
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main(calls: int) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    hrms = _start_fake_hrms()
+    os.environ["HRMS_API_BASE_URL"] = hrms.base_url
+    base_url = _start_xmcp()
+
+    from xmcp.tool_registry import all_tool_specs
+
+    for mode in ("loopback", "asgi", "inprocess"):
+        specs = {s.name: s for s in all_tool_specs(base_url, lambda: "Bearer bench", dispatch=mode)}
+        samples = _time(specs["get_holidays"].func, calls)
+        samples.sort()
+        print(
+            f"{mode:<10} p50={statistics.median(samples):.2f}ms "
+            f"p95={samples[int(len(samples) * 0.95) - 1]:.2f}ms "
+            f"mean={statistics.fmean(samples):.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
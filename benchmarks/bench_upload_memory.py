@@ -0,0 +1,76 @@
+"""Peak memory while XMCP relays concurrent large uploads to HRMS.
+
+Runs the XMCP app under uvicorn in front of a fake HRMS (which discards
+request bodies as they arrive) and sends ``uploads`` concurrent resumes of
+``size_mb`` each to ``PUT /api/v2/hr/candidates/updateProfile``, streamed
+from a file on disk.  Reports the growth in peak RSS of the process.
+Linux only.
+
+Usage::
+
+    python benchmarks/bench_upload_memory.py [uploads] [size_mb]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import httpx
+
+from bench_tool_dispatch import _start_fake_hrms, _start_xmcp
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def _upload(base_url: str, path: str) -> None:
+    async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+        with open(path, "rb") as f:
+            response = await client.put(
+                "/api/v2/hr/candidates/updateProfile",
+                params={"Id": "bench"},
+                files={"file": ("resume.pdf", f, "application/pdf")},
+                headers={"Authorization": "Bearer bench"},
+            )
+        response.raise_for_status()
+
+
+async def _upload_all(base_url: str, path: str, uploads: int) -> None:
+    await asyncio.gather(*(_upload(base_url, path) for _ in range(uploads)))
+
+
+def main(uploads: int, size_mb: int) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    hrms = _start_fake_hrms()
+    os.environ["HRMS_API_BASE_URL"] = hrms.base_url
+    base_url = _start_xmcp()
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as resume:
+        chunk = os.urandom(1024 * 1024)
+        for _ in range(size_mb):
+            resume.write(chunk)
+        resume.flush()
+
+        asyncio.run(_upload(base_url, resume.name))  # warm up
+        baseline = _peak_rss_mb()
+        started = time.perf_counter()
+        asyncio.run(_upload_all(base_url, resume.name, uploads))
+        elapsed = time.perf_counter() - started
+
+    print(
+        f"uploads={uploads} size={size_mb}MB relayed={hrms.bytes_received / 1024 / 1024:.0f}MB "
+        f"peak_rss_growth={_peak_rss_mb() - baseline:.1f}MB elapsed={elapsed:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    uploads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    size_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    main(uploads, size_mb)
@@ -0,0 +1,67 @@
+"""Compare HRMS handshakes per request: per-call AsyncClient vs shared pool.
+
+Usage::
+
+    python benchmarks/bench_upstream_pool.py [requests] [concurrency]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+import httpx
+
+from fake_hrms import FakeHRMS
+
+import xmcp.upstream as upstream
+from xmcp.tools.leaves.client import LeavesClient
+
+
+async def _per_call_client(base_url: str) -> None:
+    # The pattern every domain client used before the shared transport.
+    async with httpx.AsyncClient(timeout=10.0) as client:
+        response = await client.get(
+            f"{base_url}/app/employees/holidays",
+            params={"year": 2025},
+            headers={"Authorization": "Bearer bench"},
+        )
+        response.raise_for_status()
+
+
+async def _run(label: str, hrms: FakeHRMS, call, total: int, concurrency: int) -> None:
+    hrms.reset()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            await call()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{label:<14} requests={hrms.requests:<6} connections={hrms.connections:<6} "
+        f"handshakes/request={hrms.connections / hrms.requests:.3f} "
+        f"elapsed={elapsed * 1000:.0f}ms"
+    )
+
+
+async def main(total: int, concurrency: int) -> None:
+    async with FakeHRMS() as hrms:
+        leaves = LeavesClient(base_url=hrms.base_url)
+        await _run("per-call", hrms, lambda: _per_call_client(hrms.base_url), total, concurrency)
+        await upstream.startup()
+        try:
+            await _run(
+                "shared-pool", hrms, lambda: leaves.get_holidays(2025, "Bearer bench"), total, concurrency
+            )
+        finally:
+            await upstream.aclose()
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(main(total, concurrency))
@@ -0,0 +1,87 @@
+"""Minimal keep-alive HTTP/1.1 server standing in for HRMS in benchmarks.
+
+Every request is answered with the JSON body registered for its path (or an
+empty HRMS envelope).  The server counts accepted TCP connections so
+benchmarks can report handshakes per request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Dict, Optional
+
+
+class FakeHRMS:
+    def __init__(self, routes: Optional[Dict[str, object]] = None, delay: float = 0.0) -> None:
+        self.routes = {path: json.dumps(body).encode() for path, body in (routes or {}).items()}
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self.bytes_received = 0
+        self._server: Optional[asyncio.base_events.Server] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def reset(self) -> None:
+        self.connections = 0
+        self.requests = 0
+        self.bytes_received = 0
+
+    async def __aenter__(self) -> "FakeHRMS":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _discard_body(self, reader: asyncio.StreamReader, headers: Dict[str, str]) -> None:
+        # Read uploads in chunks so the fake itself never buffers a whole body
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                await self._skip(reader, size + 2)
+                if size == 0:
+                    return
+        await self._skip(reader, int(headers.get("content-length") or 0))
+
+    async def _skip(self, reader: asyncio.StreamReader, remaining: int) -> None:
+        while remaining:
+            chunk = await reader.read(min(remaining, 65536))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(chunk)
+            self.bytes_received += len(chunk)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                headers = dict(
+                    line.split(": ", 1) for line in header_lines if ": " in line
+                )
+                headers = {k.lower(): v for k, v in headers.items()}
+                await self._discard_body(reader, headers)
+                self.requests += 1
+                path = request_line.split(" ")[1].split("?")[0]
+                body = self.routes.get(
+                    path, b'{"statusCode": 200, "statusMessage": "OK", "data": []}'
+                )
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                    + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
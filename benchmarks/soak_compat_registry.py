@@ -0,0 +1,64 @@
+"""Soak the /mcp-compat shim and report open file descriptors and RSS.
+
+Runs the XMCP app under uvicorn in front of a local fake HRMS and repeatedly
+calls /mcp-compat/tools and /mcp-compat/invoke (loopback dispatch).  With the
+shared tool registry both numbers should stay flat after warm-up.  Linux only
+(reads /proc/self).
+
+Usage::
+
+    python benchmarks/soak_compat_registry.py [rounds] [requests_per_round]
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import sys
+
+import httpx
+
+from bench_tool_dispatch import _start_fake_hrms, _start_xmcp
+
+
+def _open_fds() -> int:
+    return len(os.listdir("/proc/self/fd"))
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        resident_pages = int(f.read().split()[1])
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def main(rounds: int, per_round: int) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    hrms = _start_fake_hrms()
+    port = _free_port()
+    os.environ["HRMS_API_BASE_URL"] = hrms.base_url
+    # Loopback tools call back into this server
+    os.environ["XMCP_LOCAL_BASE_URL"] = f"http://127.0.0.1:{port}"
+    base_url = _start_xmcp(port)
+    headers = {"Authorization": "Bearer soak"}
+    body = {"name": "get_financial_years", "arguments": {}}
+
+    with httpx.Client(base_url=base_url, headers=headers) as client:
+        print(f"{'round':>5} {'requests':>9} {'fds':>5} {'rss_mb':>8}")
+        for i in range(rounds + 1):
+            for _ in range(per_round):
+                client.get("/mcp-compat/tools").raise_for_status()
+                client.post("/mcp-compat/invoke", json=body).raise_for_status()
+            print(f"{i:>5} {(i + 1) * per_round * 2:>9} {_open_fds():>5} {_rss_mb():>8.1f}")
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    per_round = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    main(rounds, per_round)
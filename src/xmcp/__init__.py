@@ -8,6 +8,7 @@ import xmcp.api as api
 
 build_xmcp = api.build_xmcp
 all_tool_specs = api.all_tool_specs
+get_registry = api.get_registry
 create_tool_specs = api.create_tool_specs
 create_langchain_tools = api.create_langchain_tools
 set_request_headers = api.set_request_headers
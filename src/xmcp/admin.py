@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+import secrets
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+
+import xmcp.admission as admission
+import xmcp.breaker as breaker
+import xmcp.cache as cache
+import xmcp.cursors as cursors
+import xmcp.metrics as metrics
+import xmcp.passthrough as passthrough
+import xmcp.projection as projection
+import xmcp.ratelimit as ratelimit
+import xmcp.resilience as resilience
+import xmcp.rows as rows
+import xmcp.upstream as upstream
+
+
+def _require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Guard the admin endpoints with XMCP_ADMIN_TOKEN when it is set."""
+    expected = os.getenv("XMCP_ADMIN_TOKEN")
+    if expected and not secrets.compare_digest(x_admin_token or "", expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(_require_admin)])
+# Served at the root, where Prometheus looks by default
+metrics_router = APIRouter(tags=["admin"], dependencies=[Depends(_require_admin)])
+
+
+@router.get("/stats")
+async def stats() -> Dict[str, Any]:
+    """Runtime counters for the upstream HRMS layer."""
+    return {
+        "coalescing": upstream.coalescing_stats(),
+        "pool": upstream.pool_stats(),
+        "cache": cache.stats(),
+        "passthrough": passthrough.stats(),
+        "cursors": cursors.stats(),
+        "retries": resilience.stats(),
+        "ratelimit": ratelimit.stats(),
+        "admission": admission.stats(),
+    }
+
+
+@router.get("/breakers")
+async def breakers() -> Dict[str, Any]:
+    """Circuit breaker state and bulkhead usage per HRMS path family."""
+    return {"breakers": breaker.stats()}
+
+
+@router.delete("/cache")
+async def flush_cache(endpoint: Optional[str] = None) -> Dict[str, Any]:
+    """Drop cached HRMS reads, optionally only those of one cached endpoint."""
+    if endpoint is not None and endpoint not in cache.POLICIES:
+        raise HTTPException(status_code=404, detail=f"Unknown cached endpoint: {endpoint}")
+    return {"flushed": await cache.clear(endpoint)}
+
+
+def _cache_samples() -> List[List[str]]:
+    response = cache.stats()
+    projected = projection.selector_cache_stats()
+    selected = rows.selector_cache_stats()
+    lookups = {
+        "response": (response["hits"] + response["stale_hits"], response["misses"]),
+        "projection": (projected["hits"], projected["misses"]),
+        "rows": (selected["hits"], selected["misses"]),
+    }
+    ratio = [
+        ({"cache": name}, hits / (hits + misses) if hits + misses else 0.0)
+        for name, (hits, misses) in lookups.items()
+    ]
+    return [
+        metrics.snapshot(
+            "xmcp_cache_lookups_total",
+            "counter",
+            "Cache lookups, by cache and result (stale response-cache hits count as hits).",
+            [({"cache": name, "result": "hit"}, hits) for name, (hits, _) in lookups.items()]
+            + [({"cache": name, "result": "miss"}, misses) for name, (_, misses) in lookups.items()],
+        ),
+        metrics.snapshot("xmcp_cache_hit_ratio", "gauge", "Share of cache lookups that hit.", ratio),
+    ]
+
+
+def _collect() -> List[List[str]]:
+    """Snapshot metrics read from the stats of the modules above."""
+    reads = upstream.coalescing_stats()
+    pool = upstream.pool_stats()
+    retries = resilience.stats()
+    limits = ratelimit.stats()
+    control = admission.stats()
+    families = breaker.stats()
+    gauge, counter = "gauge", "counter"
+    single = [
+        ("xmcp_upstream_reads_total", counter, "HRMS GETs requested by the routers.", reads["requests"]),
+        ("xmcp_upstream_reads_coalesced_total", counter, "HRMS GETs served by an identical one in flight.", reads["coalesced"]),
+        ("xmcp_upstream_reads_in_flight", gauge, "Distinct HRMS GETs in flight.", reads["inflight"]),
+        ("xmcp_upstream_pool_max_connections", gauge, "Connection limit of the HRMS pool.", pool["max_connections"]),
+        ("xmcp_upstream_pool_waiting", gauge, "Requests waiting for an HRMS connection.", pool["waiting"]),
+        (
+            "xmcp_upstream_pool_utilization",
+            gauge,
+            "Share of the HRMS connection limit in use.",
+            pool["active"] / pool["max_connections"] if pool["max_connections"] else 0.0,
+        ),
+        ("xmcp_upstream_retries_total", counter, "HRMS GETs retried.", retries["retries"]),
+        ("xmcp_upstream_hedges_total", counter, "Hedged HRMS GETs sent.", retries["hedges"]),
+        ("xmcp_upstream_hedge_wins_total", counter, "Hedged HRMS GETs that answered first.", retries["hedge_wins"]),
+        ("xmcp_upstream_retry_budget_exhausted_total", counter, "Retries and hedges refused by the budget.", retries["budget_exhausted"]),
+        ("xmcp_ratelimit_throttled_total", counter, "Requests answered 429 by the rate limiter.", limits["throttled"]),
+        ("xmcp_fair_queue_running", gauge, "Calls holding a fair-queue slot.", limits["queue"]["running"]),
+        ("xmcp_fair_queue_waiting", gauge, "Calls waiting in the fair queue.", limits["queue"]["waiting"]),
+        ("xmcp_fair_queue_rejected_total", counter, "Calls refused because their queue was full.", limits["queue"]["rejected"]),
+        ("xmcp_admission_limit", gauge, "Current adaptive concurrency limit.", control["limit"]),
+        ("xmcp_admission_in_flight", gauge, "Requests admitted and running.", control["inflight"]),
+        ("xmcp_admission_heavy_in_flight", gauge, "Heavy requests admitted and running.", control["heavy_inflight"]),
+        ("xmcp_admission_shed_total", counter, "Requests shed with 503.", control["shed"]),
+        ("xmcp_admission_shed_heavy_total", counter, "Heavy requests shed with 503.", control["shed_heavy"]),
+        ("xmcp_cursors_open", gauge, "Cursors held for oversized results.", cursors.stats()["entries"]),
+    ]
+    per_family = [
+        ("xmcp_upstream_requests_in_flight", gauge, "HRMS requests in flight, by path family.", "inflight"),
+        ("xmcp_breaker_open", gauge, "1 while a path family's circuit breaker is not closed.", "state"),
+        ("xmcp_breaker_short_circuited_total", counter, "Calls failed fast by an open breaker.", "short_circuited"),
+        ("xmcp_bulkhead_rejected_total", counter, "Calls refused by a full bulkhead.", "rejected"),
+    ]
+    out = [metrics.snapshot(name, kind, help, [({}, value)]) for name, kind, help, value in single]
+    out.append(metrics.snapshot(
+        "xmcp_upstream_pool_connections",
+        gauge,
+        "Open HRMS connections, by state.",
+        [({"state": state}, pool[state]) for state in ("active", "idle")],
+    ))
+    for name, kind, help, key in per_family:
+        out.append(metrics.snapshot(name, kind, help, [
+            ({"family": family}, float(state[key] != breaker.CLOSED) if key == "state" else state[key])
+            for family, state in families.items()
+        ]))
+    return out + _cache_samples()
+
+
+@metrics_router.get("/metrics")
+async def prometheus_metrics() -> Response:
+    """Request, tool and HRMS latency histograms plus the counters above, for Prometheus."""
+    return Response(metrics.render(_collect()), media_type=metrics.CONTENT_TYPE)
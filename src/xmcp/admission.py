@@ -0,0 +1,243 @@
+"""Adaptive admission control: shed load before latency degrades for everyone.
+
+Requests to the routers and ``/mcp`` count against a concurrency limit that
+follows observed latency (AIMD):
+
+- each request that finishes fast while the server is at least half busy
+  raises the limit by ``1/limit``, about one per round of requests;
+- a request that takes longer than ``XMCP_ADMISSION_MAX_LATENCY``, or more
+  than ``XMCP_ADMISSION_TOLERANCE`` times the usual latency of its route or
+  tool (a slow moving average), cuts the limit by ``XMCP_ADMISSION_BACKOFF``,
+  at most once per ``XMCP_ADMISSION_COOLDOWN`` seconds.
+
+Only latency counts as overload.  A ``5xx`` here is mostly HRMS failing
+(routers answer ``502``, and the circuit breakers of :mod:`xmcp.breaker`
+fail a degraded path family fast), which the per-family breakers already
+contain; such requests neither raise nor cut the limit, nor feed a route's
+usual latency.  The rate limiter of :mod:`xmcp.ratelimit` runs first, so
+time spent waiting in a principal's fair queue holds no admission slot.
+
+Requests beyond the limit are refused at once with ``503`` and
+``Retry-After``.  Heavy fan-out work (``allPages=true`` reads, attendance
+ranges, ``/mcp-compat/batch`` and the tools in
+``XMCP_ADMISSION_HEAVY_TOOLS``) may only use ``XMCP_ADMISSION_HEAVY_SHARE``
+of the limit, so plain reads keep being served when heavy work is shed.
+
+``/health``, ``/admin``, ``/metrics`` and the tools' loopback calls into the routers
+(already admitted as the tool call that made them) are never shed.
+
+- ``XMCP_ADMISSION`` – set to ``false`` to turn admission control off (default on).
+- ``XMCP_ADMISSION_INITIAL`` / ``XMCP_ADMISSION_MIN`` / ``XMCP_ADMISSION_MAX`` – limit
+  bounds (defaults ``64`` / ``8`` / ``512``).
+- ``XMCP_ADMISSION_MAX_LATENCY`` – seconds after which a request counts as overload (default ``15``).
+- ``XMCP_ADMISSION_TOLERANCE`` – allowed multiple of a route's usual latency (default ``3``).
+- ``XMCP_ADMISSION_BACKOFF`` – factor applied on overload (default ``0.9``).
+- ``XMCP_ADMISSION_COOLDOWN`` – seconds between decreases (default ``1``).
+- ``XMCP_ADMISSION_HEAVY_SHARE`` – share of the limit heavy work may use (default ``0.5``).
+- ``XMCP_ADMISSION_HEAVY_TOOLS`` – comma-separated heavy tools (default ``get_attendance_range``).
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from fastapi.responses import JSONResponse
+
+import xmcp.ratelimit as ratelimit
+
+Scope = ratelimit.Scope
+Message = ratelimit.Message
+Receive = ratelimit.Receive
+Send = ratelimit.Send
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+ENABLED = os.getenv("XMCP_ADMISSION", "true").strip().lower() in ("1", "true", "yes", "on")
+INITIAL = _env_number("XMCP_ADMISSION_INITIAL", 64)
+MINIMUM = _env_number("XMCP_ADMISSION_MIN", 8)
+MAXIMUM = _env_number("XMCP_ADMISSION_MAX", 512)
+MAX_LATENCY = _env_number("XMCP_ADMISSION_MAX_LATENCY", 15.0)
+TOLERANCE = _env_number("XMCP_ADMISSION_TOLERANCE", 3.0)
+BACKOFF = _env_number("XMCP_ADMISSION_BACKOFF", 0.9)
+COOLDOWN = _env_number("XMCP_ADMISSION_COOLDOWN", 1.0)
+HEAVY_SHARE = _env_number("XMCP_ADMISSION_HEAVY_SHARE", 0.5)
+HEAVY_TOOLS = frozenset(
+    name.strip()
+    for name in os.getenv("XMCP_ADMISSION_HEAVY_TOOLS", "get_attendance_range").split(",")
+    if name.strip()
+)
+HEAVY_PATHS = ("/attendance/my-attendance/range", "/mcp-compat/batch")
+EXEMPT_PREFIXES = ("/health", "/admin", "/metrics")
+
+# Latencies under this never count as a slowdown, however fast the route usually is
+_LATENCY_FLOOR = 0.05
+# Weight of each sample in a route's usual latency
+_ALPHA = 0.05
+_MAX_ROUTES = 256
+
+
+class AdaptiveLimit:
+    """AIMD concurrency limit driven by per-route latency.
+
+    Used from the server's event loop only.
+    """
+
+    def __init__(
+        self,
+        initial: float,
+        minimum: float,
+        maximum: float,
+        max_latency: float,
+        tolerance: float,
+        backoff: float,
+        cooldown: float,
+    ) -> None:
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.max_latency = max_latency
+        self.tolerance = tolerance
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.inflight = 0
+        self.heavy_inflight = 0
+        self._usual: "OrderedDict[str, float]" = OrderedDict()
+        self._decreased_at = 0.0
+        self.admitted = 0
+        self.shed = 0
+        self.shed_heavy = 0
+        self.decreases = 0
+
+    def admit(self, heavy: bool) -> bool:
+        if self.inflight >= int(self.limit) or (
+            heavy and self.heavy_inflight >= max(1, int(self.limit * HEAVY_SHARE))
+        ):
+            self.shed += 1
+            if heavy:
+                self.shed_heavy += 1
+            return False
+        self.inflight += 1
+        if heavy:
+            self.heavy_inflight += 1
+        self.admitted += 1
+        return True
+
+    def done(
+        self, route: str, seconds: float, failed: bool, heavy: bool, busy: int
+    ) -> None:
+        """Release a slot and adjust the limit from the request's outcome.
+
+        ``failed`` marks error responses, which only count when slow; ``busy``
+        is the number in flight when this one started.
+        """
+        self.inflight -= 1
+        if heavy:
+            self.heavy_inflight -= 1
+        usual = self._usual.get(route)
+        overloaded = seconds > self.max_latency or (
+            usual is not None and seconds > self.tolerance * max(usual, _LATENCY_FLOOR)
+        )
+        if not failed:
+            self._usual[route] = seconds if usual is None else usual + _ALPHA * (seconds - usual)
+            self._usual.move_to_end(route)
+            if len(self._usual) > _MAX_ROUTES:
+                self._usual.popitem(last=False)
+        if overloaded:
+            now = time.monotonic()
+            if now - self._decreased_at >= self.cooldown:
+                self.limit = max(self.minimum, self.limit * self.backoff)
+                self._decreased_at = now
+                self.decreases += 1
+        elif not failed and busy >= self.limit / 2:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "inflight": self.inflight,
+            "heavy_inflight": self.heavy_inflight,
+            "admitted": self.admitted,
+            "shed": self.shed,
+            "shed_heavy": self.shed_heavy,
+            "decreases": self.decreases,
+        }
+
+
+controller = AdaptiveLimit(INITIAL, MINIMUM, MAXIMUM, MAX_LATENCY, TOLERANCE, BACKOFF, COOLDOWN)
+
+
+def _all_pages(arguments: Dict[str, Any]) -> bool:
+    # MCP tools take their arguments wrapped in "params"
+    inner = arguments.get("params")
+    if isinstance(inner, dict):
+        arguments = inner
+    return arguments.get("allPages") in (True, "true", "1", 1)
+
+
+def classify(scope: Scope, calls: List[Tuple[str, Dict[str, Any]]]) -> Tuple[str, bool]:
+    """The route key a request's latency is tracked under, and whether it is heavy."""
+    path = scope.get("path", "")
+    query = dict(parse_qsl(scope.get("query_string", b"").decode("latin-1")))
+    heavy = (
+        path.startswith(HEAVY_PATHS)
+        or query.get("allPages", "").lower() in ("true", "1")
+        or any(tool in HEAVY_TOOLS or _all_pages(arguments) for tool, arguments in calls)
+    )
+    route = f"tool:{calls[0][0]}" if len(calls) == 1 else path
+    return route, heavy
+
+
+def _shed(heavy: bool) -> JSONResponse:
+    detail = "Server is busy; heavy requests are paused" if heavy else "Server is busy"
+    return JSONResponse({"detail": detail}, status_code=503, headers={"Retry-After": "1"})
+
+
+class AdmissionMiddleware:
+    """ASGI middleware applying :data:`controller` to every non-exempt request."""
+
+    def __init__(self, app: Callable[..., Awaitable[None]]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope.get("path", "")
+        if (
+            not ENABLED
+            or scope["type"] != "http"
+            or path.startswith(EXEMPT_PREFIXES)
+            # Only POSTs to /mcp are calls; GET/DELETE manage the session stream
+            or (path.startswith("/mcp") and scope.get("method") != "POST")
+            or ratelimit.is_internal(scope)
+        ):
+            return await self.app(scope, receive, send)
+        calls, receive = await ratelimit.read_calls(scope, receive)
+        route, heavy = classify(scope, calls)
+        busy = controller.inflight
+        if not controller.admit(heavy):
+            return await _shed(heavy)(scope, receive, send)
+        status: Optional[int] = None
+
+        async def send_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.monotonic()
+        failed = True
+        try:
+            await self.app(scope, receive, send_status)
+            failed = status is None or status >= 500
+        finally:
+            controller.done(route, time.monotonic() - started, failed, heavy, busy)
+
+
+def stats() -> Dict[str, Any]:
+    return {"enabled": ENABLED, **controller.stats()}
@@ -11,6 +11,7 @@ import xmcp.auth_context as auth_context
 
 build_xmcp = mcp_runtime.build_xmcp
 all_tool_specs = tool_registry.all_tool_specs
+get_registry = tool_registry.get_registry
 create_tool_specs = tools_module.create_tool_specs
 create_langchain_tools = tools_module.create_langchain_tools
 set_request_headers = auth_context.set_request_headers
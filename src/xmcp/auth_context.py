@@ -1,5 +1,6 @@
 from __future__ import annotations
 from contextvars import ContextVar
+import hashlib
 import os
 from typing import Dict
 
@@ -15,3 +16,13 @@ def get_bearer() -> str:
 
 def auth_header_getter() -> str:
     return get_bearer()
+
+def principal_key(auth_header: str | None) -> str:
+    """Stable, non-reversible key identifying the caller behind ``auth_header``.
+
+    Used to scope shared state (in-flight requests, caches, limits) per user
+    without keeping bearer tokens around.
+    """
+    if not auth_header:
+        return "anonymous"
+    return hashlib.sha256(auth_header.encode()).hexdigest()[:32]
@@ -0,0 +1,226 @@
+"""Circuit breakers and bulkheads per HRMS path family.
+
+HRMS is several subsystems behind one base URL; when one degrades (say the
+Elasticsearch openings search) its calls should not tie up the connections
+every other endpoint needs.  Each path family – the first path segment
+after any ``/api/vN`` prefix, e.g. ``attendance``, ``elastic``, ``app`` or
+``ticket-asset`` – gets:
+
+- a **bulkhead**: at most ``HRMS_BULKHEAD_LIMIT`` calls in flight; further
+  calls fail at once with :class:`BulkheadFull`;
+- a **circuit breaker**: after ``HRMS_BREAKER_FAILURES`` consecutive
+  failures (connection errors, timeouts or ``5xx`` responses) calls fail at
+  once with :class:`CircuitOpen` for ``HRMS_BREAKER_RESET`` seconds.  Then a
+  single probe call is let through (half-open); its success closes the
+  breaker, its failure opens it again.
+
+:class:`GuardedTransport` applies both to every request the shared HRMS
+client sends (see :func:`xmcp.upstream.create_client`).  Both errors are
+``httpx.TransportError`` subclasses, so routers report them like any other
+unreachable upstream, and they are not retried.  State is served at
+``GET /admin/breakers``.
+
+- ``HRMS_BREAKER_FAILURES`` – consecutive failures that open a breaker (default ``5``, ``0`` disables).
+- ``HRMS_BREAKER_RESET`` – seconds a breaker stays open before probing (default ``30``).
+- ``HRMS_BULKHEAD_LIMIT`` – in-flight calls per family (default ``50``, ``0`` disables).
+- ``HRMS_BULKHEAD_LIMIT_<FAMILY>`` – per-family override, e.g. ``HRMS_BULKHEAD_LIMIT_ELASTIC=10``.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+FAILURES = int(_env_number("HRMS_BREAKER_FAILURES", 5))
+RESET_AFTER = _env_number("HRMS_BREAKER_RESET", 30.0)
+BULKHEAD_LIMIT = int(_env_number("HRMS_BULKHEAD_LIMIT", 50))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Families are named by the code's own paths; anything past this shares one
+_MAX_FAMILIES = 64
+_OTHER = "other"
+_PREFIX = re.compile(r"^(api|v\d+)$")
+
+
+class CircuitOpen(httpx.TransportError):
+    """Calls to a path family are failing fast while its breaker is open."""
+
+
+class BulkheadFull(httpx.TransportError):
+    """A path family already has its maximum number of calls in flight."""
+
+
+def family(path: str) -> str:
+    """The path family of an HRMS URL path, e.g. ``/api/v2/elastic/es/...`` -> ``elastic``."""
+    for segment in path.split("/"):
+        if segment and not _PREFIX.match(segment):
+            return segment
+    return _OTHER
+
+
+class CircuitBreaker:
+    """Breaker and bulkhead for one path family.
+
+    Safe to use from several threads (the app loop and the background loop
+    used by sync tool calls).
+    """
+
+    def __init__(self, name: str, failures: int, reset_after: float, limit: int) -> None:
+        self.name = name
+        self.failures = failures
+        self.reset_after = reset_after
+        self.limit = limit
+        self.state = CLOSED
+        self.inflight = 0
+        self._consecutive = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.short_circuited = 0
+        self.rejected = 0
+
+    def _retry_in(self, now: float) -> int:
+        return max(1, math.ceil(self.reset_after - (now - self._opened_at)))
+
+    def acquire(self, request: httpx.Request) -> bool:
+        """Admit a call or raise; ``True`` when the call is the half-open probe."""
+        now = time.monotonic()
+        with self._lock:
+            probe = False
+            if self.state == OPEN:
+                if now - self._opened_at < self.reset_after:
+                    self.short_circuited += 1
+                    raise CircuitOpen(
+                        f"HRMS '{self.name}' is failing; not calling it for {self._retry_in(now)}s",
+                        request=request,
+                    )
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN:
+                if self._probing:
+                    self.short_circuited += 1
+                    raise CircuitOpen(
+                        f"HRMS '{self.name}' is failing; a probe call is in progress", request=request
+                    )
+                self._probing = probe = True
+            if self.limit > 0 and self.inflight >= self.limit:
+                if probe:
+                    self._probing = False
+                self.rejected += 1
+                raise BulkheadFull(
+                    f"HRMS '{self.name}' already has {self.limit} calls in flight", request=request
+                )
+            self.inflight += 1
+            return probe
+
+    def record(self, ok: Optional[bool], probe: bool) -> None:
+        """Record a call's outcome; ``None`` when it was cancelled before finishing."""
+        with self._lock:
+            if ok is None:
+                if probe:
+                    self._probing = False
+                return
+            if ok:
+                self._consecutive = 0
+                if probe:
+                    self.state = CLOSED
+                    self._probing = False
+                return
+            self._consecutive += 1
+            if probe or (self.state == CLOSED and self.failures > 0 and self._consecutive >= self.failures):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+                self.opened += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self.inflight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = {
+                "state": self.state,
+                "consecutive_failures": self._consecutive,
+                "inflight": self.inflight,
+                "limit": self.limit,
+                "opened": self.opened,
+                "short_circuited": self.short_circuited,
+                "rejected": self.rejected,
+            }
+            if self.state == OPEN:
+                out["retry_in"] = self._retry_in(time.monotonic())
+            return out
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get(name: str) -> CircuitBreaker:
+    """The breaker for path family ``name``, created on first use."""
+    breaker = _breakers.get(name)
+    if breaker is not None:
+        return breaker
+    with _breakers_lock:
+        if name not in _breakers and len(_breakers) >= _MAX_FAMILIES:
+            name = _OTHER
+        breaker = _breakers.get(name)
+        if breaker is None:
+            limit = int(_env_number(
+                "HRMS_BULKHEAD_LIMIT_" + name.upper().replace("-", "_"), BULKHEAD_LIMIT
+            ))
+            breaker = _breakers[name] = CircuitBreaker(name, FAILURES, RESET_AFTER, limit)
+        return breaker
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    return {name: breaker.stats() for name, breaker in sorted(_breakers.items())}
+
+
+class GuardedTransport(httpx.AsyncBaseTransport):
+    """Transport applying the breaker and bulkhead of each request's path family."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        breaker = get(family(request.url.path))
+        probe = breaker.acquire(request)
+        # The slot is held until the response head arrives, which is where a
+        # degraded subsystem makes calls wait
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.PoolTimeout:
+            # Our own pool was exhausted; says nothing about HRMS
+            breaker.record(None, probe)
+            raise
+        except Exception:
+            breaker.record(False, probe)
+            raise
+        except BaseException:
+            breaker.record(None, probe)
+            raise
+        finally:
+            breaker.release()
+        breaker.record(response.status_code < 500, probe)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
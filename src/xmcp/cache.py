@@ -0,0 +1,353 @@
+"""TTL + LRU cache for slow-changing HRMS reads.
+
+Domain clients wrap reads of reference data in :func:`cached`, naming an
+endpoint from :data:`POLICIES`.  Each policy sets the entry TTL and whether
+the data is org-wide (``shared``: one entry for every caller, e.g. holidays
+for a year) or personal (one entry per principal, see
+:func:`xmcp.auth_context.principal_key`).
+
+Entries hold the HRMS response body exactly as it arrived, in a backend
+from :mod:`xmcp.cache_backends`: a bounded in-process LRU by default, or a
+Redis-protocol server shared by every worker.  A shared backend that stops
+responding is bypassed in favour of a process-local cache until it recovers.
+
+Writes go the other way: after a mutating call succeeds the client calls
+:func:`invalidate` with the operation's name, and :data:`INVALIDATES` lists
+the cached reads it makes stale for that principal.  Invalidation bumps a
+generation counter that is part of every cache key, so stale entries simply
+become unreachable and age out; reads that were in flight during the write
+are stored under the old generation and are never served.
+
+Endpoints with a ``stale_grace`` serve stale-while-revalidate: for that
+long past the TTL an expired entry is still returned at once, and exactly
+one caller (across workers, with a shared backend) refreshes it in the
+background.  :func:`fetch` reports each value's age so callers can tell
+the agent how fresh the data is.
+
+Configured through environment variables:
+
+- ``XMCP_CACHE_ENABLED`` – turn the cache off with ``0`` (default on).
+- ``XMCP_CACHE_BACKEND`` – ``memory`` (default) or ``redis``.
+- ``XMCP_CACHE_REDIS_URL`` – Redis URL (default ``redis://localhost:6379/0``).
+- ``XMCP_CACHE_REDIS_TIMEOUT`` – Redis socket timeout in seconds (default ``0.25``).
+- ``XMCP_CACHE_PREFIX`` – key prefix in the shared backend (default ``xmcp:``).
+- ``XMCP_CACHE_MAX_BYTES`` – memory cap for the in-process cache (default 32 MiB).
+- ``XMCP_CACHE_MAX_ENTRIES`` – maximum in-process entries (default ``10000``).
+- ``XMCP_CACHE_TTL_<ENDPOINT>`` – override an endpoint's TTL in seconds, e.g.
+  ``XMCP_CACHE_TTL_LEAVES_HOLIDAYS=3600``.
+- ``XMCP_CACHE_STALE_<ENDPOINT>`` – override an endpoint's stale-while-revalidate
+  grace in seconds (``0`` disables it).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, NamedTuple, Optional, Set, Tuple, Union
+
+import xmcp.auth_context as auth_context
+import xmcp.cache_backends as cache_backends
+import xmcp.codec as codec
+
+logger = logging.getLogger(__name__)
+
+SHARED = "*"
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """How long an endpoint's responses are cached and who shares them."""
+
+    ttl: float
+    shared: bool = False
+    # Seconds past ``ttl`` during which the stale entry is served while it is refreshed
+    stale_grace: float = 0.0
+
+
+def _policy(endpoint: str, ttl: float, shared: bool = False, stale_grace: float = 0.0) -> CachePolicy:
+    suffix = endpoint.upper().replace(".", "_")
+    return CachePolicy(
+        ttl=_env_number("XMCP_CACHE_TTL_" + suffix, ttl),
+        shared=shared,
+        stale_grace=_env_number("XMCP_CACHE_STALE_" + suffix, stale_grace),
+    )
+
+
+# Cached endpoints, named "<domain>.<read>".
+POLICIES: Dict[str, CachePolicy] = {
+    "leaves.holidays": _policy("leaves.holidays", 24 * 3600, shared=True),
+    # HRMS is slow to answer these at peak; serve stale while refreshing.
+    "misc.financial_years": _policy("misc.financial_years", 6 * 3600, stale_grace=24 * 3600),
+    "feedback.levels": _policy("feedback.levels", 3600),
+    # Personal data below is invalidated by the writes in INVALIDATES, so it
+    # can be kept long; the TTL only bounds changes made outside XMCP.
+    "leaves.my_leaves": _policy("leaves.my_leaves", 3600),
+    "team.ledger": _policy("team.ledger", 600, stale_grace=3600),
+    "attendance.arrs": _policy("attendance.arrs", 3600),
+    "tickets.list": _policy("tickets.list", 600),
+    "feedback.rm_feedbacks": _policy("feedback.rm_feedbacks", 3600),
+}
+
+
+class Stale(NamedTuple):
+    """A cached read made stale by a write.
+
+    With ``partitioned`` set only the partition named by the write (e.g. the
+    month an ARR was submitted for) is dropped when it is known;
+    otherwise every entry of the endpoint for the principal is.
+    """
+
+    endpoint: str
+    partitioned: bool = False
+
+
+# Mutating operations, named "<domain>.<write>", and the reads they make stale.
+INVALIDATES: Dict[str, Tuple[Stale, ...]] = {
+    # Leave reads are keyed by the caller's fyId ("2025-26"), which a write's
+    # response does not report, so every financial year is dropped.
+    "leaves.apply_leave": (Stale("leaves.my_leaves"), Stale("team.ledger")),
+    "leaves.apply_comp_off": (Stale("leaves.my_leaves"), Stale("team.ledger")),
+    "attendance.apply_leave": (Stale("leaves.my_leaves"), Stale("team.ledger")),
+    "attendance.submit_arr": (Stale("attendance.arrs", partitioned=True),),
+    "feedback.add_feedback": (Stale("feedback.rm_feedbacks"),),
+    "tickets.raise_ticket": (Stale("tickets.list"),),
+    "tickets.submit_ticket": (Stale("tickets.list"),),
+}
+
+
+def _memory_backend() -> cache_backends.MemoryBackend:
+    return cache_backends.MemoryBackend(
+        max_bytes=int(_env_number("XMCP_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+        max_entries=int(_env_number("XMCP_CACHE_MAX_ENTRIES", 10000)),
+    )
+
+
+def create_backend() -> cache_backends.CacheBackend:
+    """Build the backend selected by ``XMCP_CACHE_BACKEND``."""
+    kind = os.getenv("XMCP_CACHE_BACKEND", "memory").strip().lower()
+    if kind == "redis":
+        try:
+            import redis.asyncio  # noqa: F401
+        except ImportError:
+            logger.warning("XMCP_CACHE_BACKEND=redis but 'redis' is not installed; using memory")
+            return _memory_backend()
+        shared = cache_backends.RedisBackend(
+            url=os.getenv("XMCP_CACHE_REDIS_URL", "redis://localhost:6379/0"),
+            timeout=_env_number("XMCP_CACHE_REDIS_TIMEOUT", 0.25),
+        )
+        return cache_backends.FallbackBackend(shared, _memory_backend())
+    if kind != "memory":
+        raise ValueError(f"Unknown XMCP_CACHE_BACKEND {kind!r}; expected 'memory' or 'redis'")
+    return _memory_backend()
+
+
+_backend: Optional[cache_backends.CacheBackend] = None
+_prefix = os.getenv("XMCP_CACHE_PREFIX", "xmcp:")
+hits = 0
+misses = 0
+stale_hits = 0
+refreshes = 0
+
+
+def get_backend() -> cache_backends.CacheBackend:
+    global _backend
+    if _backend is None:
+        _backend = create_backend()
+    return _backend
+
+
+def set_backend(backend: Optional[cache_backends.CacheBackend]) -> None:
+    """Replace the cache backend (``None`` rebuilds it from the environment)."""
+    global _backend
+    _backend = backend
+
+
+def enabled() -> bool:
+    return os.getenv("XMCP_CACHE_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+def _scope(endpoint: str, auth_header: str) -> str:
+    return SHARED if POLICIES[endpoint].shared else auth_context.principal_key(auth_header)
+
+
+def _entry_key(endpoint: str, *parts: Any) -> str:
+    # "<prefix>c:<endpoint>|<json parts>" so an endpoint's entries share a prefix
+    return f"{_prefix}c:{endpoint}|" + codec.dumps(parts).decode()
+
+
+def _generation_key(endpoint: str, *parts: Any) -> str:
+    # Kept apart from the entries so flushing the cache never resets a counter
+    return f"{_prefix}g:{endpoint}|" + codec.dumps(parts).decode()
+
+
+def _lifetime(policy: CachePolicy) -> float:
+    return policy.ttl + policy.stale_grace
+
+
+def _generation_ttl(endpoint: str) -> float:
+    # Counters must outlive every entry keyed by them, or a reset counter
+    # would make those entries reachable again.
+    return 2 * _lifetime(POLICIES[endpoint])
+
+
+class Body(NamedTuple):
+    """A body returned by a loader, with the ``Content-Type`` HRMS sent (if any)."""
+
+    content: bytes
+    content_type: Optional[str] = None
+
+
+def body(response: Any) -> Body:
+    """The body and content type of an HRMS ``httpx.Response``, for loaders."""
+    return Body(response.content, response.headers.get("content-type"))
+
+
+def _loaded(value: Union[bytes, Body]) -> Body:
+    return value if isinstance(value, Body) else Body(value)
+
+
+def _pack(loaded: Body) -> bytes:
+    # Wall-clock store time, so the age is meaningful across workers, then the content type
+    head = b"%.3f" % time.time()
+    if loaded.content_type:
+        head += b" " + loaded.content_type.encode("latin-1")
+    return head + b"\n" + loaded.content
+
+
+def _unpack(data: bytes) -> Tuple[float, Optional[str], bytes]:
+    head, _, body = data.partition(b"\n")
+    stored_at, _, content_type = head.partition(b" ")
+    return float(stored_at), content_type.decode("latin-1") or None, body
+
+
+class Cached(NamedTuple):
+    """An HRMS response body, how many seconds ago it was fetched, and its content type."""
+
+    body: bytes
+    age: float
+    content_type: Optional[str] = None
+
+
+# Background refreshes started by stale hits; held so they are not garbage collected.
+_refreshes: Set[asyncio.Task] = set()
+# How long one caller owns an entry's refresh; a failed refresh is retried after it.
+REFRESH_CLAIM_TTL = 30.0
+
+
+async def _revalidate(
+    backend: cache_backends.CacheBackend,
+    cache_key: str,
+    policy: CachePolicy,
+    load: Callable[[], Awaitable[Union[bytes, Body]]],
+) -> None:
+    global refreshes
+    if not await backend.claim(cache_key + "#refresh", REFRESH_CLAIM_TTL):
+        return
+    refreshes += 1
+
+    async def refresh() -> None:
+        try:
+            await backend.set(cache_key, _pack(_loaded(await load())), _lifetime(policy))
+        except Exception:
+            logger.warning("Background refresh of %s failed", cache_key.split("|")[0], exc_info=True)
+
+    task = asyncio.get_running_loop().create_task(refresh())
+    _refreshes.add(task)
+    task.add_done_callback(_refreshes.discard)
+
+
+async def fetch(
+    endpoint: str,
+    auth_header: str,
+    key: Hashable,
+    load: Callable[[], Awaitable[Union[bytes, Body]]],
+    partition: Hashable = None,
+) -> Cached:
+    """Return the cached HRMS body for ``endpoint``/``key`` or ``load()`` it.
+
+    ``load`` must return the raw JSON response body (or a :class:`Body`
+    carrying its content type, see :func:`body`) and raise on failure, so
+    errors are never cached.  ``partition`` names the slice of the endpoint's
+    data the key belongs to, for partitioned invalidation.
+    """
+    global hits, misses, stale_hits
+    if not enabled():
+        loaded = _loaded(await load())
+        return Cached(loaded.content, 0.0, loaded.content_type)
+    backend = get_backend()
+    policy = POLICIES[endpoint]
+    scope = _scope(endpoint, auth_header)
+    generations = await backend.generations(
+        [_generation_key(endpoint, scope), _generation_key(endpoint, scope, partition)]
+    )
+    cache_key = _entry_key(endpoint, scope, generations, partition, key)
+    data = await backend.get(cache_key)
+    if data is not None:
+        stored_at, content_type, content = _unpack(data)
+        age = max(0.0, time.time() - stored_at)
+        if age < policy.ttl:
+            hits += 1
+            return Cached(content, age, content_type)
+        if age < _lifetime(policy):
+            stale_hits += 1
+            await _revalidate(backend, cache_key, policy, load)
+            return Cached(content, age, content_type)
+    misses += 1
+    loaded = _loaded(await load())
+    await backend.set(cache_key, _pack(loaded), _lifetime(policy))
+    return Cached(loaded.content, 0.0, loaded.content_type)
+
+
+async def cached(
+    endpoint: str,
+    auth_header: str,
+    key: Hashable,
+    load: Callable[[], Awaitable[Union[bytes, Body]]],
+    partition: Hashable = None,
+) -> bytes:
+    """Like :func:`fetch`, returning only the body."""
+    return (await fetch(endpoint, auth_header, key, load, partition)).body
+
+
+async def invalidate(operation: str, auth_header: str, partition: Hashable = None) -> None:
+    """Drop the cached reads ``operation`` made stale for the calling principal."""
+    backend = get_backend()
+    for stale in INVALIDATES[operation]:
+        scope = _scope(stale.endpoint, auth_header)
+        if stale.partitioned and partition is not None:
+            key = _generation_key(stale.endpoint, scope, partition)
+        else:
+            key = _generation_key(stale.endpoint, scope)
+        await backend.bump(key, _generation_ttl(stale.endpoint))
+
+
+async def clear(endpoint: Optional[str] = None) -> int:
+    """Remove every cached entry (or only ``endpoint``'s); return how many were removed."""
+    return await get_backend().clear(f"{_prefix}c:" if endpoint is None else f"{_prefix}c:{endpoint}|")
+
+
+async def aclose() -> None:
+    """Close the shared backend's connections for the current loop (FastAPI lifespan hook)."""
+    close = getattr(_backend, "aclose", None)
+    if close is not None:
+        await close()
+
+
+def stats() -> Dict[str, Any]:
+    lookups = hits + stale_hits + misses
+    return {
+        "hits": hits,
+        "stale_hits": stale_hits,
+        "misses": misses,
+        "hit_ratio": round((hits + stale_hits) / lookups, 4) if lookups else 0.0,
+        "refreshes": refreshes,
+        **get_backend().stats(),
+    }
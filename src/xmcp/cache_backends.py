@@ -0,0 +1,330 @@
+"""Storage backends for :mod:`xmcp.cache`.
+
+A backend stores opaque encoded payloads under string keys with a TTL, plus
+integer generation counters used for invalidation.  Two implementations ship:
+
+- :class:`MemoryBackend` – bounded in-process LRU (the default).
+- :class:`RedisBackend` – any Redis-protocol server, shared by every worker
+  and pod.  Needs ``redis`` (``pip install xmcp-hrms[redis]``).
+
+:class:`FallbackBackend` wraps a shared backend and serves from a local
+:class:`MemoryBackend` while the shared one is unreachable.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """Interface implemented by the cache backends."""
+
+    name = "base"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    async def set(self, key: str, data: bytes, ttl: float) -> None:
+        raise NotImplementedError
+
+    async def generations(self, keys: Sequence[str]) -> List[int]:
+        """Current value of each generation counter (``0`` when unset)."""
+        raise NotImplementedError
+
+    async def bump(self, key: str, ttl: float) -> None:
+        """Increment a generation counter and keep it for at least ``ttl`` seconds."""
+        raise NotImplementedError
+
+    async def claim(self, key: str, ttl: float) -> bool:
+        """Take ``key`` for ``ttl`` seconds; ``False`` if someone already holds it."""
+        raise NotImplementedError
+
+    async def clear(self, prefix: str) -> int:
+        """Delete every entry whose key starts with ``prefix``; return the count."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+class MemoryBackend(CacheBackend):
+    """Bounded LRU of encoded payloads with per-entry expiry.
+
+    Generation counters expire after their ``ttl`` and at most
+    ``max_generations`` (default ``max_entries``) are kept.
+
+    Safe to use from several threads (the app loop and the background loop
+    used by sync tool calls).
+    """
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int, max_entries: int, max_generations: Optional[int] = None) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_generations = max_generations or max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._bytes = 0
+        # key -> (counter, expiry); unset counters read as ``_floor``
+        self._generations: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._floor = 0
+        self._claims: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    async def set(self, key: str, data: bytes, ttl: float) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + ttl, data)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        _, data = self._entries.pop(key)
+        self._bytes -= len(data)
+
+    def _generation(self, key: str, now: float) -> int:
+        # Called with the lock held.  An expired counter has outlived every
+        # entry keyed by it (see ``xmcp.cache._generation_ttl``), so it may
+        # start over.
+        current = self._generations.get(key)
+        if current is None:
+            return self._floor
+        if current[1] <= now:
+            del self._generations[key]
+            return self._floor
+        return current[0]
+
+    async def generations(self, keys: Sequence[str]) -> List[int]:
+        now = time.monotonic()
+        with self._lock:
+            return [self._generation(key, now) for key in keys]
+
+    async def bump(self, key: str, ttl: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            value = self._generation(key, now) + 1
+            expires = max(now + ttl, self._generations.get(key, (0, 0.0))[1])
+            self._generations[key] = (value, expires)
+            self._generations.move_to_end(key)
+            while len(self._generations) > self.max_generations:
+                # Entries keyed by an evicted counter may still be live; no
+                # counter may read as its value again, so raise the floor past it
+                _, (evicted, _) = self._generations.popitem(last=False)
+                self._floor = max(self._floor, evicted + 1)
+
+    async def claim(self, key: str, ttl: float) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            if self._claims.get(key, 0.0) > now:
+                return False
+            # Drop expired claims while we hold the lock
+            self._claims = {k: t for k, t in self._claims.items() if t > now}
+            self._claims[key] = now + ttl
+            return True
+
+    async def clear(self, prefix: str) -> int:
+        with self._lock:
+            keys = [k for k in self._entries if k.startswith(prefix)]
+            for key in keys:
+                self._drop(key)
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.name,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+                "generations": len(self._generations),
+            }
+
+
+class RedisBackend(CacheBackend):
+    """Cache entries in a Redis-protocol server.
+
+    ``client`` may be any ``redis.asyncio.Redis``-compatible object (e.g.
+    ``fakeredis.aioredis.FakeRedis`` in tests); otherwise one client per
+    event loop is created from ``url``.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = "redis://localhost:6379/0", timeout: float = 0.25, client: Any = None) -> None:
+        self.url = url
+        self.timeout = timeout
+        self._client = client
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+    def _redis(self) -> Any:
+        if self._client is not None:
+            return self._client
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            import redis.asyncio as aioredis
+
+            client = aioredis.from_url(
+                self.url, socket_timeout=self.timeout, socket_connect_timeout=self.timeout
+            )
+            self._clients[loop] = client
+        return client
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._redis().get(key)
+
+    async def set(self, key: str, data: bytes, ttl: float) -> None:
+        await self._redis().set(key, data, px=max(1, int(ttl * 1000)))
+
+    async def generations(self, keys: Sequence[str]) -> List[int]:
+        values = await self._redis().mget(list(keys))
+        return [int(v) if v is not None else 0 for v in values]
+
+    async def bump(self, key: str, ttl: float) -> None:
+        async with self._redis().pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.pexpire(key, max(1, int(ttl * 1000)))
+            await pipe.execute()
+
+    async def claim(self, key: str, ttl: float) -> bool:
+        return bool(await self._redis().set(key, b"1", px=max(1, int(ttl * 1000)), nx=True))
+
+    async def clear(self, prefix: str) -> int:
+        redis = self._redis()
+        deleted = 0
+        async for key in redis.scan_iter(match=prefix + "*", count=500):
+            deleted += await redis.delete(key)
+        return deleted
+
+    async def aclose(self) -> None:
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+class FallbackBackend(CacheBackend):
+    """Use ``shared`` while it works and ``local`` for ``retry_after`` seconds after it fails.
+
+    Invalidations made during an outage are remembered and replayed against
+    the shared backend once it is reachable again, so entries cached there
+    before the outage are not served after a write that happened during it.
+    Every invalidation is applied to ``local`` as well, so entries it cached
+    during one outage are not served in the next after a write in between.
+    """
+
+    def __init__(self, shared: CacheBackend, local: MemoryBackend, retry_after: float = 30.0) -> None:
+        self.shared = shared
+        self.local = local
+        self.retry_after = retry_after
+        self.name = shared.name
+        self._down_until = 0.0
+        self._pending: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.failures = 0
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, exc: Exception) -> None:
+        self.failures += 1
+        if self._available():
+            logger.warning(
+                "Shared %s cache unavailable (%s); using the process-local cache for %.0fs",
+                self.shared.name, exc, self.retry_after,
+            )
+        self._down_until = time.monotonic() + self.retry_after
+
+    async def _call(self, method: str, *args: Any) -> Any:
+        if self._available():
+            try:
+                await self._replay()
+                return await getattr(self.shared, method)(*args)
+            except Exception as exc:
+                self._failed(exc)
+        return await getattr(self.local, method)(*args)
+
+    async def _replay(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        try:
+            for key, ttl in pending.items():
+                await self.shared.bump(key, ttl)
+        except Exception:
+            with self._lock:
+                for key, ttl in pending.items():
+                    self._pending.setdefault(key, ttl)
+            raise
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._call("get", key)
+
+    async def set(self, key: str, data: bytes, ttl: float) -> None:
+        await self._call("set", key, data, ttl)
+
+    async def generations(self, keys: Sequence[str]) -> List[int]:
+        return await self._call("generations", keys)
+
+    async def claim(self, key: str, ttl: float) -> bool:
+        return await self._call("claim", key, ttl)
+
+    async def bump(self, key: str, ttl: float) -> None:
+        await self.local.bump(key, ttl)
+        if self._available():
+            try:
+                await self._replay()
+                await self.shared.bump(key, ttl)
+                return
+            except Exception as exc:
+                self._failed(exc)
+        with self._lock:
+            self._pending[key] = ttl
+
+    async def clear(self, prefix: str) -> int:
+        cleared = await self.local.clear(prefix)
+        if self._available():
+            try:
+                cleared += await self.shared.clear(prefix)
+            except Exception as exc:
+                self._failed(exc)
+        return cleared
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.shared.name,
+            "available": self._available(),
+            "failures": self.failures,
+            "pending_invalidations": len(self._pending),
+            "local": self.local.stats(),
+        }
+
+    async def aclose(self) -> None:
+        close = getattr(self.shared, "aclose", None)
+        if close is not None:
+            await close()
+
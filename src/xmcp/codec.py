@@ -0,0 +1,48 @@
+"""Compact JSON encoding shared by the cache, clients and response layers.
+
+Uses ``orjson`` when it is installed (``pip install xmcp-hrms[fast]``) and
+falls back to the standard library otherwise; both produce compact UTF-8
+JSON with ``date``/``datetime`` values as ISO 8601 strings, so data written
+by one can be read by the other.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, time
+from typing import Any
+
+from fastapi.responses import JSONResponse as _JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # orjson handles these natively; the stdlib needs them spelled out
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(
+        value, separators=(",", ":"), ensure_ascii=False, default=_default
+    ).encode()
+
+
+def loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class JSONResponse(_JSONResponse):
+    """``JSONResponse`` rendered with :func:`dumps`."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,143 @@
+"""Columnar encoding for list-shaped tool results.
+
+Tool results such as ``LeavesResponse`` carry a ``data`` list whose rows all
+repeat the same keys.  With ``format="columnar"`` the list is sent as a
+table instead::
+
+    {"columns": ["id", "leaveDate", "createdAt"],
+     "rows": [["l-1", "2025-04-01", "2025-03-28T10:15"], ...],
+     "nullColumns": ["comments"],
+     "suffixes": {"createdAt": ":00.000Z"}}
+
+- columns that are null (or missing) in every row are listed in
+  ``nullColumns`` instead of being sent per row;
+- ISO timestamps in a column lose the tail they all share after the minutes
+  (``:00.000Z`` above), recorded in ``suffixes``.
+
+:func:`decode` turns a table (or a body whose ``data`` is one) back into the
+row dicts, with the ``nullColumns`` keys after the others; a key missing
+from some rows of an otherwise present column comes back as ``null``.  The default format for MCP tools and
+``/mcp-compat`` is ``XMCP_RESULT_FORMAT`` (``json`` unless set).
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from typing import Any, Dict, List, Literal, Mapping, Optional, Sequence
+
+FORMAT_JSON = "json"
+FORMAT_COLUMNAR = "columnar"
+FORMATS = (FORMAT_JSON, FORMAT_COLUMNAR)
+Format = Literal["json", "columnar"]
+
+DEFAULT_FORMAT = os.getenv("XMCP_RESULT_FORMAT", FORMAT_JSON)
+if DEFAULT_FORMAT not in FORMATS:
+    raise ValueError(f"XMCP_RESULT_FORMAT must be one of {FORMATS}, not {DEFAULT_FORMAT!r}")
+
+# Date and time up to the minutes; only what follows is ever shortened
+_ISO_MINUTES = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}")
+_MINUTES_END = 16
+
+
+def _shared_suffix(values: Sequence[Any]) -> str:
+    """The tail after the minutes shared by every timestamp in ``values``."""
+    suffix: Optional[str] = None
+    for value in values:
+        if value is None:
+            continue
+        if not isinstance(value, str) or not _ISO_MINUTES.match(value):
+            return ""
+        tail = value[_MINUTES_END:]
+        if suffix is None:
+            suffix = tail
+            continue
+        common = 0
+        while common < min(len(suffix), len(tail)) and suffix[-1 - common] == tail[-1 - common]:
+            common += 1
+        suffix = suffix[len(suffix) - common:]
+        if not suffix:
+            return ""
+    return suffix or ""
+
+
+def table(items: Sequence[Mapping[str, Any]]) -> Dict[str, Any]:
+    """Encode the row dicts ``items`` as a columnar table."""
+    columns = list(dict.fromkeys(key for item in items for key in item))
+    values = {column: [item.get(column) for item in items] for column in columns}
+    nulls = {column for column in columns if all(value is None for value in values[column])}
+    kept = [column for column in columns if column not in nulls]
+    suffixes: Dict[str, str] = {}
+    for column in kept:
+        suffix = _shared_suffix(values[column])
+        if suffix:
+            suffixes[column] = suffix
+            cut = -len(suffix)
+            values[column] = [None if value is None else value[:cut] for value in values[column]]
+    if kept:
+        rows = [list(row) for row in zip(*(values[column] for column in kept))]
+    else:
+        rows = [[] for _ in items]
+    out: Dict[str, Any] = {"columns": kept, "rows": rows}
+    if nulls:
+        out["nullColumns"] = [column for column in columns if column in nulls]
+    if suffixes:
+        out["suffixes"] = suffixes
+    return out
+
+
+def _is_rows(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(item, Mapping) for item in value)
+
+
+def _is_table(value: Any) -> bool:
+    return (
+        isinstance(value, Mapping)
+        and isinstance(value.get("columns"), list)
+        and isinstance(value.get("rows"), list)
+    )
+
+
+def encode(result: Any) -> Any:
+    """``result`` with its row list (the result itself, or its ``data``) as a table.
+
+    Anything that is not a list of row dicts is returned unchanged.
+    """
+    if _is_rows(result):
+        return table(result)
+    if isinstance(result, dict) and _is_rows(result.get("data")):
+        return {**result, "data": table(result["data"])}
+    return result
+
+
+def rows(encoded: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """The row dicts of a table built by :func:`table`."""
+    columns = encoded["columns"]
+    suffixes = encoded.get("suffixes") or {}
+    nulls = dict.fromkeys(encoded.get("nullColumns") or ())
+    tails = [suffixes.get(column, "") for column in columns]
+    out = []
+    for row in encoded["rows"]:
+        item = {
+            column: value + tail if tail and value is not None else value
+            for column, value, tail in zip(columns, row, tails)
+        }
+        item.update(nulls)
+        out.append(item)
+    return out
+
+
+def decode(result: Any) -> Any:
+    """Reverse :func:`encode`; results that hold no table are returned unchanged."""
+    if _is_table(result):
+        return rows(result)
+    if isinstance(result, dict) and _is_table(result.get("data")):
+        return {**result, "data": rows(result["data"])}
+    return result
+
+
+def apply(result: Any, format: Optional[str] = None) -> Any:
+    """``result`` in ``format`` (``DEFAULT_FORMAT`` when ``None``)."""
+    if (format or DEFAULT_FORMAT) == FORMAT_COLUMNAR:
+        return encode(result)
+    return result
@@ -1,37 +1,52 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
-import json
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
 import os
 
 import httpx
 from fastapi import APIRouter, Body, HTTPException, Request, status
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, Field, ValidationError
 
 import xmcp.tool_registry as tool_registry
 import xmcp.auth_context as auth_context
+import xmcp.codec as codec
+import xmcp.columnar as columnar
+import xmcp.cursors as cursors
+import xmcp.metrics as metrics
 
-all_tool_specs = tool_registry.all_tool_specs
+get_registry = tool_registry.get_registry
 set_request_headers = auth_context.set_request_headers
 auth_header_getter = auth_context.auth_header_getter
 
 router = APIRouter(prefix="/mcp-compat", tags=["mcp-compat"])
 
+logger = logging.getLogger(__name__)
 
-# ---- Helpers ----
-
-def _load_specs(request: Request):
-    """
-    Build ToolSpecs with the current request headers bound, so tools can
-    propagate Authorization (or other) headers via auth_header_getter().
-    """
-    set_request_headers(dict(request.headers))
-    base =  ("http://localhost:8000").rstrip("/")
-    return list(all_tool_specs(base, auth_header_getter))
 
+# ---- Helpers ----
+# Tools come from the process-wide ToolRegistry; they resolve the Authorization
+# header from the request headers stashed in auth_context at call time.
 
-def _by_exact_name(specs) -> Dict[str, Any]:
-    return {s.name: s for s in specs}
+@lru_cache(maxsize=None)
+def _tool_listing(registry: tool_registry.ToolRegistry) -> Tuple[Dict[str, Any], ...]:
+    out: List[Dict[str, Any]] = [
+        {"name": "ping", "description": "health check", "args_schema": None}
+    ]
+    for s in registry:
+        schema = None
+        if getattr(s, "args_schema", None):
+            try:
+                schema = s.args_schema.model_json_schema()
+            except Exception:
+                # Fallback minimal schema
+                schema = {"title": getattr(s.args_schema, "__name__", "Args")}
+        out.append(
+            {"name": s.name, "description": getattr(s, "description", ""), "args_schema": schema}
+        )
+    return tuple(out)
 
 
 # ---- Models ----
@@ -41,11 +56,13 @@ class InvokeBody(BaseModel):
     Unified body: supports both payload styles on both endpoints.
       - /invoke: { "name": "tool_name", "arguments": {...} }
       - /call:   { "tool": "tool_name", "args": {...} }
+    Either may add "format": "columnar" to get list results as a table.
     """
     name: str | None = None
     arguments: Dict[str, Any] | None = None
     tool: str | None = None
     args: Dict[str, Any] | None = None
+    format: columnar.Format | None = None
 
     def pick(self) -> Tuple[str, Dict[str, Any]]:
         tool_name = self.name or self.tool
@@ -63,44 +80,43 @@ class InvokeBody(BaseModel):
         return tool_name, tool_args
 
 
+class BatchBody(BaseModel):
+    """Body for /batch: independent tool calls run concurrently."""
+    items: List[InvokeBody] = Field(..., min_length=1)
+    max_concurrency: Optional[int] = Field(None, ge=1)
+    # Default for items that don't set their own format
+    format: columnar.Format | None = None
+
+
+# Batch limits; a request may lower the concurrency but not raise it.
+BATCH_MAX_ITEMS = int(os.getenv("XMCP_BATCH_MAX_ITEMS", "20"))
+BATCH_CONCURRENCY = int(os.getenv("XMCP_BATCH_CONCURRENCY", "6"))
+
+
 # ---- Routes ----
 
 @router.get("/tools")
 def list_tools(request: Request):
-    specs = _load_specs(request)
-    out: List[Dict[str, Any]] = [
-        {"name": "ping", "description": "health check", "args_schema": None}
-    ]
-    for s in specs:
-        schema = None
-        if getattr(s, "args_schema", None):
-            try:
-                schema = s.args_schema.model_json_schema()
-            except Exception:
-                # Fallback minimal schema
-                schema = {"title": getattr(s.args_schema, "__name__", "Args")}
-        out.append(
-            {"name": s.name, "description": getattr(s, "description", ""), "args_schema": schema}
-        )
-    return {"tools": out}
+    return {"tools": list(_tool_listing(get_registry()))}
 
 
-def _execute(spec, args: Dict[str, Any]):
+def _validate(spec, args: Dict[str, Any]) -> Dict[str, Any]:
     # Validate args against the tool's schema if present
     if getattr(spec, "args_schema", None):
         try:
             args = spec.args_schema(**args).model_dump()
         except ValidationError as e:
             # Clean 422 with pydantic error details
-            raise HTTPException(status_code=422, detail=json.loads(e.json()))
-    # Call the tool function (sync in your codebase)
-    try:
-        return spec.func(**args)
-    except httpx.HTTPStatusError as exc:
+            raise HTTPException(status_code=422, detail=codec.loads(e.json()))
+    return args
+
+
+def _http_exception(exc: httpx.HTTPError) -> HTTPException:
+    if isinstance(exc, httpx.HTTPStatusError):
         # Map backend status + JSON detail when available
         detail: Any = exc.response.text
         try:
-            data = exc.response.json()
+            data = codec.loads(exc.response.content)
         except ValueError:
             pass
         else:
@@ -108,9 +124,20 @@ def _execute(spec, args: Dict[str, Any]):
                 detail = data["detail"]
             else:
                 detail = data
-        raise HTTPException(status_code=exc.response.status_code, detail=detail) from exc
+        return HTTPException(status_code=exc.response.status_code, detail=detail)
+    return HTTPException(status_code=502, detail=str(exc))
+
+
+def _execute(spec, args: Dict[str, Any]):
+    args = _validate(spec, args)
+    # Call the tool function (sync in your codebase)
+    try:
+        with metrics.tool_call(spec.name):
+            return spec.func(**args)
     except httpx.HTTPError as exc:
-        raise HTTPException(status_code=502, detail=str(exc)) from exc
+        raise _http_exception(exc) from exc
+    except cursors.UnknownCursor as exc:
+        raise HTTPException(status_code=404, detail=str(exc)) from exc
 
 
 @router.post("/invoke")
@@ -122,17 +149,76 @@ def invoke_tool(body: InvokeBody = Body(...), request: Request = None):
         return {"result": "pong"}
 
     name, args = body.pick()
-    specs = _by_exact_name(_load_specs(request))
-    spec = specs.get(name)
+    registry = get_registry()
+    spec = registry.get(name)
     if not spec:
         raise HTTPException(
             status_code=404,
-            detail={"error": f"Tool '{name}' not found", "available_tools": sorted(specs.keys())},
+            detail={"error": f"Tool '{name}' not found", "available_tools": registry.names()},
         )
-    return {"result": _execute(spec, args)}
+    return {"result": columnar.apply(cursors.limit(_execute(spec, args)), body.format)}
 
 
 @router.post("/call")
 def call_tool(body: InvokeBody = Body(...), request: Request = None):
     # Identical behavior to /invoke; accepts either payload style
     return invoke_tool(body, request)
+
+
+@router.post("/batch")
+async def batch_tools(body: BatchBody = Body(...), request: Request = None):
+    """Run several independent tools concurrently; results come back in item order.
+
+    Every item is validated before any runs, and an invalid batch is rejected
+    as a whole.  Failures while running are reported per item.
+    """
+    if request is not None:
+        set_request_headers(dict(request.headers))
+    if len(body.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=422, detail=f"A batch may contain at most {BATCH_MAX_ITEMS} items"
+        )
+
+    registry = get_registry()
+    calls: List[Tuple[str, Any, Dict[str, Any], Optional[str]]] = []
+    errors: List[Dict[str, Any]] = []
+    for index, item in enumerate(body.items):
+        try:
+            name, args = item.pick()
+            if name == "ping":
+                calls.append((name, None, {}, None))
+                continue
+            spec = registry.get(name)
+            if not spec:
+                raise HTTPException(status_code=404, detail=f"Tool '{name}' not found")
+            calls.append((name, spec, _validate(spec, args), item.format or body.format))
+        except HTTPException as exc:
+            errors.append({"index": index, "status_code": exc.status_code, "detail": exc.detail})
+    if errors:
+        raise HTTPException(status_code=422, detail={"errors": errors})
+
+    limit = min(body.max_concurrency or BATCH_CONCURRENCY, BATCH_CONCURRENCY)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(name: str, spec, args: Dict[str, Any], format: Optional[str]) -> Dict[str, Any]:
+        if spec is None:
+            return {"name": name, "result": "pong"}
+        async with semaphore:
+            try:
+                with metrics.tool_call(name):
+                    if spec.coroutine is not None:
+                        result = await spec.coroutine(**args)
+                    else:
+                        result = await asyncio.to_thread(spec.func, **args)
+            except httpx.HTTPError as exc:
+                error = _http_exception(exc)
+                return {"name": name, "error": {"status_code": error.status_code, "detail": error.detail}}
+            except cursors.UnknownCursor as exc:
+                return {"name": name, "error": {"status_code": 404, "detail": str(exc)}}
+            except Exception:
+                # The message may carry internals; it goes to the log, not the caller
+                logger.exception("Batch item %s failed", name)
+                return {"name": name, "error": {"status_code": 500, "detail": "Internal error"}}
+        return {"name": name, "result": columnar.apply(cursors.limit(result), format)}
+
+    return {"results": await asyncio.gather(*(run(*call) for call in calls))}
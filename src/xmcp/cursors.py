@@ -0,0 +1,231 @@
+"""Server-side cursors for oversized tool results.
+
+A tool result whose ``data`` rows encode to more than
+``XMCP_CURSOR_THRESHOLD_BYTES`` is cut into chunks of about that size.  The
+caller gets the first chunk, the rest of the envelope, and::
+
+    "nextCursor": "<opaque id>", "remainingRecords": 1800
+
+The ``fetch_more`` tool then serves the following chunks from memory, each
+with the cursor of the next one (``null`` after the last), without calling
+HRMS again.  Cursors belong to the caller that created them (see
+:func:`xmcp.auth_context.principal_key`) and live in the worker process that
+served the original call.
+
+Stored chunks are kept as encoded JSON in a bounded store: entries expire
+``XMCP_CURSOR_TTL`` seconds after they were last read, and the least
+recently used are evicted past ``XMCP_CURSOR_MAX_BYTES`` or
+``XMCP_CURSOR_MAX_ENTRIES``.
+
+- ``XMCP_CURSOR_THRESHOLD_BYTES`` – result/chunk size in bytes (default 64 KiB, ``0`` disables).
+- ``XMCP_CURSOR_TTL`` – idle seconds before a cursor expires (default ``600``).
+- ``XMCP_CURSOR_MAX_BYTES`` – memory cap for stored chunks (default 32 MiB).
+- ``XMCP_CURSOR_MAX_ENTRIES`` – maximum open cursors (default ``1000``).
+"""
+
+from __future__ import annotations
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+import xmcp.auth_context as auth_context
+import xmcp.codec as codec
+import xmcp.tools.base as tools_base
+
+THRESHOLD_BYTES = int(os.getenv("XMCP_CURSOR_THRESHOLD_BYTES", str(64 * 1024)))
+TTL = float(os.getenv("XMCP_CURSOR_TTL", "600"))
+MAX_BYTES = int(os.getenv("XMCP_CURSOR_MAX_BYTES", str(32 * 1024 * 1024)))
+MAX_ENTRIES = int(os.getenv("XMCP_CURSOR_MAX_ENTRIES", "1000"))
+
+
+class UnknownCursor(LookupError):
+    """The cursor expired, was evicted, or belongs to another caller."""
+
+
+@dataclass
+class _Entry:
+    owner: str
+    expires: float
+    # Encoded row lists; chunks already read are released (None)
+    chunks: List[Optional[bytes]]
+    counts: List[int]
+    size: int
+
+
+class CursorStore:
+    """Bounded LRU of chunked results with idle expiry.
+
+    Safe to use from several threads (the app loop and the background loop
+    used by sync tool calls).
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.served = 0
+        self.missed = 0
+        self.evictions = 0
+
+    def put(self, owner: str, chunks: List[bytes], counts: List[int]) -> Optional[str]:
+        """Store ``chunks`` for ``owner``; the cursor of the first, or ``None`` if too big."""
+        size = sum(len(chunk) for chunk in chunks)
+        if size > self.max_bytes:
+            return None
+        key = secrets.token_urlsafe(16)
+        with self._lock:
+            self._purge(time.monotonic())
+            self._entries[key] = _Entry(owner, time.monotonic() + self.ttl, list(chunks), counts, size)
+            self._bytes += size
+            self.opened += 1
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+        return f"{key}.0"
+
+    def take(self, owner: str, cursor: str) -> Tuple[bytes, Optional[str], int]:
+        """The chunk at ``cursor``, the next cursor (``None`` after the last) and rows left after it."""
+        key, _, index_text = cursor.rpartition(".")
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            index = int(index_text) if index_text.isdigit() else -1
+            if (
+                entry is None
+                or entry.expires <= now
+                or entry.owner != owner
+                or not 0 <= index < len(entry.chunks)
+                or entry.chunks[index] is None
+            ):
+                if entry is not None and entry.expires <= now:
+                    self._drop(key)
+                self.missed += 1
+                raise UnknownCursor("Cursor expired or unknown; run the original tool again")
+            # Chunks before this one won't be read again; the current one stays for a retry
+            for earlier in range(index):
+                if entry.chunks[earlier] is not None:
+                    released = len(entry.chunks[earlier])
+                    entry.chunks[earlier] = None
+                    entry.size -= released
+                    self._bytes -= released
+            entry.expires = now + self.ttl
+            self._entries.move_to_end(key)
+            self.served += 1
+            last = index + 1 == len(entry.chunks)
+            return (
+                entry.chunks[index],
+                None if last else f"{key}.{index + 1}",
+                sum(entry.counts[index + 1:]),
+            )
+
+    def _purge(self, now: float) -> None:
+        for key in [key for key, entry in self._entries.items() if entry.expires <= now]:
+            self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "opened": self.opened,
+                "served": self.served,
+                "missed": self.missed,
+                "evictions": self.evictions,
+            }
+
+
+store = CursorStore(MAX_BYTES, MAX_ENTRIES, TTL)
+
+
+def _owner() -> str:
+    return auth_context.principal_key(auth_context.auth_header_getter())
+
+
+def _chunks(rows: List[Any], limit: int) -> Tuple[List[bytes], List[int]]:
+    # Greedy split into encoded lists of at most ``limit`` bytes (one row at least)
+    chunks: List[bytes] = []
+    counts: List[int] = []
+    current: List[bytes] = []
+    size = 2
+    for row in rows:
+        encoded = codec.dumps(row)
+        if current and size + len(encoded) + 1 > limit:
+            chunks.append(b"[" + b",".join(current) + b"]")
+            counts.append(len(current))
+            current, size = [], 2
+        current.append(encoded)
+        size += len(encoded) + 1
+    if current:
+        chunks.append(b"[" + b",".join(current) + b"]")
+        counts.append(len(current))
+    return chunks, counts
+
+
+def limit(result: Any) -> Any:
+    """``result`` with only its first chunk of ``data`` rows when the rows are too big."""
+    if THRESHOLD_BYTES <= 0 or not isinstance(result, dict):
+        return result
+    rows = result.get("data")
+    if not isinstance(rows, list) or len(rows) < 2 or len(codec.dumps(rows)) <= THRESHOLD_BYTES:
+        return result
+    chunks, counts = _chunks(rows, THRESHOLD_BYTES)
+    if len(chunks) < 2:
+        return result
+    cursor = store.put(_owner(), chunks[1:], counts[1:])
+    if cursor is None:
+        return result
+    return {
+        **result,
+        "data": rows[: counts[0]],
+        "nextCursor": cursor,
+        "remainingRecords": len(rows) - counts[0],
+    }
+
+
+def fetch_more(cursor: str) -> Dict[str, Any]:
+    """The chunk of rows at ``cursor``, with the cursor of the next chunk."""
+    chunk, next_cursor, remaining = store.take(_owner(), cursor)
+    return {"data": codec.loads(chunk), "nextCursor": next_cursor, "remainingRecords": remaining}
+
+
+def stats() -> Dict[str, Any]:
+    return {"threshold_bytes": THRESHOLD_BYTES, "ttl": TTL, **store.stats()}
+
+
+# ---- Tool ----
+
+class FetchMoreInput(BaseModel):
+    cursor: str = Field(..., description="The nextCursor value from a previous result")
+
+
+def create_tool_specs() -> List[tools_base.ToolSpec]:
+    def func(cursor: str) -> Dict[str, Any]:
+        return fetch_more(cursor)
+
+    async def coroutine(cursor: str) -> Dict[str, Any]:
+        return fetch_more(cursor)
+
+    return [
+        tools_base.ToolSpec(
+            "fetch_more",
+            "Get the next rows of a result that was cut short; pass its nextCursor.",
+            FetchMoreInput,
+            func,
+            coroutine,
+        )
+    ]
@@ -1,8 +1,20 @@
 # src/xmcp/main.py
+import inspect
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import fastapi.routing
 from fastapi import FastAPI, Request
+import xmcp.codec as codec
 import xmcp.mcp_runtime as mcp_runtime
+import xmcp.upstream as upstream
+import xmcp.cache as cache
+import xmcp.tools.base as tools_base
 import xmcp.auth_context as auth_context
 import xmcp.compat_rest as compat_rest
+import xmcp.admin as admin
+import xmcp.admission as admission
+import xmcp.metrics as metrics
+import xmcp.ratelimit as ratelimit
 import xmcp.tools.leaves.router as leaves_router_module
 import xmcp.tools.attendance.router as attendance_router_module
 import xmcp.tools.feedback.router as feedback_router_module
@@ -14,6 +26,7 @@ import xmcp.tools.referrals.router as referrals_router_module
 build_xmcp = mcp_runtime.build_xmcp
 set_request_headers = auth_context.set_request_headers
 compat_router = compat_rest.router
+admin_router = admin.router
 leaves_router = leaves_router_module.router
 leaves_client = leaves_router_module.client
 attendance_router = attendance_router_module.router
@@ -29,7 +42,33 @@ misc_client = misc_router_module.client
 referrals_router = referrals_router_module.router
 referrals_client = referrals_router_module.client
 
-app = FastAPI(title="XAgent HR MCP Host")
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    tools_base.check_internal_token(tools_base.default_dispatch())
+    # Shared pooled HRMS client lives for the whole app lifetime
+    await upstream.startup()
+    async with AsyncExitStack() as stack:
+        stack.push_async_callback(upstream.aclose)
+        stack.push_async_callback(cache.aclose)
+        # Shared clients the registry's tools use to call back into the routers
+        stack.push_async_callback(tools_base.close_clients)
+        # Mounted sub-apps don't get their own lifespan; run the MCP session manager here
+        if mounted == "streamable_http_app":
+            await stack.enter_async_context(mcp.session_manager.run())
+        yield
+
+
+def _app_options() -> dict:
+    # Newer FastAPI serializes response models to JSON bytes in pydantic-core,
+    # but only while the default response class is left alone; older releases
+    # json.dumps a dict, where the codec (orjson when installed) is faster.
+    if "dump_json" in inspect.signature(fastapi.routing.serialize_response).parameters:
+        return {}
+    return {"default_response_class": codec.JSONResponse}
+
+
+app = FastAPI(title="XAgent HR MCP Host", lifespan=_lifespan, **_app_options())
 
 # Put headers into a contextvar so tools (or compat) can read them
 @app.middleware("http")
@@ -39,15 +78,23 @@ async def _stash_headers(request: Request, call_next):
         set_request_headers(dict(request.headers))
     return await call_next(request)
 
+# Adaptive admission control, inside the rate limiter so time queued behind
+# a principal's own calls is neither a slot held nor a latency sample
+app.add_middleware(admission.AdmissionMiddleware)
+# Per-principal rate limits and fair queuing
+app.add_middleware(ratelimit.RateLimitMiddleware)
+# Request latency histograms (outermost, so shed and throttled requests are counted too)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Mount MCP server (streamable HTTP → HTTP → SSE)
 mcp = build_xmcp()
-mounted = False
+mounted = None
 for method in ("streamable_http_app", "http_app", "sse_app"):
     mount = getattr(mcp, method, None)
     if callable(mount):
         app.mount("/mcp", mount())
         print(f"[mcp] Mounted {method} at /mcp")
-        mounted = True
+        mounted = method
         break
 if not mounted:
     raise RuntimeError("FastMCP has no HTTP/SSE mount; upgrade `mcp` package.")
@@ -67,3 +114,8 @@ client = leaves_client
 
 # Optional REST shim for Postman/curl sanity checks
 app.include_router(compat_router)
+
+# Runtime counters (request coalescing, ...)
+app.include_router(admin_router)
+# Prometheus metrics
+app.include_router(admin.metrics_router)
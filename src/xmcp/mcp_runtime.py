@@ -2,13 +2,23 @@ from __future__ import annotations
 import os
 from typing import Any, Dict
 from mcp.server.fastmcp import FastMCP
+import xmcp.columnar as columnar
+import xmcp.cursors as cursors
+import xmcp.metrics as metrics
 import xmcp.tool_registry as tool_registry
 import xmcp.auth_context as auth_context
+import xmcp.tools.base as tools_base
 
 all_tool_specs = tool_registry.all_tool_specs
 auth_header_getter = auth_context.auth_header_getter
 
-def build_xmcp() -> FastMCP:
+def build_xmcp(dispatch: str | None = None) -> FastMCP:
+    """Build the FastMCP server exposing every ToolSpec.
+
+    ``dispatch`` selects how tools reach the domain logic (see
+    ``xmcp.tools.base.DISPATCH_MODES``).  By default the process-wide tool
+    registry is used, whose dispatch comes from ``XMCP_TOOL_DISPATCH``.
+    """
     mcp = FastMCP("XAgent HR MCP", stateless_http=True)
 
     # Tiny health tool
@@ -16,21 +26,41 @@ def build_xmcp() -> FastMCP:
     def ping() -> str:
         return "pong"
 
-    # Where your tools should call (usually your own FastAPI, not HRMS directly)
-    base_url = ("http://localhost:8000").rstrip("/")
-
-    specs = list(all_tool_specs(base_url, auth_header_getter))
-    print(f"[mcp] Registering {len(specs)} ToolSpecs…")
+    if dispatch is None:
+        specs = list(tool_registry.get_registry())
+        dispatch = tools_base.default_dispatch()
+    else:
+        # Where your tools should call (usually your own FastAPI, not HRMS directly)
+        base_url = tool_registry.LOCAL_BASE_URL
+        specs = list(all_tool_specs(base_url, auth_header_getter, dispatch=dispatch))
+    print(f"[mcp] Registering {len(specs)} ToolSpecs ({dispatch} dispatch)…")
 
     for spec in specs:
         def _register(s):
-            @mcp.tool(name=s.name, description=s.description or s.name)
-            def tool(params: Dict[str, Any] | None = None) -> Any:
+            def _kwargs(params: Dict[str, Any] | None) -> Dict[str, Any]:
                 params = params or {}
                 if getattr(s, "args_schema", None):
-                    model = s.args_schema(**params)  # validate/coerce
-                    return s.func(**model.model_dump())
-                return s.func(**params)
+                    return s.args_schema(**params).model_dump()  # validate/coerce
+                return params
+
+            # Oversized results are cut to a first chunk plus cursor (see xmcp.cursors);
+            # format="columnar" sends list results as a table (see xmcp.columnar);
+            # calls are timed for /metrics
+            if getattr(s, "coroutine", None) is not None:
+                # Async tools run on the server's event loop, so concurrent calls overlap
+                @mcp.tool(name=s.name, description=s.description or s.name)
+                async def tool(
+                    params: Dict[str, Any] | None = None, format: columnar.Format | None = None
+                ) -> Any:
+                    with metrics.tool_call(s.name):
+                        return columnar.apply(cursors.limit(await s.coroutine(**_kwargs(params))), format)
+            else:
+                @mcp.tool(name=s.name, description=s.description or s.name)
+                def tool(
+                    params: Dict[str, Any] | None = None, format: columnar.Format | None = None
+                ) -> Any:
+                    with metrics.tool_call(s.name):
+                        return columnar.apply(cursors.limit(s.func(**_kwargs(params))), format)
         _register(spec)
 
     return mcp
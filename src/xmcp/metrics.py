@@ -0,0 +1,285 @@
+"""Prometheus metrics for the server and its HRMS calls.
+
+``GET /metrics`` (see :mod:`xmcp.admin`) serves, in the Prometheus text
+format:
+
+- ``xmcp_http_request_duration_seconds{route,method,status}`` – every HTTP
+  request, by route template (``/mcp`` for the MCP transport; ``unrouted``
+  for requests answered before routing, e.g. shed with ``503``);
+- ``xmcp_tool_call_duration_seconds{tool,outcome}`` – every MCP and
+  ``/mcp-compat`` tool call, ``outcome`` being ``ok`` or ``error``;
+- ``xmcp_upstream_request_duration_seconds{family,path,status}`` – every
+  request sent to HRMS until its response head arrives.  Retries and hedges
+  count once each; ``status`` is the HTTP status, ``error`` or ``cancelled``;
+- in-flight gauges for HTTP requests and tool calls, plus the counters of
+  ``GET /admin/stats`` (pool, caches, breakers, retries, rate limits,
+  admission control).
+
+Label values come from route templates, registered tool names and HRMS
+paths with id-like segments replaced by ``:id``.  On top of that every
+metric keeps at most ``XMCP_METRICS_MAX_SERIES`` label sets; later ones
+are folded into a single series whose labels are all ``other``.
+
+- ``XMCP_METRICS_BUCKETS`` – comma-separated histogram bounds in seconds
+  (default ``0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30``).
+- ``XMCP_METRICS_MAX_SERIES`` – label sets kept per metric (default ``500``).
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import httpx
+
+import xmcp.breaker as breaker
+
+Labels = Tuple[str, ...]
+
+BUCKETS = tuple(
+    float(bound)
+    for bound in os.getenv(
+        "XMCP_METRICS_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30"
+    ).split(",")
+    if bound.strip()
+)
+MAX_SERIES = int(os.getenv("XMCP_METRICS_MAX_SERIES", "500"))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+OTHER = "other"
+
+# Path segments that identify a record rather than an endpoint
+_ID_SEGMENT = re.compile(r"^(\d+|[0-9a-fA-F-]{16,}|.*@.*)$")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _sample(name: str, names: Sequence[str], values: Sequence[str], value: float) -> str:
+    if not names:
+        return f"{name} {_number(value)}"
+    labels = ",".join(f'{label}="{_escape(text)}"' for label, text in zip(names, values))
+    return f"{name}{{{labels}}} {_number(value)}"
+
+
+def _header(name: str, kind: str, help: str) -> List[str]:
+    return [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+
+
+class _Metric:
+    """Series keyed by label values, capped at ``max_series``."""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), max_series: int = MAX_SERIES) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.max_series = max_series
+        self._series: Dict[Labels, Any] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, values: Labels) -> Labels:
+        # Called with the lock held
+        if values in self._series or len(self._series) < self.max_series:
+            return values
+        return (OTHER,) * len(self.labels)
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Gauge(_Metric):
+    """A value per label set that goes up and down (e.g. calls in flight)."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), max_series: int = MAX_SERIES) -> None:
+        super().__init__(name, help, labels, max_series)
+        if not self.labels:
+            self._series[()] = 0
+
+    def inc(self, *values: str, amount: float = 1) -> None:
+        with self._lock:
+            key = self._key(values)
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, *values: str) -> None:
+        self.inc(*values, amount=-1)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted(self._series.items())
+        return _header(self.name, self.kind, self.help) + [
+            _sample(self.name, self.labels, values, value) for values, value in series
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count of observations per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = BUCKETS,
+        max_series: int = MAX_SERIES,
+    ) -> None:
+        super().__init__(name, help, labels, max_series)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, seconds: float, *values: str) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            key = self._key(values)
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket counts (the last is +Inf), then the sum
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((values, list(counts)) for values, counts in self._series.items())
+        lines = _header(self.name, self.kind, self.help)
+        names = self.labels + ("le",)
+        for values, counts in series:
+            total = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                total += count
+                lines.append(_sample(f"{self.name}_bucket", names, values + (_number(bound),), total))
+            lines.append(_sample(f"{self.name}_sum", self.labels, values, counts[-1]))
+            lines.append(_sample(f"{self.name}_count", self.labels, values, total))
+        return lines
+
+
+_registry: List[_Metric] = []
+
+requests = Histogram(
+    "xmcp_http_request_duration_seconds",
+    "HTTP requests served, by route template, method and status.",
+    ("route", "method", "status"),
+)
+requests_in_flight = Gauge("xmcp_http_requests_in_flight", "HTTP requests being served.")
+tool_calls = Histogram(
+    "xmcp_tool_call_duration_seconds",
+    "MCP and /mcp-compat tool calls, by tool and outcome.",
+    ("tool", "outcome"),
+)
+tool_calls_in_flight = Gauge("xmcp_tool_calls_in_flight", "Tool calls running, by tool.", ("tool",))
+upstream_requests = Histogram(
+    "xmcp_upstream_request_duration_seconds",
+    "Requests sent to HRMS until the response head, by path family, path and status.",
+    ("family", "path", "status"),
+)
+
+
+def snapshot(
+    name: str, kind: str, help: str, samples: Iterable[Tuple[Dict[str, str], float]]
+) -> List[str]:
+    """Exposition lines for values read from elsewhere at scrape time."""
+    lines = _header(name, kind, help)
+    for labels, value in samples:
+        lines.append(_sample(name, tuple(labels), tuple(labels.values()), value))
+    return lines
+
+
+def render(extra: Iterable[List[str]] = ()) -> str:
+    """The registered metrics and ``extra`` snapshot lines in the Prometheus text format."""
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    for family in extra:
+        lines.extend(family)
+    return "\n".join(lines) + "\n"
+
+
+def upstream_path(path: str) -> str:
+    """``path`` with id-like segments replaced, e.g. ``/app/employees/42`` -> ``/app/employees/:id``."""
+    return "/".join(":id" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+
+@contextmanager
+def tool_call(tool: str) -> Iterator[None]:
+    """Time one tool call; an exception leaving the block counts as an error."""
+    tool_calls_in_flight.inc(tool)
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        tool_calls_in_flight.dec(tool)
+        tool_calls.observe(time.perf_counter() - started, tool, outcome)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request by its route template."""
+
+    def __init__(self, app: Callable[..., Awaitable[None]]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = "error"
+
+        async def send_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            requests_in_flight.dec()
+            # The router stores the matched route in the shared scope
+            route = getattr(scope.get("route"), "path", None) or "unrouted"
+            requests.observe(time.perf_counter() - started, route, scope.get("method", ""), status)
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """Transport timing each request sent to HRMS (see :data:`upstream_requests`)."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        status = "cancelled"
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+            status = str(response.status_code)
+            return response
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            upstream_requests.observe(
+                time.perf_counter() - started, breaker.family(path), upstream_path(path), status
+            )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -0,0 +1,117 @@
+"""Read every page of a paginated HRMS list.
+
+HRMS list endpoints return ``{"data": [...], "paginate": {"totalPage": ...}}``.
+:class:`PageStream` fetches page 1, reads ``totalPage`` and fetches the rest
+concurrently in bounded windows, yielding rows in page order as each window
+arrives; only one window of page bodies is held at a time.  A record limit
+stops the fetch early.
+
+- ``XMCP_PAGE_WINDOW`` – pages fetched concurrently per window (default ``4``).
+- ``XMCP_MAX_RECORDS`` – upper bound for a single all-pages read (default ``1000``).
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+import xmcp.upstream as upstream
+
+PAGE_WINDOW = int(os.getenv("XMCP_PAGE_WINDOW", "4"))
+MAX_RECORDS = int(os.getenv("XMCP_MAX_RECORDS", "1000"))
+
+
+def _body(page: Any) -> Dict[str, Any]:
+    if isinstance(page, BaseModel):
+        return page.model_dump(mode="json", by_alias=True)
+    return page or {}
+
+
+class PageStream:
+    """Async iterator over the rows of every page returned by ``fetch_page(page)``.
+
+    After iteration, ``total_pages``, ``pages_fetched`` and ``truncated``
+    describe what was read, and :meth:`paginate` summarises it in the HRMS
+    ``paginate`` shape (``nextPage`` is set when pages were left unread).
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[int], Awaitable[Any]],
+        max_records: Optional[int] = None,
+        window: int = PAGE_WINDOW,
+    ) -> None:
+        self.fetch_page = fetch_page
+        self.max_records = min(max_records or MAX_RECORDS, MAX_RECORDS)
+        self.window = max(1, window)
+        self.status_code = 200
+        self.status_message = "OK"
+        self.total_pages = 0
+        self.total_records: Optional[int] = None
+        self.per_page = 0
+        self.pages_fetched = 0
+        self.records = 0
+        self.truncated = False
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        first = _body(await self.fetch_page(1))
+        paginate = first.get("paginate") or {}
+        self.status_code = first.get("statusCode", 200)
+        self.status_message = first.get("statusMessage", "OK")
+        self.total_pages = int(paginate.get("totalPage") or 1)
+        self.total_records = paginate.get("totalRecords")
+        rows: List[Any] = first.get("data") or []
+        self.per_page = int(paginate.get("totalPerpage") or len(rows) or 1)
+        self.pages_fetched = 1
+        del first
+
+        next_page = 2
+        while True:
+            for row in rows:
+                if self.records >= self.max_records:
+                    self.truncated = True
+                    return
+                self.records += 1
+                yield row
+            if next_page > self.total_pages:
+                return
+            # Only fetch as many pages as the remaining record budget can use
+            wanted = math.ceil((self.max_records - self.records) / self.per_page)
+            if wanted <= 0:
+                self.truncated = True
+                return
+            last = min(self.total_pages, next_page + min(self.window, wanted) - 1)
+            bodies = await upstream.gather_limited(
+                (self.fetch_page(page) for page in range(next_page, last + 1)), self.window
+            )
+            rows = [row for body in bodies for row in (_body(body).get("data") or [])]
+            del bodies
+            self.pages_fetched += last - next_page + 1
+            next_page = last + 1
+
+    def meta(self) -> Dict[str, Any]:
+        """The response fields other than the rows."""
+        return {
+            "statusCode": self.status_code,
+            "statusMessage": self.status_message,
+            "paginate": self.paginate(),
+        }
+
+    def paginate(self) -> Dict[str, Any]:
+        return {
+            "totalRecords": self.total_records if self.total_records is not None else self.records,
+            "totalPerpage": self.per_page,
+            "totalPage": self.total_pages,
+            "currentPage": self.pages_fetched,
+            "nextPage": self.pages_fetched + 1 if self.pages_fetched < self.total_pages else None,
+            "previousPage": None,
+        }
+
+
+async def collect(stream: PageStream) -> Dict[str, Any]:
+    """Drain ``stream`` into one HRMS-shaped response with the merged rows."""
+    data = [row async for row in stream]
+    return {"data": data, **stream.meta()}
@@ -0,0 +1,95 @@
+"""Forward HRMS response bodies without re-validating them.
+
+A typed route normally parses the HRMS body into its pydantic model and
+FastAPI then validates and serializes that model again for the response.
+Routes listed in ``XMCP_PASSTHROUGH`` skip both passes and return the HRMS
+bytes unchanged; a sample of those bodies is still validated against the
+route's model so schema drift shows up in the logs and ``/admin/stats``.
+
+- ``XMCP_PASSTHROUGH`` – comma-separated route names (e.g.
+  ``leaves.holidays,team.ledger``) or ``*`` for every route that supports it.
+- ``XMCP_PASSTHROUGH_SAMPLE_RATE`` – fraction of passthrough bodies validated
+  (default ``0.01``; ``0`` disables, ``1`` validates every body).
+
+Passthrough bodies are forwarded as HRMS sent them, under the ``Content-Type``
+it sent (``application/json`` when it sent none), so fields the typed path
+adds (such as ``dataAgeSeconds``) are absent; the ``Age`` header still is set.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+from typing import Any, Dict, Mapping, Optional, Type
+
+from fastapi import Response
+from pydantic import BaseModel, ValidationError
+
+import xmcp.cache as cache
+
+logger = logging.getLogger(__name__)
+
+# Used when HRMS sent no Content-Type
+MEDIA_TYPE = "application/json"
+
+# Route names accepted in XMCP_PASSTHROUGH
+ROUTES = (
+    "attendance.my_attendance",
+    "feedback.levels",
+    "feedback.rm_feedbacks",
+    "leaves.holidays",
+    "leaves.my_leaves",
+    "misc.financial_years",
+    "misc.profile",
+    "team.ledger",
+    "tickets.list",
+)
+
+_configured = {name.strip() for name in os.getenv("XMCP_PASSTHROUGH", "").split(",") if name.strip()}
+PASSTHROUGH = frozenset(ROUTES) if "*" in _configured else frozenset(_configured)
+for _unknown in sorted(PASSTHROUGH - set(ROUTES)):
+    logger.warning("XMCP_PASSTHROUGH names unknown route %r", _unknown)
+SAMPLE_RATE = float(os.getenv("XMCP_PASSTHROUGH_SAMPLE_RATE", "0.01"))
+
+forwarded = 0
+sampled = 0
+drift: Dict[str, int] = {}
+
+
+def enabled(route: str) -> bool:
+    return route in PASSTHROUGH
+
+
+def respond(
+    route: str,
+    cached: cache.Cached,
+    model: Type[BaseModel],
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """Return the HRMS body and content type as-is, validating the body against ``model`` at the sample rate."""
+    global forwarded, sampled
+    forwarded += 1
+    if SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE:
+        sampled += 1
+        try:
+            model.model_validate_json(cached.body)
+        except ValidationError as exc:
+            drift[route] = drift.get(route, 0) + 1
+            logger.warning(
+                "HRMS body for %s no longer matches %s: %s",
+                route, model.__name__, exc.errors(include_url=False)[:3],
+            )
+    return Response(
+        content=cached.body, media_type=cached.content_type or MEDIA_TYPE, headers=dict(headers or {})
+    )
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "routes": sorted(PASSTHROUGH),
+        "sample_rate": SAMPLE_RATE,
+        "forwarded": forwarded,
+        "sampled": sampled,
+        "drift": dict(drift),
+    }
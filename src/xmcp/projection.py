@@ -0,0 +1,75 @@
+"""Trim list rows to the fields a caller asked for.
+
+List tools and routes take an optional ``fields`` selection (a list, or a
+comma-separated string on the REST routes) naming the row keys to return,
+e.g. ``leaveDate,leaveCount,status``; the other keys of each ``data`` row
+are dropped before the response is serialized.  Unknown names are ignored.
+
+Selectors are compiled once per field set and cached, so repeated calls
+with the same selection only pay for the dict build per row.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import (
+    Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Mapping, Optional, Sequence, Tuple, Union,
+)
+
+Fields = Tuple[str, ...]
+# Distinct field sets kept compiled
+MAX_SELECTORS = 256
+
+
+def parse(fields: Union[str, Sequence[str], None]) -> Optional[Fields]:
+    """Normalise a ``fields`` argument; ``None`` means every field."""
+    if fields is None:
+        return None
+    names = fields.split(",") if isinstance(fields, str) else fields
+    # Order-preserving dedupe, so equal selections share one selector
+    parsed = tuple(dict.fromkeys(name.strip() for name in names if name and name.strip()))
+    return parsed or None
+
+
+@lru_cache(maxsize=MAX_SELECTORS)
+def selector(fields: Fields) -> Callable[[Mapping[str, Any]], Dict[str, Any]]:
+    """A function returning the ``fields`` of a row mapping, in that order."""
+    if len(fields) == 1:
+        (only,) = fields
+        return lambda row: {only: row[only]} if only in row else {}
+
+    def select(row: Mapping[str, Any]) -> Dict[str, Any]:
+        return {key: row[key] for key in fields if key in row}
+
+    return select
+
+
+def selector_cache_stats() -> Dict[str, int]:
+    """Hits, misses and size of the compiled :func:`selector` cache."""
+    info = selector.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+def rows(items: Iterable[Mapping[str, Any]], fields: Optional[Fields]) -> Iterator[Any]:
+    """Yield each of ``items`` projected to ``fields`` (unchanged when ``None``)."""
+    if not fields:
+        yield from items
+        return
+    select = selector(fields)
+    for item in items:
+        yield select(item) if isinstance(item, Mapping) else item
+
+
+async def stream(items: AsyncIterator[Any], fields: Optional[Fields]) -> AsyncIterator[Any]:
+    """Async counterpart of :func:`rows`, for paged and streamed reads."""
+    select = selector(fields) if fields else None
+    async for item in items:
+        yield select(item) if select and isinstance(item, Mapping) else item
+
+
+def project(body: Dict[str, Any], fields: Optional[Fields]) -> Dict[str, Any]:
+    """``body`` with its ``data`` rows projected to ``fields``."""
+    data = body.get("data")
+    if not fields or not isinstance(data, list):
+        return body
+    return {**body, "data": list(rows(data, fields))}
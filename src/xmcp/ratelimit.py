@@ -0,0 +1,354 @@
+"""Per-principal rate limiting and fair queuing of incoming calls.
+
+Every request except ``/health``, ``/admin`` and ``/metrics`` is charged to its principal
+(the caller's bearer token, see :func:`xmcp.auth_context.principal_key`):
+
+- **Rate limits** – token buckets per principal: one for all its requests
+  (``XMCP_RATE_LIMIT`` per second, bursts of ``XMCP_RATE_BURST``) and one per
+  MCP tool it calls, where ``XMCP_RATE_LIMIT_<TOOL>`` is set.  A request over
+  a limit is answered at once with ``429`` and a ``Retry-After`` header.
+- **Fair queuing** – at most ``XMCP_FAIR_QUEUE_CONCURRENCY`` admitted
+  requests run at once.  The others wait in per-principal queues that are
+  served in start-time fair order, so a principal flooding the server
+  only delays its own calls.  A call's weight is its tool cost
+  (``XMCP_TOOL_COST_<TOOL>``, default ``1``; the sum for batches).  A
+  principal with ``XMCP_FAIR_QUEUE_DEPTH`` calls already waiting gets ``429``.
+
+Tool names come from the JSON body of ``/mcp`` (``tools/call``) and
+``/mcp-compat`` requests.  The routers' own loopback calls made by tools
+carry :data:`xmcp.tools.base.INTERNAL_HEADER` with ``XMCP_INTERNAL_TOKEN``
+and are not charged again.  Without that variable each process makes up
+its own token, which only works for a single worker: a loopback call
+landing on another worker would be charged twice and queued behind the
+call that made it.  The app therefore refuses to start with loopback
+dispatch, ``WEB_CONCURRENCY`` above ``1`` and no ``XMCP_INTERNAL_TOKEN``.
+
+- ``XMCP_RATE_LIMIT`` – requests per second per principal (default ``20``, ``0`` disables).
+- ``XMCP_RATE_BURST`` – bucket size (default twice the rate).
+- ``XMCP_RATE_LIMIT_<TOOL>`` / ``XMCP_RATE_BURST_<TOOL>`` – per-tool limits, e.g.
+  ``XMCP_RATE_LIMIT_GET_ATTENDANCE=2``.
+- ``XMCP_FAIR_QUEUE_CONCURRENCY`` – requests run at once (default ``32``, ``0`` disables queuing).
+- ``XMCP_FAIR_QUEUE_DEPTH`` – waiting requests per principal (default ``8``).
+- ``XMCP_TOOL_COST_<TOOL>`` – queue weight of a tool call (default ``1``).
+- ``XMCP_INTERNAL_TOKEN`` – secret marking loopback calls, shared by all workers
+  (default: random per process).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+
+import xmcp.auth_context as auth_context
+import xmcp.codec as codec
+import xmcp.tools.base as tools_base
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+
+def _env_number(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _tool_env(prefix: str, tool: str) -> Optional[str]:
+    return os.getenv(prefix + tool.upper().replace("-", "_"))
+
+
+RATE = _env_number("XMCP_RATE_LIMIT", 20.0)
+BURST = _env_number("XMCP_RATE_BURST", 2 * RATE)
+CONCURRENCY = int(_env_number("XMCP_FAIR_QUEUE_CONCURRENCY", 32))
+QUEUE_DEPTH = int(_env_number("XMCP_FAIR_QUEUE_DEPTH", 8))
+
+EXEMPT_PREFIXES = ("/health", "/admin", "/metrics")
+# Bodies larger than this are not inspected for tool names
+_MAX_INSPECTED_BODY = 1024 * 1024
+_MAX_BUCKETS = 10_000
+
+
+class TokenBuckets:
+    """Token buckets keyed by (principal, tool); ``tool`` ``None`` is the overall limit."""
+
+    def __init__(self, rate: float, burst: float, max_buckets: int = _MAX_BUCKETS) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_buckets = max_buckets
+        # Least recently used first; a dropped bucket comes back full
+        self._buckets: "OrderedDict[Tuple[str, Optional[str]], List[float]]" = OrderedDict()
+        self._limits: Dict[str, Optional[Tuple[float, float]]] = {}
+        self.throttled = 0
+
+    def _limit(self, tool: Optional[str]) -> Optional[Tuple[float, float]]:
+        if tool is None:
+            return (self.rate, self.burst) if self.rate > 0 else None
+        if tool not in self._limits:
+            rate = _tool_env("XMCP_RATE_LIMIT_", tool)
+            if rate:
+                burst = _tool_env("XMCP_RATE_BURST_", tool)
+                self._limits[tool] = (float(rate), float(burst) if burst else max(1.0, 2 * float(rate)))
+            else:
+                self._limits[tool] = None
+        return self._limits[tool]
+
+    def take(self, principal: str, tools: List[str]) -> float:
+        """Charge one call per tool (one request without tools); seconds to wait if refused."""
+        now = time.monotonic()
+        charges: Dict[Optional[str], int] = {None: max(1, len(tools))}
+        for tool in tools:
+            charges[tool] = charges.get(tool, 0) + 1
+        wait = 0.0
+        staged = []
+        for tool, count in charges.items():
+            limit = self._limit(tool)
+            if limit is None:
+                continue
+            rate, burst = limit
+            key = (principal, tool)
+            bucket = self._buckets.get(key)
+            tokens = burst if bucket is None else min(burst, bucket[0] + (now - bucket[1]) * rate)
+            if tokens < count:
+                wait = max(wait, (count - tokens) / rate)
+            staged.append((key, tokens - count))
+        if wait > 0:
+            self.throttled += 1
+            return wait
+        for key, tokens in staged:
+            self._buckets[key] = [tokens, now]
+            self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_buckets:
+            self._buckets.popitem(last=False)
+        return 0.0
+
+
+class QueueFull(Exception):
+    """The principal already has the maximum number of calls waiting."""
+
+
+class FairQueue:
+    """Concurrency slots handed out in start-time fair order across principals.
+
+    Each principal's calls get virtual start tags that advance by the call's
+    cost; a free slot goes to the waiting call with the lowest tag, so every
+    backlogged principal gets an equal share of slots whatever its volume.
+    Used from the server's event loop only.
+    """
+
+    def __init__(self, concurrency: int, depth: int) -> None:
+        self.concurrency = concurrency
+        self.depth = depth
+        self.running = 0
+        self._virtual = 0.0
+        self._finish: Dict[str, float] = {}
+        self._waiting: List[Tuple[float, int, str, asyncio.Future]] = []
+        self._depths: Dict[str, int] = {}
+        self._order = itertools.count()
+        self.queued = 0
+        self.rejected = 0
+
+    async def acquire(self, principal: str, cost: float) -> None:
+        if self.concurrency <= 0:
+            return
+        if self.running < self.concurrency and not self._waiting:
+            self.running += 1
+            self._finish[principal] = max(self._virtual, self._finish.get(principal, 0.0)) + cost
+            return
+        if self._depths.get(principal, 0) >= self.depth:
+            self.rejected += 1
+            raise QueueFull(principal)
+        start = max(self._virtual, self._finish.get(principal, 0.0))
+        self._finish[principal] = start + cost
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (start, next(self._order), principal, waiter))
+        self._depths[principal] = self._depths.get(principal, 0) + 1
+        self.queued += 1
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as the caller went away
+                self.release()
+            else:
+                waiter.cancel()
+            raise
+
+    def release(self) -> None:
+        if self.concurrency <= 0:
+            return
+        self.running -= 1
+        while self._waiting and self.running < self.concurrency:
+            start, _, principal, waiter = heapq.heappop(self._waiting)
+            self._depths[principal] -= 1
+            if not self._depths[principal]:
+                del self._depths[principal]
+            if waiter.cancelled():
+                continue
+            self._virtual = start
+            self.running += 1
+            waiter.set_result(None)
+        if not self._waiting and not self.running:
+            # Idle: forget the tags so they don't grow forever
+            self._finish.clear()
+            self._virtual = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "waiting": len(self._waiting),
+            "queued": self.queued,
+            "rejected": self.rejected,
+        }
+
+
+buckets = TokenBuckets(RATE, BURST)
+queue = FairQueue(CONCURRENCY, QUEUE_DEPTH)
+_costs: Dict[str, float] = {}
+
+
+def tool_cost(tool: str) -> float:
+    if tool not in _costs:
+        _costs[tool] = float(_tool_env("XMCP_TOOL_COST_", tool) or 1)
+    return _costs[tool]
+
+
+def tool_calls(path: str, body: bytes) -> List[Tuple[str, Dict[str, Any]]]:
+    """The (tool, arguments) pairs an ``/mcp`` or ``/mcp-compat`` request body calls."""
+    try:
+        payload = codec.loads(body)
+    except ValueError:
+        return []
+    if path.startswith("/mcp-compat"):
+        items = payload.get("items") if isinstance(payload, dict) and "items" in payload else [payload]
+        calls = [
+            (item.get("name") or item.get("tool"), item.get("arguments") or item.get("args"))
+            for item in items or []
+            if isinstance(item, dict)
+        ]
+    else:
+        messages = payload if isinstance(payload, list) else [payload]
+        calls = [
+            (message["params"].get("name"), message["params"].get("arguments"))
+            for message in messages
+            if isinstance(message, dict)
+            and message.get("method") == "tools/call"
+            and isinstance(message.get("params"), dict)
+        ]
+    return [
+        (str(name), arguments if isinstance(arguments, dict) else {})
+        for name, arguments in calls
+        if name
+    ]
+
+
+async def _buffered(receive: Receive) -> Tuple[Optional[bytes], Receive]:
+    # Read the whole body, then replay it to the app; None if the client left
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            return None, receive
+        chunks.append(message.get("body", b""))
+        size += len(chunks[-1])
+        if not message.get("more_body"):
+            break
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if replayed:
+            return await receive()
+        replayed = True
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return (body if size <= _MAX_INSPECTED_BODY else None), replay
+
+
+async def read_calls(scope: Scope, receive: Receive) -> Tuple[List[Tuple[str, Dict[str, Any]]], Receive]:
+    """The tool calls of an MCP request and a ``receive`` replaying its body.
+
+    The result is kept in the scope, so the middlewares share one read.
+    """
+    if "xmcp.tool_calls" in scope:
+        return scope["xmcp.tool_calls"], receive
+    calls: List[Tuple[str, Dict[str, Any]]] = []
+    path = scope.get("path", "")
+    if scope.get("method") == "POST" and path.startswith("/mcp"):
+        body, receive = await _buffered(receive)
+        if body:
+            calls = tool_calls(path, body)
+    scope["xmcp.tool_calls"] = calls
+    return calls, receive
+
+
+def is_internal(scope: Scope) -> bool:
+    """Whether the request is a tool's loopback call into the routers."""
+    internal = Headers(scope=scope).get(tools_base.INTERNAL_HEADER)
+    return bool(internal) and secrets.compare_digest(internal, tools_base.INTERNAL_TOKEN)
+
+
+def _too_many(detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=429,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying :data:`buckets` and :data:`queue` per principal.
+
+    Pure ASGI rather than ``@app.middleware`` so a queue slot is held until
+    a streamed ``/mcp`` response has been sent in full.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope.get("path", "").startswith(EXEMPT_PREFIXES)
+            or is_internal(scope)
+        ):
+            return await self.app(scope, receive, send)
+        headers = Headers(scope=scope)
+        principal = auth_context.principal_key(
+            headers.get("authorization") or headers.get("x-authorization")
+        )
+        calls, receive = await read_calls(scope, receive)
+        tools = [tool for tool, _ in calls]
+        wait = buckets.take(principal, tools)
+        if wait:
+            return await _too_many("Rate limit exceeded", wait)(scope, receive, send)
+        try:
+            await queue.acquire(principal, sum(tool_cost(tool) for tool in tools) or 1)
+        except QueueFull:
+            return await _too_many("Too many queued requests for this caller", 1)(scope, receive, send)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            queue.release()
+
+
+def stats() -> Dict[str, Any]:
+    return {
+        "rate": buckets.rate,
+        "burst": buckets.burst,
+        "throttled": buckets.throttled,
+        "queue": queue.stats(),
+    }
@@ -0,0 +1,209 @@
+"""Retries and hedged requests for idempotent HRMS reads.
+
+:func:`call` wraps one idempotent request (the GETs sent by
+:func:`xmcp.upstream.get`; writes never go through it):
+
+- **Retries** – connect errors and ``5xx`` responses are retried with
+  full-jitter exponential backoff (a ``Retry-After`` header is honoured up
+  to the maximum delay), at most ``HRMS_RETRIES`` times per request.
+- **Hedging** – when a request has not answered within the p95 latency
+  recently seen for its path, a second identical request is sent and the
+  first good response wins; the other is cancelled.
+- **Budget** – retries and hedges draw from a shared budget that grows by
+  ``HRMS_RETRY_BUDGET_RATIO`` per request (plus a small floor per second),
+  so a failing HRMS sees at most that much extra load instead of a retry
+  storm.
+
+Configured through environment variables:
+
+- ``HRMS_RETRIES`` – retries per request after the first attempt (default ``2``, ``0`` disables).
+- ``HRMS_RETRY_BASE_DELAY`` / ``HRMS_RETRY_MAX_DELAY`` – backoff bounds in seconds
+  (defaults ``0.1`` / ``2``).
+- ``HRMS_RETRY_BUDGET_RATIO`` – extra requests allowed per request (default ``0.2``).
+- ``HRMS_RETRY_BUDGET_MIN`` – extra requests always allowed per second (default ``1``).
+- ``HRMS_HEDGE`` – send hedged reads (default on).
+- ``HRMS_HEDGE_MIN_DELAY`` – lower bound of the hedge delay in seconds (default ``0.05``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Deque, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+RETRIES = int(_env_float("HRMS_RETRIES", 2))
+BASE_DELAY = _env_float("HRMS_RETRY_BASE_DELAY", 0.1)
+MAX_DELAY = _env_float("HRMS_RETRY_MAX_DELAY", 2.0)
+BUDGET_RATIO = _env_float("HRMS_RETRY_BUDGET_RATIO", 0.2)
+BUDGET_MIN_PER_SECOND = _env_float("HRMS_RETRY_BUDGET_MIN", 1.0)
+HEDGE = os.getenv("HRMS_HEDGE", "true").strip().lower() in ("1", "true", "yes", "on")
+HEDGE_MIN_DELAY = _env_float("HRMS_HEDGE_MIN_DELAY", 0.05)
+
+# Failures that happen before HRMS saw the request, plus dropped connections
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+# Latency samples kept per path, and how many are needed before hedging
+_WINDOW = 200
+_MIN_SAMPLES = 20
+_MAX_PATHS = 256
+
+
+class RetryBudget:
+    """Token bucket shared by retries and hedges.
+
+    Every request deposits ``ratio`` tokens and time adds ``min_per_second``;
+    an extra request takes one token.  The balance is capped so a quiet
+    period cannot bank an unbounded burst.
+    """
+
+    def __init__(self, ratio: float, min_per_second: float, cap: float = 100.0) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.cap = cap
+        self._balance = cap / 10
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.exhausted = 0
+
+    def _refill(self, now: float) -> None:
+        self._balance = min(self.cap, self._balance + (now - self._updated) * self.min_per_second)
+        self._updated = now
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self._balance = min(self.cap, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._balance < 1:
+                self.exhausted += 1
+                return False
+            self._balance -= 1
+            return True
+
+
+class LatencyTracker:
+    """Recent successful response times per path, for the hedge delay."""
+
+    def __init__(self, window: int = _WINDOW, max_paths: int = _MAX_PATHS) -> None:
+        self.window = window
+        self.max_paths = max_paths
+        self._samples: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(self, path: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.get(path)
+            if samples is None:
+                samples = self._samples[path] = deque(maxlen=self.window)
+                if len(self._samples) > self.max_paths:
+                    self._samples.popitem(last=False)
+            else:
+                self._samples.move_to_end(path)
+            samples.append(seconds)
+
+    def p95(self, path: str) -> Optional[float]:
+        with self._lock:
+            samples = self._samples.get(path)
+            if samples is None or len(samples) < _MIN_SAMPLES:
+                return None
+            ordered = sorted(samples)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+
+budget = RetryBudget(BUDGET_RATIO, BUDGET_MIN_PER_SECOND)
+latency = LatencyTracker()
+_counters: Dict[str, int] = {"retries": 0, "hedges": 0, "hedge_wins": 0}
+
+
+def _retryable(response: httpx.Response) -> bool:
+    return response.status_code >= 500
+
+
+def _backoff(attempt: int, response: Optional[httpx.Response]) -> float:
+    delay = random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt))
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        delay = max(delay, min(MAX_DELAY, float(retry_after)))
+    return delay
+
+
+async def _hedged(send: Callable[[], Awaitable[httpx.Response]], path: str) -> httpx.Response:
+    # The first good response wins; a 5xx or error only counts once the other attempt is done too
+    delay = latency.p95(path) if HEDGE else None
+    first = asyncio.ensure_future(send())
+    if delay is None:
+        return await first
+    pending = {first}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=max(delay, HEDGE_MIN_DELAY))
+        if not done and budget.withdraw():
+            _counters["hedges"] += 1
+            pending.add(asyncio.ensure_future(send()))
+        fallback: Optional[httpx.Response] = None
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                elif _retryable(task.result()):
+                    fallback = task.result()
+                else:
+                    if task is not first:
+                        _counters["hedge_wins"] += 1
+                    return task.result()
+        if fallback is not None:
+            return fallback
+        assert error is not None
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def call(send: Callable[[], Awaitable[httpx.Response]], path: str) -> httpx.Response:
+    """Send the idempotent request ``send`` builds, with retries and hedging."""
+    budget.deposit()
+    attempt = 0
+    while True:
+        started = time.monotonic()
+        response: Optional[httpx.Response] = None
+        try:
+            response = await _hedged(send, path)
+        except RETRYABLE_ERRORS:
+            if attempt >= RETRIES or not budget.withdraw():
+                raise
+        else:
+            if not _retryable(response):
+                latency.record(path, time.monotonic() - started)
+                return response
+            if attempt >= RETRIES or not budget.withdraw():
+                return response
+        _counters["retries"] += 1
+        delay = _backoff(attempt, response)
+        logger.info("Retrying HRMS GET %s in %.2fs (attempt %d)", path, delay, attempt + 2)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def stats() -> Dict[str, int]:
+    """Counters for :func:`call`: retries and hedges sent, hedges that won, budget refusals."""
+    return {**_counters, "budget_exhausted": budget.exhausted}
@@ -0,0 +1,192 @@
+"""Compact row types for large HRMS list payloads.
+
+The pydantic models in each domain's ``models.py`` are the public schema,
+but building one per row dominates CPU on ledgers and attendance months
+with thousands of entries.  The row types here carry the same fields and
+are decoded straight from the response bytes: as ``msgspec`` structs when
+``msgspec`` is installed (``pip install xmcp-hrms[compact]``), otherwise as
+slotted dataclasses validated by pydantic-core.  Either way a field of the
+wrong type raises ``ValueError``.
+
+:func:`decode_page` splits an HRMS envelope into typed rows and the other
+fields; :func:`dump` turns a row back into the JSON shape HRMS (and the
+pydantic models, with ``by_alias=True``) use, and :func:`as_body` rebuilds
+the response body a pydantic model would serialize to (:func:`envelope`
+builds it without the rows, for streaming them).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing_extensions import Annotated, TypedDict
+
+import xmcp.codec as codec
+import xmcp.projection as projection
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+# HRMS keys that differ from the attribute names (mirrors the pydantic aliases)
+_RENAME = {"id": "Id"}
+
+
+def _row_type(name: str, fields: Sequence[Tuple[Any, ...]]) -> type:
+    """Build row type ``name`` from ``(attr, type[, default])`` field specs."""
+    if msgspec is not None:
+        row = msgspec.defstruct(name, fields, kw_only=True, rename=_RENAME, gc=False)
+        row._keys = tuple((attr, _RENAME.get(attr, attr)) for attr, *_ in fields)
+        row._page = msgspec.json.Decoder(Optional[List[row]])
+        return row
+    row = dataclasses.make_dataclass(
+        name,
+        [
+            (
+                attr,
+                Annotated[tp, Field(alias=_RENAME[attr])] if attr in _RENAME else tp,
+                *([dataclasses.field(default=default[0])] if default else []),
+            )
+            for attr, tp, *default in fields
+        ],
+        kw_only=True,
+        slots=True,
+    )
+    row.__module__ = __name__
+    # Drop row keys the type does not declare, as the msgspec structs do
+    row.__pydantic_config__ = ConfigDict(extra="ignore")
+    row._keys = tuple((attr, _RENAME.get(attr, attr)) for attr, *_ in fields)
+    # The whole envelope is validated in pydantic-core; fields besides "data" pass through
+    page = TypedDict(f"{name}Page", {"data": Optional[List[row]]}, total=False)
+    page.__pydantic_config__ = ConfigDict(extra="allow")
+    row._page = TypeAdapter(page)
+    return row
+
+
+LeaveRow = _row_type("LeaveRow", [
+    ("id", str),
+    ("category", str),
+    ("type", str),
+    ("status", str),
+    ("leaveDate", date),
+    ("leaveCount", float),
+    ("comments", Optional[str], None),
+    ("salaryYear", Optional[str], None),
+    ("salaryMonth", Optional[str], None),
+    ("subStatus", Optional[str], None),
+    ("appliedDate", date),
+    ("approvedDate", Optional[date], None),
+    ("employeeId", str),
+    ("employeeFinancialYearId", str),
+    ("createdAt", datetime),
+    ("updatedAt", datetime),
+])
+
+AttendanceRow = _row_type("AttendanceRow", [
+    ("id", str),
+    ("attendanceDate", date),
+    ("startTime", Optional[str], None),
+    ("endTime", Optional[str], None),
+    ("source", Optional[str], None),
+    ("inStatus", Optional[str], None),
+    ("outStatus", Optional[str], None),
+    ("category", Optional[str], None),
+    ("createdAt", datetime),
+    ("updatedAt", datetime),
+])
+
+LedgerRow = _row_type("LedgerRow", [
+    ("id", str),
+    ("category", str),
+    ("type", str),
+    ("status", str),
+    ("employeeFinancialYearId", str),
+    ("leaveDate", date),
+    ("leaveCount", float),
+    ("comments", Optional[str], None),
+    ("approvedDate", Optional[date], None),
+    ("createdAt", datetime),
+    ("updatedAt", datetime),
+])
+
+TicketRow = _row_type("TicketRow", [
+    ("id", str),
+    ("category", Optional[str], None),
+    ("status", Optional[str], None),
+    ("createdAt", Optional[str], None),
+    ("updatedAt", Optional[str], None),
+])
+
+
+class Page(NamedTuple):
+    """The ``data`` rows of an HRMS response and its remaining fields."""
+
+    rows: List[Any]
+    meta: Dict[str, Any]
+
+
+def decode_page(body: Union[bytes, str], row_type: Type[Any]) -> Page:
+    """Decode the HRMS response ``body`` into ``row_type`` rows and the other fields."""
+    if msgspec is not None:
+        # Top-level values stay undecoded slices until asked for
+        parts = msgspec.json.decode(body, type=Dict[str, msgspec.Raw])
+        data = parts.pop("data", None)
+        rows = row_type._page.decode(data) if data is not None else None
+        return Page(rows or [], {key: codec.loads(bytes(raw)) for key, raw in parts.items()})
+    meta = row_type._page.validate_json(body)
+    return Page(meta.pop("data", None) or [], meta)
+
+
+def _iso(value: Any) -> Any:
+    if isinstance(value, datetime):
+        text = value.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+@lru_cache(maxsize=projection.MAX_SELECTORS)
+def _selected(row_type: type, fields: projection.Fields) -> Tuple[Tuple[str, str], ...]:
+    # (attr, key) pairs for the requested fields; rows accept the key or the attribute name
+    by_name = {name: pair for pair in row_type._keys for name in pair}
+    return tuple(dict.fromkeys(by_name[name] for name in fields if name in by_name))
+
+
+def selector_cache_stats() -> Dict[str, int]:
+    """Hits, misses and size of the cached field selections of :func:`dump`."""
+    info = _selected.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+
+def dump(row: Any, fields: Optional[projection.Fields] = None) -> Dict[str, Any]:
+    """``row`` as a JSON-ready dict keyed like the HRMS payload, optionally only ``fields``."""
+    if fields:
+        return {key: _iso(getattr(row, attr)) for attr, key in _selected(type(row), fields)}
+    if msgspec is not None:
+        return msgspec.to_builtins(row)
+    return {key: _iso(getattr(row, attr)) for attr, key in row._keys}
+
+
+def as_body(
+    page: Page, model: Type[BaseModel], fields: Optional[projection.Fields] = None
+) -> Dict[str, Any]:
+    """The JSON body ``model`` serializes to, with only the envelope built through it.
+
+    ``fields`` limits each row to those keys (see :mod:`xmcp.projection`).
+    """
+    body = envelope(page, model)
+    body["data"] = [dump(row, fields) for row in page.rows]
+    return body
+
+
+def envelope(page: Page, model: Type[BaseModel]) -> Dict[str, Any]:
+    """The fields of the body ``model`` serializes to, other than the rows."""
+    body = model.model_validate({**page.meta, "data": []}).model_dump(mode="json", by_alias=True)
+    del body["data"]
+    return body
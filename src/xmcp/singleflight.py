@@ -0,0 +1,43 @@
+"""Single-flight execution: concurrent callers with the same key share one call.
+
+The first caller for a key (the leader) starts the call as a task; callers
+arriving while it is in flight await the same task and receive its result
+or exception.  Waiters are shielded from each other, so a cancelled caller
+does not cancel the shared call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key."""
+
+    def __init__(self) -> None:
+        # Tasks are bound to their event loop, so in-flight calls are tracked per loop.
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        inflight = self._inflight.setdefault(asyncio.get_running_loop(), {})
+        task = inflight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.ensure_future(fn())
+            inflight[key] = task
+            task.add_done_callback(lambda t: inflight.pop(key, None) if inflight.get(key) is t else None)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def inflight(self) -> int:
+        return sum(len(tasks) for tasks in self._inflight.values())
+
+    def stats(self) -> Dict[str, int]:
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "inflight": self.inflight()}
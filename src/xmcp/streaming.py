@@ -0,0 +1,77 @@
+"""Opt-in NDJSON responses for large list endpoints.
+
+A client sending ``Accept: application/x-ndjson`` gets one JSON record per
+line instead of a single JSON document, written as the rows arrive from HRMS
+(page by page for all-pages reads).  The last line is
+``{"_meta": {...}}`` with the response's non-row fields (status, paginate,
+balances); if HRMS fails after streaming has started the last line is
+``{"_error": "..."}`` instead, since the status code has already been sent.
+"""
+
+from __future__ import annotations
+
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Optional, Type
+
+import httpx
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+import xmcp.codec as codec
+import xmcp.projection as projection
+import xmcp.rows as rows
+
+NDJSON = "application/x-ndjson"
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON in request.headers.get("accept", "")
+
+
+async def _iterate(records: Iterable[Any]) -> AsyncIterator[Any]:
+    for record in records:
+        yield record
+
+
+def split_body(body: Dict[str, Any]) -> "tuple[list, Dict[str, Any]]":
+    """Split an HRMS response into its ``data`` rows and the remaining fields."""
+    meta = dict(body)
+    return meta.pop("data", None) or [], meta
+
+
+async def ndjson_response(
+    records: "AsyncIterator[Any] | Iterable[Any]",
+    meta: Optional[Callable[[], Dict[str, Any]]] = None,
+) -> StreamingResponse:
+    """Stream ``records`` as NDJSON followed by a ``_meta`` line from ``meta()``.
+
+    The first row is read before the response starts, so a failure to reach
+    HRMS still raises here and can be mapped to an error status.
+    """
+    iterator = records.__aiter__() if hasattr(records, "__aiter__") else _iterate(records).__aiter__()
+    try:
+        first = await iterator.__anext__()
+        done = False
+    except StopAsyncIteration:
+        first, done = None, True
+
+    async def body() -> AsyncIterator[bytes]:
+        if not done:
+            yield codec.dumps(first) + b"\n"
+            try:
+                async for row in iterator:
+                    yield codec.dumps(row) + b"\n"
+            except httpx.HTTPError as exc:
+                yield codec.dumps({"_error": str(exc)}) + b"\n"
+                return
+        yield codec.dumps({"_meta": meta() if meta else {}}) + b"\n"
+
+    return StreamingResponse(body(), media_type=NDJSON)
+
+
+async def ndjson_page(
+    page: rows.Page, model: Type[BaseModel], fields: Optional[projection.Fields] = None
+) -> StreamingResponse:
+    """Stream the decoded ``page`` as ``model`` would shape it, dumping each row as it is written."""
+    meta = rows.envelope(page, model)
+    return await ndjson_response((rows.dump(row, fields) for row in page.rows), lambda: meta)
@@ -1,7 +1,13 @@
 
-from typing import Callable, List, Optional
+import os
+import threading
+from types import MappingProxyType
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
 import httpx
 
+import xmcp.auth_context as auth_context
+import xmcp.cursors as cursors
+import xmcp.tools.base as tools_base
 import xmcp.tools.leaves.tools as leaves_tools
 import xmcp.tools.attendance.tools as attendance_tools
 import xmcp.tools.feedback.tools as feedback_tools
@@ -22,15 +28,78 @@ _team = team_tools.create_tool_specs
 _misc = misc_tools.create_tool_specs
 _referrals = referrals_tools.create_tool_specs if referrals_tools else None
 
-def all_tool_specs(base_url: str, auth_header_getter: Callable[[], str], http_client: Optional[httpx.Client] = None):
+def all_tool_specs(
+    base_url: str,
+    auth_header_getter: Callable[[], str],
+    http_client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
+):
     specs = []
     for factory in (_leaves, _attendance, _feedback, _tickets, _team, _misc):
-        specs.extend(factory(base_url, auth_header_getter, client=http_client))
+        specs.extend(factory(base_url, auth_header_getter, client=http_client, dispatch=dispatch))
     if _referrals:
-        specs.extend(_referrals(base_url, auth_header_getter, client=http_client))
+        specs.extend(_referrals(base_url, auth_header_getter, client=http_client, dispatch=dispatch))
+    # Serves the rest of results cut short by cursors.limit
+    specs.extend(cursors.create_tool_specs())
     # de-duplicate by name
     seen = set(); out = []
     for s in specs:
         if s.name not in seen:
             out.append(s); seen.add(s.name)
     return out
+
+
+# Where the server's own tools call in loopback mode
+LOCAL_BASE_URL = os.getenv("XMCP_LOCAL_BASE_URL", "http://localhost:8000").rstrip("/")
+
+
+class ToolRegistry:
+    """Immutable, name-indexed collection of ToolSpecs."""
+
+    def __init__(self, specs: Iterable[tools_base.ToolSpec]) -> None:
+        self._specs: Tuple[tools_base.ToolSpec, ...] = tuple(specs)
+        self._by_name = MappingProxyType({s.name: s for s in self._specs})
+
+    @property
+    def specs(self) -> Tuple[tools_base.ToolSpec, ...]:
+        return self._specs
+
+    def get(self, name: str) -> Optional[tools_base.ToolSpec]:
+        return self._by_name.get(name)
+
+    def names(self) -> List[str]:
+        return sorted(self._by_name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._by_name
+
+    def __iter__(self) -> Iterator[tools_base.ToolSpec]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+
+_registry: Optional[ToolRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ToolRegistry:
+    """Process-wide registry of the server's own tools, built on first use.
+
+    Tools resolve the Authorization header through ``auth_context`` at call
+    time and share the router clients from ``xmcp.tools.base``, so one
+    registry serves every request.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ToolRegistry(
+                    all_tool_specs(
+                        LOCAL_BASE_URL,
+                        auth_context.auth_header_getter,
+                        dispatch=tools_base.default_dispatch(),
+                    )
+                )
+    return _registry
@@ -14,22 +14,24 @@ import xmcp.tools.team_management.tools as team_tools
 import xmcp.tools.tickets.tools as tickets_tools
 
 ToolSpec = base.ToolSpec
+DISPATCH_MODES = base.DISPATCH_MODES
 
 
 def create_tool_specs(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = base.DISPATCH_LOOPBACK,
 ) -> List[ToolSpec]:
     """Aggregate ToolSpec definitions from all API groups."""
 
     specs: List[ToolSpec] = []
-    specs.extend(misc_tools.create_tool_specs(base_url, auth_header_getter, client))
-    specs.extend(leaves_tools.create_tool_specs(base_url, auth_header_getter, client))
-    specs.extend(attendance_tools.create_tool_specs(base_url, auth_header_getter, client))
-    specs.extend(feedback_tools.create_tool_specs(base_url, auth_header_getter, client))
-    specs.extend(tickets_tools.create_tool_specs(base_url, auth_header_getter, client))
-    specs.extend(team_tools.create_tool_specs(base_url, auth_header_getter, client))
+    specs.extend(misc_tools.create_tool_specs(base_url, auth_header_getter, client, dispatch))
+    specs.extend(leaves_tools.create_tool_specs(base_url, auth_header_getter, client, dispatch))
+    specs.extend(attendance_tools.create_tool_specs(base_url, auth_header_getter, client, dispatch))
+    specs.extend(feedback_tools.create_tool_specs(base_url, auth_header_getter, client, dispatch))
+    specs.extend(tickets_tools.create_tool_specs(base_url, auth_header_getter, client, dispatch))
+    specs.extend(team_tools.create_tool_specs(base_url, auth_header_getter, client, dispatch))
     return specs
 
 
@@ -37,13 +39,15 @@ def create_langchain_tools(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = base.DISPATCH_LOOPBACK,
 ) -> List[StructuredTool]:
     """Return LangChain StructuredTools for all API groups."""
 
-    specs = create_tool_specs(base_url, auth_header_getter, client)
+    specs = create_tool_specs(base_url, auth_header_getter, client, dispatch)
     return [
         StructuredTool.from_function(
             func=spec.func,
+            coroutine=spec.coroutine,
             name=spec.name,
             description=spec.description,
             args_schema=spec.args_schema,
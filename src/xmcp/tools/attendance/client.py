@@ -1,8 +1,23 @@
 import os
-import httpx
+from datetime import date
+import xmcp.cache as cache
+import xmcp.codec as codec
+import xmcp.pagination as pagination
+import xmcp.rows as rows
+import xmcp.upstream as upstream
 from dotenv import load_dotenv
+
+from .models import AttendanceEntry, AttendanceRangeResponse
+
 load_dotenv()
 
+# Range reads fan out one HRMS call per month; keep that bounded.
+ATTENDANCE_RANGE_MAX_MONTHS = int(os.getenv("XMCP_ATTENDANCE_RANGE_MAX_MONTHS", "12"))
+ATTENDANCE_RANGE_CONCURRENCY = int(os.getenv("XMCP_ATTENDANCE_RANGE_CONCURRENCY", "4"))
+
+class InvalidRange(ValueError):
+    """A requested date range is reversed or spans too many months."""
+
 class AttendanceClient:
     def __init__(self, base_url: str | None = None, timeout: float = 20.0) -> None:
         self.base_url = base_url or os.getenv("HRMS_API_BASE_URL")
@@ -11,37 +26,93 @@ class AttendanceClient:
         self.timeout = timeout
 
     async def get_my_attendance(self, year: int, month: int, auth_header: str) -> dict:
+        return codec.loads((await self.get_my_attendance_raw(year, month, auth_header)).body)
+
+    async def get_my_attendance_rows(self, year: int, month: int, auth_header: str) -> rows.Page:
+        """The month's attendance as compact :class:`xmcp.rows.AttendanceRow` rows."""
+        cached = await self.get_my_attendance_raw(year, month, auth_header)
+        return rows.decode_page(cached.body, rows.AttendanceRow)
+
+    async def get_my_attendance_raw(self, year: int, month: int, auth_header: str) -> cache.Cached:
         params = {"year": year, "month": month}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.post(
-                f"{self.base_url}/attendance/my-attendance",
-                params=params,
-                headers={"Authorization": auth_header},
+        client = upstream.get_client()
+        r = await client.post(
+            f"{self.base_url}/attendance/my-attendance",
+            params=params,
+            headers={"Authorization": auth_header},
+            timeout=self.timeout,
+        )
+        r.raise_for_status()
+        return cache.Cached(r.content, 0.0, r.headers.get("content-type"))
+
+    async def get_attendance_range(
+        self, start: date, end: date, auth_header: str
+    ) -> AttendanceRangeResponse:
+        """Attendance for ``start``..``end`` (inclusive), fetched month by month concurrently."""
+        if end < start:
+            raise InvalidRange("endDate must not be before startDate")
+        months = _months(start, end)
+        if len(months) > ATTENDANCE_RANGE_MAX_MONTHS:
+            raise InvalidRange(
+                f"Date range spans {len(months)} months; at most {ATTENDANCE_RANGE_MAX_MONTHS} are allowed"
             )
-            r.raise_for_status()
-            return r.json()
+        pages = await upstream.gather_limited(
+            (self.get_my_attendance(year, month, auth_header) for year, month in months),
+            ATTENDANCE_RANGE_CONCURRENCY,
+        )
+        entries = {}
+        for page in pages:
+            for row in page.get("data") or []:
+                entry = AttendanceEntry.model_validate(row)
+                if start <= entry.attendanceDate <= end:
+                    entries[entry.id] = entry
+        data = sorted(entries.values(), key=lambda e: (e.attendanceDate, e.startTime or ""))
+        return AttendanceRangeResponse(
+            statusCode=200,
+            statusMessage="OK",
+            startDate=start,
+            endDate=end,
+            totalRecords=len(data),
+            data=data,
+        )
 
     async def get_attendance_date(self, attendance_date: str, auth_header: str) -> dict:
         params = {"attendanceDate": attendance_date}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.get(
-                f"{self.base_url}/api/v2/attendance/attendances/employee/attendance-date",
-                params=params,
-                headers={"Authorization": auth_header},
-            )
-            r.raise_for_status()
-            return r.json()
+        r = await upstream.get(
+            f"{self.base_url}/api/v2/attendance/attendances/employee/attendance-date",
+            params=params,
+            headers={"Authorization": auth_header},
+            timeout=self.timeout,
+        )
+        r.raise_for_status()
+        return codec.loads(r.content)
 
     async def list_arrs(self, year: int, month: int, page: int, auth_header: str) -> dict:
         params = {"year": year, "month": month, "page": page}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.get(
+
+        async def load() -> bytes:
+            r = await upstream.get(
                 f"{self.base_url}/api/v2/attendance/attendances/my-regularized-attendance",
                 params=params,
                 headers={"Authorization": auth_header},
+                timeout=self.timeout,
             )
             r.raise_for_status()
-            return r.json()
+            return r.content
+
+        body = await cache.cached(
+            "attendance.arrs", auth_header, (self.base_url, page), load,
+            partition=(int(year), int(month)),
+        )
+        return codec.loads(body)
+
+    def iter_arrs(
+        self, year: int, month: int, auth_header: str, max_records: int | None = None
+    ) -> pagination.PageStream:
+        """Every ARR for the month, across pages, up to ``max_records``."""
+        return pagination.PageStream(
+            lambda page: self.list_arrs(year, month, page, auth_header), max_records
+        )
 
     async def submit_arr(
         self,
@@ -57,23 +128,46 @@ class AttendanceClient:
             files = {"file": file_tuple}
             # HRMS ignores "file": "null" when a real file is present
             data = {k: v for k, v in form_data.items() if k != "file"}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.post(
-                f"{self.base_url}/api/v2/attendance/attendances/regularisation/project",
-                params=params,
-                data=data,
-                files=files,
-                headers={"Authorization": auth_header},
-            )
-            r.raise_for_status()
-            return r.json()
+        client = upstream.get_client()
+        r = await client.post(
+            f"{self.base_url}/api/v2/attendance/attendances/regularisation/project",
+            params=params,
+            data=data,
+            files=files,
+            headers={"Authorization": auth_header},
+            timeout=self.timeout,
+        )
+        r.raise_for_status()
+        await cache.invalidate(
+            "attendance.submit_arr", auth_header, _year_month(form_data.get("attendanceDate"))
+        )
+        return codec.loads(r.content)
 
     async def apply_leave(self, payload: dict, auth_header: str) -> dict:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.post(
-                f"{self.base_url}/api/v2/attendance/leaves/apply",
-                json=payload,
-                headers={"Authorization": auth_header},
-            )
-            r.raise_for_status()
-            return r.json()
+        client = upstream.get_client()
+        r = await client.post(
+            f"{self.base_url}/api/v2/attendance/leaves/apply",
+            json=payload,
+            headers={"Authorization": auth_header},
+            timeout=self.timeout,
+        )
+        r.raise_for_status()
+        await cache.invalidate("attendance.apply_leave", auth_header)
+        return codec.loads(r.content)
+
+
+def _year_month(attendance_date: str | None) -> tuple[int, int] | None:
+    # ARR lists are cached per (year, month) of the attendance date (YYYY-MM-DD...)
+    try:
+        return int(attendance_date[:4]), int(attendance_date[5:7])
+    except (TypeError, ValueError):
+        return None
+
+
+def _months(start: date, end: date) -> list[tuple[int, int]]:
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
@@ -37,3 +37,14 @@ class AttendanceResponse(BaseModel):
     statusMessage: str
     data: List[AttendanceEntry]
     paginate: Paginate
+
+
+class AttendanceRangeResponse(BaseModel):
+    """Attendance entries for a date range, merged across months."""
+
+    statusCode: int
+    statusMessage: str
+    startDate: date
+    endDate: date
+    totalRecords: int
+    data: List[AttendanceEntry]
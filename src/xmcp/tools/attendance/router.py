@@ -1,24 +1,60 @@
 # --- ADD/REPLACE IN attendance/router.py ---
 
-from fastapi import APIRouter, Header, HTTPException, Query, UploadFile, File, Form, Body
+from fastapi import APIRouter, Header, HTTPException, Query, Request, UploadFile, File, Form, Body
 import httpx
-from .client import AttendanceClient
-from .models import AttendanceResponse
+from pydantic import ValidationError
+import xmcp.codec as codec
+import xmcp.pagination as pagination
+import xmcp.passthrough as passthrough
+import xmcp.projection as projection
+import xmcp.rows as rows
+import xmcp.streaming as streaming
+from .client import AttendanceClient, InvalidRange
+from datetime import date
+
+from .models import AttendanceRangeResponse, AttendanceResponse
 
 router = APIRouter(tags=["attendance"])
 client = AttendanceClient()
 
 @router.post("/attendance/my-attendance", response_model=AttendanceResponse)
 async def my_attendance(
+    request: Request,
     year: int = Query(..., ge=1900, le=2100),
     month: int = Query(..., ge=1, le=12),
+    fields: str | None = Query(None, description="Comma-separated row fields to return, e.g. attendanceDate,startTime,endTime"),
     authorization: str = Header(...),
 ) -> AttendanceResponse:
     try:
+        selected = projection.parse(fields)
+        if selected or streaming.wants_ndjson(request):
+            page = await client.get_my_attendance_rows(year, month, authorization)
+            if streaming.wants_ndjson(request):
+                return await streaming.ndjson_page(page, AttendanceResponse, selected)
+            return codec.JSONResponse(rows.as_body(page, AttendanceResponse, selected))
+        if passthrough.enabled("attendance.my_attendance"):
+            cached = await client.get_my_attendance_raw(year, month, authorization)
+            return passthrough.respond("attendance.my_attendance", cached, AttendanceResponse)
         return await client.get_my_attendance(year, month, authorization)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
+@router.get("/attendance/my-attendance/range", response_model=AttendanceRangeResponse)
+async def my_attendance_range(
+    startDate: date = Query(...),
+    endDate: date = Query(...),
+    authorization: str = Header(...),
+) -> AttendanceRangeResponse:
+    try:
+        return await client.get_attendance_range(startDate, endDate, authorization)
+    except InvalidRange as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+    except ValidationError as exc:
+        # HRMS answered with rows the model no longer matches
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+    except httpx.HTTPError as exc:
+        raise HTTPException(status_code=502, detail=str(exc)) from exc
+
 @router.get("/api/v2/attendance/attendances/employee/attendance-date")
 async def attendance_date(
     attendanceDate: str = Query(...),
@@ -34,9 +70,13 @@ async def my_regularized_attendance(
     year: int = Query(..., ge=1900, le=2100),
     month: int = Query(..., ge=1, le=12),
     page: int = Query(1, ge=1),
+    allPages: bool = Query(False, description="Fetch and merge every page"),
+    maxRecords: int | None = Query(None, ge=1, description="Stop after this many rows (allPages)"),
     authorization: str = Header(...),
 ) -> dict:
     try:
+        if allPages:
+            return await pagination.collect(client.iter_arrs(year, month, authorization, maxRecords))
         return await client.list_arrs(year, month, page, authorization)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
@@ -70,10 +110,10 @@ async def submit_arr(
         payload = {k: v for k, v in payload.items() if v not in (None, "")}
         file_tuple = None
         if file is not None:
-            content = await file.read()
+            # Hand httpx the spooled file so it is streamed to HRMS in chunks
             file_tuple = (
                 file.filename,
-                content,
+                file.file,
                 file.content_type or "application/octet-stream",
             )
         return await client.submit_arr(employeeId, payload, authorization, file_tuple)
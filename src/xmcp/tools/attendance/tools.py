@@ -1,15 +1,31 @@
 from __future__ import annotations
+from datetime import date
 from typing import Callable, List, Optional
 import httpx
 from pydantic import BaseModel, Field
 from langchain_core.tools import StructuredTool
+import xmcp.pagination as pagination
+import xmcp.projection as projection
+import xmcp.rows as rows
+import xmcp.tools.attendance.models as attendance_models
 import xmcp.tools.base as tools_base
 
 ToolSpec = tools_base.ToolSpec
+RouterCall = tools_base.RouterCall
+to_jsonable = tools_base.to_jsonable
+fields_param = tools_base.fields_param
+AttendanceResponse = attendance_models.AttendanceResponse
 
 class AttendanceInput(BaseModel):
     year: int
     month: int
+    fields: Optional[List[str]] = Field(
+        None, description="Only return these row fields, e.g. ['attendanceDate', 'startTime', 'endTime']; omit for every field"
+    )
+
+class AttendanceRangeInput(BaseModel):
+    startDate: date = Field(..., description="First day of the range (YYYY-MM-DD)")
+    endDate: date = Field(..., description="Last day of the range, inclusive (YYYY-MM-DD); at most 12 months after startDate")
 
 class AttendanceDateInput(BaseModel):
     attendanceDate: str
@@ -18,6 +34,8 @@ class ArrListInput(BaseModel):
     year: int
     month: int
     page: int = 1
+    allPages: bool = Field(False, description="Fetch every page and merge the rows (ignores page)")
+    maxRecords: int | None = Field(None, ge=1, description="With allPages, stop after this many rows")
 
 class SubmitArrInput(BaseModel):
     employeeId: str
@@ -38,46 +56,101 @@ class ApplyLeaveInput(BaseModel):
     leaveDate: str | list[str]
     comments: str | None = None
 
+# ---- In-process implementations (dispatch="inprocess") ----
+
+def _attendance_client():
+    import xmcp.tools.attendance.router as attendance_router
+    return attendance_router.client
+
+async def _get_attendance_inprocess(
+    auth_header: str, year: int, month: int, fields: Optional[List[str]] = None
+) -> dict:
+    selected = projection.parse(fields)
+    if selected:
+        page = await _attendance_client().get_my_attendance_rows(year, month, auth_header)
+        return rows.as_body(page, AttendanceResponse, selected)
+    return to_jsonable(await _attendance_client().get_my_attendance(year, month, auth_header))
+
+async def _get_attendance_range_inprocess(auth_header: str, startDate: date, endDate: date) -> dict:
+    return to_jsonable(await _attendance_client().get_attendance_range(startDate, endDate, auth_header))
+
+async def _get_attendance_date_inprocess(auth_header: str, attendanceDate: str) -> dict:
+    return await _attendance_client().get_attendance_date(attendanceDate, auth_header)
+
+async def _list_arrs_inprocess(
+    auth_header: str, year: int, month: int, page: int = 1, allPages: bool = False, maxRecords: int | None = None
+) -> dict:
+    if allPages:
+        return await pagination.collect(_attendance_client().iter_arrs(year, month, auth_header, maxRecords))
+    return await _attendance_client().list_arrs(year, month, page, auth_header)
+
+async def _submit_arr_inprocess(auth_header: str, **kwargs) -> dict:
+    file_path = kwargs.pop("file_path", None)
+    employeeId = kwargs.pop("employeeId")
+    # Same form the router builds: HRMS wants "file": "null" when nothing is attached
+    data = {k: v for k, v in kwargs.items() if v not in (None, "")}
+    if not file_path:
+        return await _attendance_client().submit_arr(employeeId, {**data, "file": "null"}, auth_header)
+    with open(file_path, "rb") as f:
+        file_tuple = (file_path.split("/")[-1], f, "application/octet-stream")
+        return await _attendance_client().submit_arr(employeeId, data, auth_header, file_tuple)
+
+async def _apply_leave_inprocess(auth_header: str, **payload) -> dict:
+    return await _attendance_client().apply_leave(payload, auth_header)
+
+_INPROCESS = {
+    "get_attendance": _get_attendance_inprocess,
+    "get_attendance_range": _get_attendance_range_inprocess,
+    "get_attendance_date": _get_attendance_date_inprocess,
+    "list_arrs": _list_arrs_inprocess,
+    "submit_arr": _submit_arr_inprocess,
+    "apply_leave": _apply_leave_inprocess,
+}
+
 def create_tool_specs(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
 ) -> List[ToolSpec]:
-    http_client = client or httpx.Client(base_url=base_url, timeout=20.0)
+    router = tools_base.RouterClient(base_url, auth_header_getter, dispatch, client, timeout=20.0)
 
-    def _get_attendance(year: int, month: int) -> dict:
-        r = http_client.post(
+    def _get_attendance(year: int, month: int, fields: Optional[List[str]] = None) -> RouterCall:
+        return router.post(
             "/attendance/my-attendance",
-            params={"year": year, "month": month},
-            headers={"Authorization": auth_header_getter()},
+            params={"year": year, "month": month, **fields_param(fields)},
         )
-        r.raise_for_status()
-        return r.json()
 
-    def _get_attendance_date(attendanceDate: str) -> dict:
-        r = http_client.get(
+    def _get_attendance_range(startDate: date, endDate: date) -> RouterCall:
+        return router.get(
+            "/attendance/my-attendance/range",
+            params={"startDate": startDate.isoformat(), "endDate": endDate.isoformat()},
+        )
+
+    def _get_attendance_date(attendanceDate: str) -> RouterCall:
+        return router.get(
             "/api/v2/attendance/attendances/employee/attendance-date",
             params={"attendanceDate": attendanceDate},
-            headers={"Authorization": auth_header_getter()},
         )
-        r.raise_for_status()
-        return r.json()
 
-    def _list_arrs(year: int, month: int, page: int = 1) -> dict:
-        r = http_client.get(
+    def _list_arrs(
+        year: int, month: int, page: int = 1, allPages: bool = False, maxRecords: int | None = None
+    ) -> RouterCall:
+        params = {"year": year, "month": month, "page": page}
+        if allPages:
+            params.update(allPages=True, **({"maxRecords": maxRecords} if maxRecords else {}))
+        return router.get(
             "/api/v2/attendance/attendances/my-regularized-attendance",
-            params={"year": year, "month": month, "page": page},
-            headers={"Authorization": auth_header_getter()},
+            params=params,
         )
-        r.raise_for_status()
-        return r.json()
 
-    def _submit_arr(**kwargs) -> dict:
+    def _submit_arr(**kwargs) -> RouterCall:
         file_path = kwargs.pop("file_path", None)
         employeeId = kwargs.pop("employeeId")
         data = {k: v for k, v in kwargs.items() if v is not None}
         files = None
         if file_path:
+            # RouterClient closes the file once the request is sent
             files = {
                 "file": (
                     file_path.split("/")[-1],
@@ -86,38 +159,39 @@ def create_tool_specs(
                 )
             }
             data.pop("file", None)
-        r = http_client.post(
+        return router.post(
             "/api/v2/attendance/attendances/regularisation/project",
             params={"employeeId": employeeId},  # proxy param -> router maps to Id
             data={"employeeId": employeeId, **data},  # router expects form-data
             files=files,
-            headers={"Authorization": auth_header_getter()},
         )
-        r.raise_for_status()
-        return r.json()
 
-    def _apply_leave(**payload) -> dict:
-        r = http_client.post(
+    def _apply_leave(**payload) -> RouterCall:
+        return router.post(
             "/api/v2/attendance/leaves/apply",
             json=payload,
-            headers={"Authorization": auth_header_getter()},
         )
-        r.raise_for_status()
-        return r.json()
 
-    return [
+    specs = [
         ToolSpec("get_attendance", "Get attendance entries for a month.", AttendanceInput, _get_attendance),
+        ToolSpec(
+            "get_attendance_range",
+            "Get attendance entries between two dates (e.g. a quarter), merged and sorted by date.",
+            AttendanceRangeInput,
+            _get_attendance_range,
+        ),
         ToolSpec("get_attendance_date", "Get iPad-marked timings for a date.", AttendanceDateInput, _get_attendance_date),
         ToolSpec("list_arrs", "List attendance regularization requests (ARRs).", ArrListInput, _list_arrs),
         ToolSpec("submit_arr", "Submit an ARR (supports file).", SubmitArrInput, _submit_arr),
         ToolSpec("apply_leave", "Apply for a leave (v2).", ApplyLeaveInput, _apply_leave),
     ]
+    return tools_base.bind_dispatch(specs, router, _INPROCESS)
 
-def create_langchain_tools(base_url: str, auth_header_getter: Callable[[], str], client: Optional[httpx.Client] = None):
-    specs = create_tool_specs(base_url, auth_header_getter, client)
+def create_langchain_tools(base_url: str, auth_header_getter: Callable[[], str], client: Optional[httpx.Client] = None, dispatch: str = tools_base.DISPATCH_LOOPBACK):
+    specs = create_tool_specs(base_url, auth_header_getter, client, dispatch)
     return [
         StructuredTool.from_function(
-            func=s.func, name=s.name, description=s.description, args_schema=s.args_schema
+            func=s.func, coroutine=s.coroutine, name=s.name, description=s.description, args_schema=s.args_schema
         )
         for s in specs
     ]
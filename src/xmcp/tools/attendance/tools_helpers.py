@@ -2,6 +2,7 @@
 from __future__ import annotations
 from typing import Callable, List, Optional
 import httpx
+import xmcp.codec as codec
 from pydantic import BaseModel, Field
 from langchain_core.tools import StructuredTool
 import xmcp.tools.base as tools_base
@@ -33,7 +34,7 @@ def create_tool_specs(base_url: str, auth_header_getter: Callable[[], str], clie
             headers={"Authorization": auth_header_getter()},
         )
         r.raise_for_status()
-        data = r.json()
+        data = codec.loads(r.content)
         # Heuristic: extract earliest "in" and latest "out"
         ins = []; outs = []
         for rec in data.get("records", data if isinstance(data, list) else []):
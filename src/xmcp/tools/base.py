@@ -1,8 +1,25 @@
-from dataclasses import dataclass
-from typing import Any, Callable, Type
+import asyncio
+import os
+import secrets
+import threading
+import weakref
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple, Type
 
+import httpx
 from pydantic import BaseModel
 
+import xmcp.codec as codec
+
+# How ToolSpecs reach the domain logic:
+#   loopback  - HTTP to the XMCP routers at base_url (default; works against a remote server)
+#   asgi      - same router calls, served in memory by the local FastAPI app
+#   inprocess - call the domain clients directly, skipping the router hop
+DISPATCH_LOOPBACK = "loopback"
+DISPATCH_ASGI = "asgi"
+DISPATCH_INPROCESS = "inprocess"
+DISPATCH_MODES = (DISPATCH_LOOPBACK, DISPATCH_ASGI, DISPATCH_INPROCESS)
+
 
 @dataclass
 class ToolSpec:
@@ -12,3 +29,257 @@ class ToolSpec:
     description: str
     args_schema: Type[BaseModel]
     func: Callable[..., Any]
+    # Optional async implementation; runtimes that can await prefer it over func.
+    coroutine: Optional[Callable[..., Awaitable[Any]]] = None
+
+
+def default_dispatch() -> str:
+    return os.getenv("XMCP_TOOL_DISPATCH", DISPATCH_LOOPBACK)
+
+
+def check_dispatch(dispatch: str) -> str:
+    if dispatch not in DISPATCH_MODES:
+        raise ValueError(f"Unknown dispatch mode {dispatch!r}; expected one of {DISPATCH_MODES}")
+    return dispatch
+
+
+# ---- Sync bridge ----
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="xmcp-tools-loop", daemon=True
+            ).start()
+        return _loop
+
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    """Run ``coro`` on a long-lived background loop and wait for its result.
+
+    Sync tool funcs use this to call async code; keeping a single loop lets the
+    shared upstream connection pool be reused across calls.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+
+# ---- Router calls (loopback / asgi dispatch) ----
+
+# Marks the tools' calls into the routers, which were already rate limited as
+# the tool call that made them (see xmcp.ratelimit and check_internal_token).
+INTERNAL_HEADER = "X-XMCP-Internal"
+INTERNAL_TOKEN = os.getenv("XMCP_INTERNAL_TOKEN") or secrets.token_urlsafe(16)
+
+
+def workers() -> int:
+    """Worker processes serving the app, from ``WEB_CONCURRENCY`` (read by uvicorn and gunicorn)."""
+    value = os.getenv("WEB_CONCURRENCY", "").strip()
+    return int(value) if value else 1
+
+
+def check_internal_token(dispatch: str) -> None:
+    """Refuse loopback dispatch across several workers without a shared token.
+
+    A loopback call may reach another worker, whose random token would not
+    match; it would then be charged to the caller again and queued behind
+    the very call that made it.
+    """
+    if dispatch == DISPATCH_LOOPBACK and workers() > 1 and not os.getenv("XMCP_INTERNAL_TOKEN"):
+        raise RuntimeError(
+            "XMCP_INTERNAL_TOKEN must be set when tools use loopback dispatch with several workers"
+        )
+
+
+class RouterCall(NamedTuple):
+    """A request to one of the XMCP routers, built by a tool before it is sent."""
+
+    method: str
+    path: str
+    kwargs: Dict[str, Any]
+
+
+# Router clients are shared by every RouterClient in the process (keyed by
+# target) instead of one pool per tool factory; see close_clients().
+_sync_clients: Dict[str, httpx.Client] = {}
+_sync_clients_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _shared_sync_client(base_url: str) -> httpx.Client:
+    with _sync_clients_lock:
+        client = _sync_clients.get(base_url)
+        if client is None or client.is_closed:
+            client = _sync_clients[base_url] = httpx.Client(base_url=base_url)
+        return client
+
+
+def _shared_async_client(dispatch: str, base_url: str) -> httpx.AsyncClient:
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    key = "asgi" if dispatch == DISPATCH_ASGI else base_url
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        if dispatch == DISPATCH_ASGI:
+            # Imported lazily: xmcp.main builds the tools at import time.
+            import xmcp.main as main_module
+
+            client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=main_module.app), base_url="http://xmcp"
+            )
+        else:
+            client = httpx.AsyncClient(base_url=base_url)
+        clients[key] = client
+    return client
+
+
+async def close_clients() -> None:
+    """Close the shared sync clients and this loop's async router clients."""
+    with _sync_clients_lock:
+        sync_clients = list(_sync_clients.values())
+        _sync_clients.clear()
+    for client in sync_clients:
+        client.close()
+    for client in _async_clients.pop(asyncio.get_running_loop(), {}).values():
+        await client.aclose()
+
+
+class RouterClient:
+    """Sends RouterCalls to the XMCP routers, from sync or async callers.
+
+    Loopback dispatch talks HTTP to ``base_url``; asgi dispatch serves the
+    calls in memory from the local FastAPI app.  Unless an explicit ``client``
+    is given, connections come from the process-wide shared clients.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        auth_header_getter: Callable[[], str],
+        dispatch: str = DISPATCH_LOOPBACK,
+        client: Optional[httpx.Client] = None,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.auth_header_getter = auth_header_getter
+        self.dispatch = check_dispatch(dispatch)
+        self.timeout = httpx.USE_CLIENT_DEFAULT if timeout is None else timeout
+        self._client = client
+
+    def get(self, path: str, **kwargs: Any) -> RouterCall:
+        return RouterCall("GET", path, kwargs)
+
+    def post(self, path: str, **kwargs: Any) -> RouterCall:
+        return RouterCall("POST", path, kwargs)
+
+    def put(self, path: str, **kwargs: Any) -> RouterCall:
+        return RouterCall("PUT", path, kwargs)
+
+    def send(self, call: RouterCall) -> Any:
+        """Send ``call`` and return the decoded JSON body (blocking)."""
+        if self.dispatch == DISPATCH_ASGI:
+            # The app is async-only; run it on the background loop.
+            return run_sync(self.asend(call, self.auth_header_getter()))
+        client = self._client or _shared_sync_client(self.base_url)
+        try:
+            response = client.request(
+                call.method,
+                call.path,
+                headers={"Authorization": self.auth_header_getter(), INTERNAL_HEADER: INTERNAL_TOKEN},
+                timeout=self.timeout,
+                **call.kwargs,
+            )
+        finally:
+            _close_files(call)
+        response.raise_for_status()
+        return codec.loads(response.content)
+
+    async def asend(self, call: RouterCall, auth_header: Optional[str] = None) -> Any:
+        """Send ``call`` and return the decoded JSON body."""
+        if auth_header is None:
+            auth_header = self.auth_header_getter()
+        client = _shared_async_client(self.dispatch, self.base_url)
+        try:
+            response = await client.request(
+                call.method,
+                call.path,
+                headers={"Authorization": auth_header, INTERNAL_HEADER: INTERNAL_TOKEN},
+                timeout=self.timeout,
+                **call.kwargs,
+            )
+        finally:
+            _close_files(call)
+        response.raise_for_status()
+        return codec.loads(response.content)
+
+
+def _close_files(call: RouterCall) -> None:
+    # Tools open attachments when building the call; the sender owns closing them.
+    for value in (call.kwargs.get("files") or {}).values():
+        fileobj = value[1] if isinstance(value, tuple) else value
+        if hasattr(fileobj, "close"):
+            fileobj.close()
+
+
+# ---- In-process dispatch ----
+
+def to_jsonable(value: Any) -> Any:
+    """Serialize a client result the way the router's response would."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    return value
+
+
+def fields_param(fields: Optional[List[str]]) -> Dict[str, str]:
+    """The ``fields`` query parameter for a projected list call (empty for all fields)."""
+    return {"fields": ",".join(fields)} if fields else {}
+
+
+def bind_dispatch(
+    specs: List[ToolSpec],
+    router: RouterClient,
+    inprocess: Dict[str, Callable[..., Awaitable[Any]]],
+) -> List[ToolSpec]:
+    """Turn each spec's call builder into its sync ``func`` and async ``coroutine``.
+
+    Specs are declared with ``func`` returning a :class:`RouterCall`.  For the
+    loopback and asgi modes that call is sent through ``router``; for
+    inprocess dispatch the builder is replaced by the matching entry of
+    ``inprocess``, a coroutine taking the auth header followed by the tool
+    arguments.
+    """
+    auth_header_getter = router.auth_header_getter
+
+    def _bind_router(build: Callable[..., RouterCall]) -> Tuple[Callable[..., Any], Callable[..., Awaitable[Any]]]:
+        def func(**kwargs: Any) -> Any:
+            return router.send(build(**kwargs))
+
+        async def coroutine(**kwargs: Any) -> Any:
+            return await router.asend(build(**kwargs))
+
+        return func, coroutine
+
+    def _bind_inprocess(impl: Callable[..., Awaitable[Any]]) -> Tuple[Callable[..., Any], Callable[..., Awaitable[Any]]]:
+        def func(**kwargs: Any) -> Any:
+            # Resolve the header in the caller's context before hopping loops
+            return run_sync(impl(auth_header_getter(), **kwargs))
+
+        async def coroutine(**kwargs: Any) -> Any:
+            return await impl(auth_header_getter(), **kwargs)
+
+        return func, coroutine
+
+    bound = []
+    for s in specs:
+        if router.dispatch == DISPATCH_INPROCESS:
+            func, coroutine = _bind_inprocess(inprocess[s.name])
+        else:
+            func, coroutine = _bind_router(s.func)
+        bound.append(replace(s, func=func, coroutine=coroutine))
+    return bound
@@ -1,6 +1,7 @@
 import os
 from dotenv import load_dotenv
-import httpx
+import xmcp.cache as cache
+import xmcp.upstream as upstream
 
 from .models import (
     AddFeedbackRequest,
@@ -25,37 +26,57 @@ class FeedbackClient:
     ) -> AddFeedbackResponse:
         """Submit feedback for a team member."""
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/app/employeeNotes/addgenericNote",
-                json=payload.model_dump(),
-                headers={"Authorization": auth_header},
-            )
-            response.raise_for_status()
-            return AddFeedbackResponse.model_validate(response.json())
+        client = upstream.get_client()
+        response = await client.post(
+            f"{self.base_url}/app/employeeNotes/addgenericNote",
+            json=payload.model_dump(mode="json"),
+            headers={"Authorization": auth_header},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        await cache.invalidate("feedback.add_feedback", auth_header)
+        return AddFeedbackResponse.model_validate_json(response.content)
 
     async def get_rm_feedbacks(
         self, auth_header: str, emp_id: str = ""
     ) -> RMFeedbacksResponse:
         """Retrieve RM feedback entries."""
+        cached = await self.get_rm_feedbacks_raw(auth_header, emp_id)
+        return RMFeedbacksResponse.model_validate_json(cached.body)
+
+    async def get_rm_feedbacks_raw(self, auth_header: str, emp_id: str = "") -> cache.Cached:
+        """The HRMS RM feedbacks body, unparsed."""
         params = {"id": emp_id, "tab": "RMFeedbacks"}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
+
+        async def load() -> cache.Body:
+            response = await upstream.get(
                 f"{self.base_url}/app/employeeNotes/genericNotes",
                 params=params,
                 headers={"Authorization": auth_header},
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return RMFeedbacksResponse.model_validate(response.json())
+            return cache.body(response)
+
+        return await cache.fetch("feedback.rm_feedbacks", auth_header, (self.base_url, emp_id), load)
 
     async def get_feedback_levels(
         self, auth_header: str
     ) -> FeedbackLevelsResponse:
         """List users available for feedback."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
+        cached = await self.get_feedback_levels_raw(auth_header)
+        return FeedbackLevelsResponse.model_validate_json(cached.body)
+
+    async def get_feedback_levels_raw(self, auth_header: str) -> cache.Cached:
+        """The HRMS feedback levels body, unparsed."""
+
+        async def load() -> cache.Body:
+            response = await upstream.get(
                 f"{self.base_url}/app/employeeNotes/feedbackLevels",
                 headers={"Authorization": auth_header},
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return FeedbackLevelsResponse.model_validate(response.json())
+            return cache.body(response)
+
+        return await cache.fetch("feedback.levels", auth_header, self.base_url, load)
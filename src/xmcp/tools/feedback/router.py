@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Header, HTTPException, Query
 import httpx
 
+import xmcp.passthrough as passthrough
+
 from .client import FeedbackClient
 from .models import (
     AddFeedbackRequest,
@@ -30,6 +32,9 @@ async def rm_feedbacks(
 ) -> RMFeedbacksResponse:
     """Retrieve RM feedback entries for the given employee."""
     try:
+        if passthrough.enabled("feedback.rm_feedbacks"):
+            cached = await client.get_rm_feedbacks_raw(authorization, id)
+            return passthrough.respond("feedback.rm_feedbacks", cached, RMFeedbacksResponse)
         return await client.get_rm_feedbacks(authorization, id)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
@@ -41,6 +46,9 @@ async def feedback_levels(
 ) -> FeedbackLevelsResponse:
     """List users available in feedback levels."""
     try:
+        if passthrough.enabled("feedback.levels"):
+            cached = await client.get_feedback_levels_raw(authorization)
+            return passthrough.respond("feedback.levels", cached, FeedbackLevelsResponse)
         return await client.get_feedback_levels(authorization)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
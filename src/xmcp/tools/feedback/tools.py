@@ -12,6 +12,8 @@ import xmcp.tools.base as tools_base
 import xmcp.tools.feedback.models as feedback_models
 
 ToolSpec = tools_base.ToolSpec
+RouterCall = tools_base.RouterCall
+to_jsonable = tools_base.to_jsonable
 AddFeedbackRequest = feedback_models.AddFeedbackRequest
 
 
@@ -29,44 +31,63 @@ class EmptyInput(BaseModel):
     pass
 
 
+# ---- In-process implementations (dispatch="inprocess") ----
+
+def _feedback_client():
+    # Imported lazily so loopback users don't need HRMS_API_BASE_URL configured.
+    import xmcp.tools.feedback.router as feedback_router
+
+    return feedback_router.client
+
+
+async def _add_feedback_inprocess(auth_header: str, **payload: dict) -> dict:
+    req = AddFeedbackRequest(**payload)
+    return to_jsonable(await _feedback_client().add_feedback(req, auth_header))
+
+
+async def _rm_feedbacks_inprocess(auth_header: str, id: Optional[str] = None) -> dict:
+    return to_jsonable(await _feedback_client().get_rm_feedbacks(auth_header, id or ""))
+
+
+async def _feedback_levels_inprocess(auth_header: str) -> dict:
+    return to_jsonable(await _feedback_client().get_feedback_levels(auth_header))
+
+
+_INPROCESS = {
+    "add_feedback": _add_feedback_inprocess,
+    "get_rm_feedbacks": _rm_feedbacks_inprocess,
+    "get_feedback_levels": _feedback_levels_inprocess,
+}
+
+
 def create_tool_specs(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
 ) -> List[ToolSpec]:
     """Create tool specifications for feedback APIs."""
 
-    http_client = client or httpx.Client(base_url=base_url)
+    router = tools_base.RouterClient(base_url, auth_header_getter, dispatch, client)
 
-    def _add_feedback(**payload: dict) -> dict:
+    def _add_feedback(**payload: dict) -> RouterCall:
         req = AddFeedbackRequest(**payload)
-        response = http_client.post(
+        return router.post(
             "/feedback/add",
             json=req.model_dump(mode="json"),
-            headers={"Authorization": auth_header_getter()},
         )
-        response.raise_for_status()
-        return response.json()
 
-    def _rm_feedbacks(id: Optional[str] = None) -> dict:
+    def _rm_feedbacks(id: Optional[str] = None) -> RouterCall:
         params = {"id": id} if id else {}
-        response = http_client.get(
+        return router.get(
             "/feedback/rm-feedbacks",
             params=params,
-            headers={"Authorization": auth_header_getter()},
         )
-        response.raise_for_status()
-        return response.json()
 
-    def _feedback_levels() -> dict:
-        response = http_client.get(
-            "/feedback/levels",
-            headers={"Authorization": auth_header_getter()},
-        )
-        response.raise_for_status()
-        return response.json()
+    def _feedback_levels() -> RouterCall:
+        return router.get("/feedback/levels")
 
-    return [
+    specs = [
         ToolSpec(
             name="add_feedback",
             description="Submit feedback for a team member.",
@@ -86,19 +107,22 @@ def create_tool_specs(
             func=_feedback_levels,
         ),
     ]
+    return tools_base.bind_dispatch(specs, router, _INPROCESS)
 
 
 def create_langchain_tools(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
 ) -> List[StructuredTool]:
     """Create LangChain StructuredTool instances for feedback APIs."""
 
-    specs = create_tool_specs(base_url, auth_header_getter, client)
+    specs = create_tool_specs(base_url, auth_header_getter, client, dispatch)
     return [
         StructuredTool.from_function(
             func=spec.func,
+            coroutine=spec.coroutine,
             name=spec.name,
             description=spec.description,
             args_schema=spec.args_schema,
@@ -1,6 +1,8 @@
 import os
 from dotenv import load_dotenv
-import httpx
+import xmcp.cache as cache
+import xmcp.rows as rows
+import xmcp.upstream as upstream
 
 from .models import (
     ApplyLeaveRequest,
@@ -24,25 +26,50 @@ class LeavesClient:
 
     async def get_holidays(self, year: int, auth_header: str) -> HolidaysResponse:
         """Retrieve holiday information for the given year."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
+        cached = await self.get_holidays_raw(year, auth_header)
+        return HolidaysResponse.model_validate_json(cached.body)
+
+    async def get_holidays_raw(self, year: int, auth_header: str) -> cache.Cached:
+        """The HRMS holidays body for ``year``, unparsed."""
+
+        async def load() -> cache.Body:
+            response = await upstream.get(
                 f"{self.base_url}/app/employees/holidays",
                 params={"year": year},
                 headers={"Authorization": auth_header},
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return HolidaysResponse.model_validate(response.json())
+            return cache.body(response)
+
+        return await cache.fetch("leaves.holidays", auth_header, (self.base_url, year), load)
 
     async def get_leaves(self, fy_id: str, auth_header: str) -> LeavesResponse:
         """Retrieve leave entries for the specified financial year id."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
+        cached = await self.get_leaves_raw(fy_id, auth_header)
+        return LeavesResponse.model_validate_json(cached.body)
+
+    async def get_leaves_rows(self, fy_id: str, auth_header: str) -> rows.Page:
+        """Leave entries for ``fy_id`` as compact :class:`xmcp.rows.LeaveRow` rows."""
+        cached = await self.get_leaves_raw(fy_id, auth_header)
+        return rows.decode_page(cached.body, rows.LeaveRow)
+
+    async def get_leaves_raw(self, fy_id: str, auth_header: str) -> cache.Cached:
+        """The HRMS leaves body for ``fy_id``, unparsed."""
+
+        async def load() -> cache.Body:
+            response = await upstream.get(
                 f"{self.base_url}/attendance/leaves/my-leaves",
                 params={"fyId": fy_id},
                 headers={"Authorization": auth_header},
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return LeavesResponse.model_validate(response.json())
+            return cache.body(response)
+
+        return await cache.fetch(
+            "leaves.my_leaves", auth_header, self.base_url, load, partition=fy_id
+        )
 
     async def apply_leave(
         self, payload: ApplyLeaveRequest, auth_header: str
@@ -51,25 +78,30 @@ class LeavesClient:
         # IMPORTANT: use mode="json" so date fields serialize to ISO strings
         json_payload = payload.model_dump(mode="json")
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/attendance/leaves/apply",
-                json=json_payload,
-                headers={"Authorization": auth_header},
-            )
-            response.raise_for_status()
-            return ApplyLeaveResponse.model_validate(response.json())
+        client = upstream.get_client()
+        response = await client.post(
+            f"{self.base_url}/attendance/leaves/apply",
+            json=json_payload,
+            headers={"Authorization": auth_header},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        await cache.invalidate("leaves.apply_leave", auth_header)
+        return ApplyLeaveResponse.model_validate_json(response.content)
 
     async def apply_comp_off(
         self, payload: ApplyCompOffRequest, auth_header: str
     ) -> ApplyLeaveResponse:
         """Submit a comp-off application."""
         json_payload = payload.model_dump(mode="json")
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/attendance/leaves/apply/comp-off",
-                json=json_payload,
-                headers={"Authorization": auth_header},
-            )
-            response.raise_for_status()
-            return ApplyLeaveResponse.model_validate(response.json())
+        client = upstream.get_client()
+        response = await client.post(
+            f"{self.base_url}/attendance/leaves/apply/comp-off",
+            json=json_payload,
+            headers={"Authorization": auth_header},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        await cache.invalidate("leaves.apply_comp_off", auth_header)
+        return ApplyLeaveResponse.model_validate_json(response.content)
+
@@ -3,6 +3,10 @@ import httpx
 from fastapi import APIRouter, Depends
 import xmcp.tools.leaves.client as leaves_client_module
 import xmcp.auth_context as auth_context
+import xmcp.codec as codec
+import xmcp.passthrough as passthrough
+import xmcp.projection as projection
+import xmcp.rows as rows
 import xmcp.tools.leaves.models as leaves_models
 
 LeavesClient = leaves_client_module.LeavesClient
@@ -26,6 +30,9 @@ async def holidays(
 ) -> HolidaysResponse:
     """Retrieve holidays for a given year."""
     try:
+        if passthrough.enabled("leaves.holidays"):
+            cached = await client.get_holidays_raw(year, authorization)
+            return passthrough.respond("leaves.holidays", cached, HolidaysResponse)
         return await client.get_holidays(year, authorization)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
@@ -34,10 +41,18 @@ async def holidays(
 @router.get("/leaves", response_model=LeavesResponse)
 async def leaves(
     fy_id: str = Query(..., alias="fyId"),
+    fields: str | None = Query(None, description="Comma-separated row fields to return, e.g. leaveDate,status"),
     authorization: str = Header(...),
 ) -> LeavesResponse:
     """Retrieve leave entries for the provided financial year identifier."""
     try:
+        selected = projection.parse(fields)
+        if selected:
+            page = await client.get_leaves_rows(fy_id, authorization)
+            return codec.JSONResponse(rows.as_body(page, LeavesResponse, selected))
+        if passthrough.enabled("leaves.my_leaves"):
+            cached = await client.get_leaves_raw(fy_id, authorization)
+            return passthrough.respond("leaves.my_leaves", cached, LeavesResponse)
         return await client.get_leaves(fy_id, authorization)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
@@ -9,12 +9,18 @@ from langchain_core.tools import StructuredTool
 from datetime import date
 from pydantic import BaseModel, Field, ConfigDict
 
+import xmcp.projection as projection
+import xmcp.rows as rows
 import xmcp.tools.base as tools_base
 import xmcp.tools.leaves.models as leaves_models
 
 ToolSpec = tools_base.ToolSpec
+RouterCall = tools_base.RouterCall
+to_jsonable = tools_base.to_jsonable
+fields_param = tools_base.fields_param
 ApplyLeaveRequest = leaves_models.ApplyLeaveRequest
 ApplyCompOffRequest = leaves_models.ApplyCompOffRequest
+LeavesResponse = leaves_models.LeavesResponse
 
 
 # ---- Input models for tools in this module ----
@@ -38,6 +44,45 @@ class HolidaysInput(BaseModel):
 class LeavesInput(BaseModel):
     """Input schema for the get_leaves tool."""
     fyId: str = Field(..., description="Financial year identifier (e.g., '2025-26')")
+    fields: Optional[List[str]] = Field(
+        None, description="Only return these row fields, e.g. ['leaveDate', 'leaveCount', 'status']; omit for every field"
+    )
+
+
+# ---- In-process implementations (dispatch="inprocess") ----
+
+def _leaves_client():
+    # Imported lazily so loopback users don't need HRMS_API_BASE_URL configured.
+    import xmcp.tools.leaves.router as leaves_router
+
+    return leaves_router.client
+
+
+async def _get_holidays_inprocess(auth_header: str, leaveDate: date) -> dict:
+    return to_jsonable(await _leaves_client().get_holidays(leaveDate.year, auth_header))
+
+
+async def _get_leaves_inprocess(auth_header: str, fyId: str, fields: Optional[List[str]] = None) -> dict:
+    page = await _leaves_client().get_leaves_rows(fyId, auth_header)
+    return rows.as_body(page, LeavesResponse, projection.parse(fields))
+
+
+async def _apply_leave_inprocess(auth_header: str, **payload) -> dict:
+    req = ApplyLeaveRequest(**payload)
+    return to_jsonable(await _leaves_client().apply_leave(req, auth_header))
+
+
+async def _apply_comp_off_inprocess(auth_header: str, **payload) -> dict:
+    req = ApplyCompOffRequest(**payload)
+    return to_jsonable(await _leaves_client().apply_comp_off(req, auth_header))
+
+
+_INPROCESS = {
+    "get_holidays": _get_holidays_inprocess,
+    "get_leaves": _get_leaves_inprocess,
+    "apply_leave": _apply_leave_inprocess,
+    "apply_comp_off": _apply_comp_off_inprocess,
+}
 
 
 # ---- Tool factory ----
@@ -46,55 +91,45 @@ def create_tool_specs(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
 ) -> List[ToolSpec]:
     """
     Create framework-agnostic tool specifications for leave APIs.
-    We call router paths like /holidays, /leaves, /leaves/apply, /leaves/apply/comp-off.
+    We call router paths like /holidays, /leaves, /leaves/apply, /leaves/apply/comp-off,
+    or the LeavesClient directly when dispatch="inprocess".
     """
     base = base_url.rstrip("/")
-    http_client = client or httpx.Client(base_url=base, timeout=30.0)
+    router = tools_base.RouterClient(base, auth_header_getter, dispatch, client, timeout=30.0)
 
-    def _get_holidays(leaveDate: date) -> dict:
+    def _get_holidays(leaveDate: date) -> RouterCall:
         year = leaveDate.year
-        r = http_client.get(
-             "/holidays",
-             params={"year": year},
-             headers={"Authorization": auth_header_getter()},
-         )
-        r.raise_for_status()
-        return r.json()
-
-    def _get_leaves(fyId: str) -> dict:
-        r = http_client.get(
+        return router.get(
+            "/holidays",
+            params={"year": year},
+        )
+
+    def _get_leaves(fyId: str, fields: Optional[List[str]] = None) -> RouterCall:
+        return router.get(
             "/leaves",
-            params={"fyId": fyId},
-            headers={"Authorization": auth_header_getter()},
+            params={"fyId": fyId, **fields_param(fields)},
         )
-        r.raise_for_status()
-        return r.json()
 
-    def _apply_leave(**payload: dict) -> dict:
+    def _apply_leave(**payload: dict) -> RouterCall:
         req = ApplyLeaveRequest(**payload)
-        r = http_client.post(
+        return router.post(
             "/leaves/apply",
             json=req.model_dump(mode="json"),  # date -> "YYYY-MM-DD"
-            headers={"Authorization": auth_header_getter()},
         )
-        r.raise_for_status()
-        return r.json()
 
-    def _apply_comp_off(**payload: dict) -> dict:
+    def _apply_comp_off(**payload: dict) -> RouterCall:
         # NOTE: comp-off has its own schema (compOffCount, workingDate, description)
         req = ApplyCompOffRequest(**payload)
-        r = http_client.post(
+        return router.post(
             "/leaves/apply/comp-off",
             json=req.model_dump(mode="json"),
-            headers={"Authorization": auth_header_getter()},
         )
-        r.raise_for_status()
-        return r.json()
 
-    return [
+    specs = [
         ToolSpec(
             name="get_holidays",
             description=(
@@ -122,18 +157,21 @@ def create_tool_specs(
             func=_apply_comp_off,
         ),
     ]
+    return tools_base.bind_dispatch(specs, router, _INPROCESS)
 
 
 def create_langchain_tools(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
 ) -> List[StructuredTool]:
     """Create LangChain StructuredTool instances for leave APIs."""
-    specs = create_tool_specs(base_url, auth_header_getter, client)
+    specs = create_tool_specs(base_url, auth_header_getter, client, dispatch)
     return [
         StructuredTool.from_function(
             func=spec.func,
+            coroutine=spec.coroutine,
             name=spec.name,
             description=spec.description,
             args_schema=spec.args_schema,
@@ -1,6 +1,7 @@
 import os
 from dotenv import load_dotenv
-import httpx
+import xmcp.cache as cache
+import xmcp.upstream as upstream
 
 from .models import FinancialYearsResponse, ProfileResponse
 
@@ -16,22 +17,37 @@ class MiscClient:
         self.timeout = timeout
 
     async def get_financial_years(self, auth_header: str) -> FinancialYearsResponse:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
+        cached = await self.get_financial_years_raw(auth_header)
+        result = FinancialYearsResponse.model_validate_json(cached.body)
+        result.dataAgeSeconds = round(cached.age, 1)
+        return result
+
+    async def get_financial_years_raw(self, auth_header: str) -> cache.Cached:
+        async def load() -> cache.Body:
+            response = await upstream.get(
                 f"{self.base_url}/payroll/employeeFinancialYears/my",
                 headers={"Authorization": auth_header},
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return FinancialYearsResponse.model_validate(response.json())
+            return cache.body(response)
+
+        return await cache.fetch("misc.financial_years", auth_header, self.base_url, load)
 
     async def get_employee_profile(
         self, employee_id: str, auth_header: str
     ) -> ProfileResponse:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
-                f"{self.base_url}/app/employees/id",
-                params={"id": employee_id},
-                headers={"Authorization": auth_header},
-            )
-            response.raise_for_status()
-            return ProfileResponse.model_validate(response.json())
+        cached = await self.get_employee_profile_raw(employee_id, auth_header)
+        return ProfileResponse.model_validate_json(cached.body)
+
+    async def get_employee_profile_raw(
+        self, employee_id: str, auth_header: str
+    ) -> cache.Cached:
+        response = await upstream.get(
+            f"{self.base_url}/app/employees/id",
+            params={"id": employee_id},
+            headers={"Authorization": auth_header},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return cache.Cached(response.content, 0.0, response.headers.get("content-type"))
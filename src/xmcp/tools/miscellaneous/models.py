@@ -19,6 +19,9 @@ class FinancialYearsResponse(BaseModel):
     statusCode: int
     statusMessage: str
     data: List[FinancialYear]
+    dataAgeSeconds: Optional[float] = Field(
+        None, description="Seconds since this data was fetched from HRMS (cached responses)"
+    )
 
 
 class ProfileResponse(BaseModel):
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, Header, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Response
 import httpx
 
+import xmcp.passthrough as passthrough
+
 from .client import MiscClient
 from .models import FinancialYearsResponse, ProfileResponse
 
@@ -15,12 +17,22 @@ async def health() -> dict[str, str]:
 
 
 @router.get("/financial-years", response_model=FinancialYearsResponse)
-async def financial_years(authorization: str = Header(...)) -> FinancialYearsResponse:
+async def financial_years(
+    response: Response, authorization: str = Header(...)
+) -> FinancialYearsResponse:
     """Retrieve financial year data for current employee."""
     try:
-        return await client.get_financial_years(authorization)
+        if passthrough.enabled("misc.financial_years"):
+            cached = await client.get_financial_years_raw(authorization)
+            return passthrough.respond(
+                "misc.financial_years", cached, FinancialYearsResponse,
+                headers={"Age": str(int(cached.age))},
+            )
+        result = await client.get_financial_years(authorization)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
+    response.headers["Age"] = str(int(result.dataAgeSeconds or 0))
+    return result
 
 
 @router.get("/employees/{employee_id}", response_model=ProfileResponse)
@@ -29,6 +41,9 @@ async def employee_profile(
 ) -> ProfileResponse:
     """Retrieve HRMS profile for the specified employee."""
     try:
+        if passthrough.enabled("misc.profile"):
+            cached = await client.get_employee_profile_raw(employee_id, authorization)
+            return passthrough.respond("misc.profile", cached, ProfileResponse)
         return await client.get_employee_profile(employee_id, authorization)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
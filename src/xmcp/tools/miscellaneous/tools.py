@@ -11,6 +11,8 @@ from pydantic import BaseModel, Field
 import xmcp.tools.base as tools_base
 
 ToolSpec = tools_base.ToolSpec
+RouterCall = tools_base.RouterCall
+to_jsonable = tools_base.to_jsonable
 
 
 class EmployeeIdInput(BaseModel):
@@ -23,37 +25,56 @@ class EmptyInput(BaseModel):
     pass
 
 
+# ---- In-process implementations (dispatch="inprocess") ----
+
+def _misc_router():
+    # Imported lazily so loopback users don't need HRMS_API_BASE_URL configured.
+    import xmcp.tools.miscellaneous.router as misc_router
+
+    return misc_router
+
+
+async def _health_inprocess(auth_header: str) -> dict:
+    return await _misc_router().health()
+
+
+async def _get_financial_years_inprocess(auth_header: str) -> dict:
+    return to_jsonable(await _misc_router().client.get_financial_years(auth_header))
+
+
+async def _get_employee_profile_inprocess(auth_header: str, employee_id: str) -> dict:
+    return to_jsonable(
+        await _misc_router().client.get_employee_profile(employee_id, auth_header)
+    )
+
+
+_INPROCESS = {
+    "health": _health_inprocess,
+    "get_financial_years": _get_financial_years_inprocess,
+    "get_employee_profile": _get_employee_profile_inprocess,
+}
+
+
 def create_tool_specs(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
 ) -> List[ToolSpec]:
     """Create tool specifications for miscellaneous APIs."""
 
-    http_client = client or httpx.Client(base_url=base_url)
+    router = tools_base.RouterClient(base_url, auth_header_getter, dispatch, client)
 
-    def _health() -> dict:
-        response = http_client.get("/health")
-        response.raise_for_status()
-        return response.json()
+    def _health() -> RouterCall:
+        return router.get("/health")
 
-    def _get_financial_years() -> dict:
-        response = http_client.get(
-            "/financial-years",
-            headers={"Authorization": auth_header_getter()},
-        )
-        response.raise_for_status()
-        return response.json()
+    def _get_financial_years() -> RouterCall:
+        return router.get("/financial-years")
 
-    def _get_employee_profile(employee_id: str) -> dict:
-        response = http_client.get(
-            f"/employees/{employee_id}",
-            headers={"Authorization": auth_header_getter()},
-        )
-        response.raise_for_status()
-        return response.json()
+    def _get_employee_profile(employee_id: str) -> RouterCall:
+        return router.get(f"/employees/{employee_id}")
 
-    return [
+    specs = [
         ToolSpec(
             name="health",
             description="Check server health status.",
@@ -73,19 +94,22 @@ def create_tool_specs(
             func=_get_employee_profile,
         ),
     ]
+    return tools_base.bind_dispatch(specs, router, _INPROCESS)
 
 
 def create_langchain_tools(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
 ) -> List[StructuredTool]:
     """Create LangChain StructuredTool instances for miscellaneous APIs."""
 
-    specs = create_tool_specs(base_url, auth_header_getter, client)
+    specs = create_tool_specs(base_url, auth_header_getter, client, dispatch)
     return [
         StructuredTool.from_function(
             func=spec.func,
+            coroutine=spec.coroutine,
             name=spec.name,
             description=spec.description,
             args_schema=spec.args_schema,
@@ -1,6 +1,8 @@
 
 import os
-import httpx
+import xmcp.codec as codec
+import xmcp.pagination as pagination
+import xmcp.upstream as upstream
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -12,21 +14,27 @@ class ReferralsClient:
         self.timeout = timeout
 
     async def search_openings(self, body: dict, auth_header: str) -> dict:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.post(f"{self.base_url}/api/v2/elastic/es/search/All_Openings", json=body, headers={"Authorization": auth_header})
-            r.raise_for_status(); return r.json()
+        client = upstream.get_client()
+        r = await client.post(f"{self.base_url}/api/v2/elastic/es/search/All_Openings", json=body, headers={"Authorization": auth_header}, timeout=self.timeout)
+        r.raise_for_status(); return codec.loads(r.content)
+
+    def iter_openings(self, body: dict, auth_header: str, max_records: int | None = None) -> pagination.PageStream:
+        """Every opening matching the search ``body``, across pages, up to ``max_records``."""
+        return pagination.PageStream(
+            lambda page: self.search_openings({**body, "page": page}, auth_header), max_records
+        )
 
     async def add_candidate(self, body: dict, auth_header: str) -> dict:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.post(f"{self.base_url}/api/v2/hr/candidates/add", json=body, headers={"Authorization": auth_header})
-            r.raise_for_status(); return r.json()
+        client = upstream.get_client()
+        r = await client.post(f"{self.base_url}/api/v2/hr/candidates/add", json=body, headers={"Authorization": auth_header}, timeout=self.timeout)
+        r.raise_for_status(); return codec.loads(r.content)
 
     async def upload_resume(self, candidate_id: str, file_tuple, auth_header: str) -> dict:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.put(f"{self.base_url}/api/v2/hr/candidates/updateProfile", params={"Id": candidate_id}, files={"file": file_tuple}, headers={"Authorization": auth_header})
-            r.raise_for_status(); return r.json()
+        client = upstream.get_client()
+        r = await client.put(f"{self.base_url}/api/v2/hr/candidates/updateProfile", params={"Id": candidate_id}, files={"file": file_tuple}, headers={"Authorization": auth_header}, timeout=self.timeout)
+        r.raise_for_status(); return codec.loads(r.content)
 
     async def create_application(self, body: dict, auth_header: str) -> dict:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            r = await client.post(f"{self.base_url}/api/v2/hr/applications", json=body, headers={"Authorization": auth_header})
-            r.raise_for_status(); return r.json()
+        client = upstream.get_client()
+        r = await client.post(f"{self.base_url}/api/v2/hr/applications", json=body, headers={"Authorization": auth_header}, timeout=self.timeout)
+        r.raise_for_status(); return codec.loads(r.content)
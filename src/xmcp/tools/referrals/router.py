@@ -1,6 +1,9 @@
 
-from fastapi import APIRouter, Header, HTTPException, UploadFile, File, Query, Body
+from fastapi import APIRouter, Header, HTTPException, UploadFile, File, Query, Body, Request
 import httpx
+import xmcp.pagination as pagination
+import xmcp.projection as projection
+import xmcp.streaming as streaming
 from .client import ReferralsClient
 
 router = APIRouter(prefix="/api/v2")
@@ -8,9 +11,26 @@ router = APIRouter(prefix="/api/v2")
 client = ReferralsClient()
 
 @router.post("/elastic/es/search/All_Openings")
-async def search_openings(body: dict = Body(...), authorization: str = Header(...)) -> dict:
+async def search_openings(
+    request: Request,
+    body: dict = Body(...),
+    allPages: bool = Query(False, description="Fetch and merge every page"),
+    maxRecords: int | None = Query(None, ge=1, description="Stop after this many rows (allPages)"),
+    fields: str | None = Query(None, description="Comma-separated row fields to return"),
+    authorization: str = Header(...),
+) -> dict:
     try:
-        return await client.search_openings(body, authorization)
+        selected = projection.parse(fields)
+        if allPages:
+            stream = client.iter_openings(body, authorization, maxRecords)
+            if streaming.wants_ndjson(request):
+                return await streaming.ndjson_response(projection.stream(stream, selected), stream.meta)
+            return projection.project(await pagination.collect(stream), selected)
+        result = await client.search_openings(body, authorization)
+        if streaming.wants_ndjson(request):
+            rows, meta = streaming.split_body(result)
+            return await streaming.ndjson_response(projection.rows(rows, selected), lambda: meta)
+        return projection.project(result, selected)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
@@ -24,8 +44,8 @@ async def add_candidate(body: dict = Body(...), authorization: str = Header(...)
 @router.put("/hr/candidates/updateProfile")
 async def upload_resume(Id: str = Query(...), file: UploadFile = File(...), authorization: str = Header(...)) -> dict:
     try:
-        content = await file.read()
-        return await client.upload_resume(Id, (file.filename, content, file.content_type or "application/octet-stream"), authorization)
+        # Hand httpx the spooled file so it is streamed to HRMS in chunks
+        return await client.upload_resume(Id, (file.filename, file.file, file.content_type or "application/octet-stream"), authorization)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
 
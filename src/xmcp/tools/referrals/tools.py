@@ -4,14 +4,21 @@ from typing import Callable, List, Optional, Dict, Any
 import httpx
 from pydantic import BaseModel, Field
 from langchain_core.tools import StructuredTool
+import xmcp.pagination as pagination
+import xmcp.projection as projection
 import xmcp.tools.base as tools_base
 
 ToolSpec = tools_base.ToolSpec
+RouterCall = tools_base.RouterCall
+fields_param = tools_base.fields_param
 
 class OpeningsToolInput(BaseModel):
     page: int = 1
     pageSize: int = 10
     filters: List[Dict[str, Any]] = Field(default_factory=list)
+    allPages: bool = Field(False, description="Fetch every page and merge the rows (ignores page)")
+    maxRecords: Optional[int] = Field(None, ge=1, description="With allPages, stop after this many rows")
+    fields: Optional[List[str]] = Field(None, description="Only return these fields of each opening; omit for every field")
 
 class CandidatePayload(BaseModel):
     payload: Dict[str, Any]
@@ -23,35 +30,66 @@ class UploadResumeInput(BaseModel):
     candidate_id: str
     file_path: str
 
-def create_tool_specs(base_url: str, auth_header_getter: Callable[[], str], client: Optional[httpx.Client] = None) -> List[ToolSpec]:
-    http_client = client or httpx.Client(base_url=base_url, timeout=20.0)
+# ---- In-process implementations (dispatch="inprocess") ----
 
-    def _search_openings(page: int = 1, pageSize: int = 10, filters: List[Dict[str, Any]] = None) -> dict:
+def _referrals_client():
+    import xmcp.tools.referrals.router as referrals_router
+    return referrals_router.client
+
+async def _search_openings_inprocess(auth_header: str, page: int = 1, pageSize: int = 10, filters: List[Dict[str, Any]] = None, allPages: bool = False, maxRecords: Optional[int] = None, fields: Optional[List[str]] = None) -> dict:
+    body = {"name": "All_Openings", "index": "openings", "page": page, "pageSize": pageSize, "filters": filters or []}
+    if allPages:
+        result = await pagination.collect(_referrals_client().iter_openings(body, auth_header, maxRecords))
+    else:
+        result = await _referrals_client().search_openings(body, auth_header)
+    return projection.project(result, projection.parse(fields))
+
+async def _add_candidate_inprocess(auth_header: str, payload: dict) -> dict:
+    return await _referrals_client().add_candidate(payload, auth_header)
+
+async def _upload_candidate_resume_inprocess(auth_header: str, candidate_id: str, file_path: str) -> dict:
+    with open(file_path, "rb") as f:
+        file_tuple = (file_path.split("/")[-1], f, "application/octet-stream")
+        return await _referrals_client().upload_resume(candidate_id, file_tuple, auth_header)
+
+async def _create_application_inprocess(auth_header: str, payload: dict) -> dict:
+    return await _referrals_client().create_application(payload, auth_header)
+
+_INPROCESS = {
+    "search_openings": _search_openings_inprocess,
+    "add_candidate": _add_candidate_inprocess,
+    "upload_candidate_resume": _upload_candidate_resume_inprocess,
+    "create_application": _create_application_inprocess,
+}
+
+def create_tool_specs(base_url: str, auth_header_getter: Callable[[], str], client: Optional[httpx.Client] = None, dispatch: str = tools_base.DISPATCH_LOOPBACK) -> List[ToolSpec]:
+    router = tools_base.RouterClient(base_url, auth_header_getter, dispatch, client, timeout=20.0)
+
+    def _search_openings(page: int = 1, pageSize: int = 10, filters: List[Dict[str, Any]] = None, allPages: bool = False, maxRecords: Optional[int] = None, fields: Optional[List[str]] = None) -> RouterCall:
         body = {"name": "All_Openings", "index": "openings", "page": page, "pageSize": pageSize, "filters": filters or []}
-        r = http_client.post("/api/v2/elastic/es/search/All_Openings", json=body, headers={"Authorization": auth_header_getter()})
-        r.raise_for_status(); return r.json()
+        params = {"allPages": True, **({"maxRecords": maxRecords} if maxRecords else {})} if allPages else {}
+        params = {**params, **fields_param(fields)} or None
+        return router.post("/api/v2/elastic/es/search/All_Openings", json=body, params=params)
 
-    def _add_candidate(payload: dict) -> dict:
-        r = http_client.post("/api/v2/hr/candidates/add", json=payload, headers={"Authorization": auth_header_getter()})
-        r.raise_for_status(); return r.json()
+    def _add_candidate(payload: dict) -> RouterCall:
+        return router.post("/api/v2/hr/candidates/add", json=payload)
 
-    def _upload_candidate_resume(candidate_id: str, file_path: str) -> dict:
-        with open(file_path, "rb") as f:
-            files = {"file": (file_path.split("/")[-1], f, "application/octet-stream")}
-            r = http_client.put(f"/api/v2/hr/candidates/updateProfile", params={"Id": candidate_id}, files=files, headers={"Authorization": auth_header_getter()})
-            r.raise_for_status(); return r.json()
+    def _upload_candidate_resume(candidate_id: str, file_path: str) -> RouterCall:
+        # RouterClient closes the file once the upload is sent
+        files = {"file": (file_path.split("/")[-1], open(file_path, "rb"), "application/octet-stream")}
+        return router.put("/api/v2/hr/candidates/updateProfile", params={"Id": candidate_id}, files=files)
 
-    def _create_application(payload: dict) -> dict:
-        r = http_client.post("/api/v2/hr/applications", json=payload, headers={"Authorization": auth_header_getter()})
-        r.raise_for_status(); return r.json()
+    def _create_application(payload: dict) -> RouterCall:
+        return router.post("/api/v2/hr/applications", json=payload)
 
-    return [
+    specs = [
         ToolSpec("search_openings", "Search current job openings (ES).", OpeningsToolInput, _search_openings),
         ToolSpec("add_candidate", "Add a candidate profile.", CandidatePayload, _add_candidate),
         ToolSpec("upload_candidate_resume", "Upload a resume for candidate Id.", UploadResumeInput, _upload_candidate_resume),
         ToolSpec("create_application", "Create a job application for a candidate.", ApplicationPayload, _create_application),
     ]
+    return tools_base.bind_dispatch(specs, router, _INPROCESS)
 
-def create_langchain_tools(base_url: str, auth_header_getter: Callable[[], str], client: Optional[httpx.Client] = None):
-    specs = create_tool_specs(base_url, auth_header_getter, client)
-    return [StructuredTool.from_function(func=s.func, name=s.name, description=s.description, args_schema=s.args_schema) for s in specs]
+def create_langchain_tools(base_url: str, auth_header_getter: Callable[[], str], client: Optional[httpx.Client] = None, dispatch: str = tools_base.DISPATCH_LOOPBACK):
+    specs = create_tool_specs(base_url, auth_header_getter, client, dispatch)
+    return [StructuredTool.from_function(func=s.func, coroutine=s.coroutine, name=s.name, description=s.description, args_schema=s.args_schema) for s in specs]
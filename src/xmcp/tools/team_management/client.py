@@ -1,6 +1,8 @@
 import os
 from dotenv import load_dotenv
-import httpx
+import xmcp.cache as cache
+import xmcp.rows as rows
+import xmcp.upstream as upstream
 
 from .models import TeamLedgerResponse
 
@@ -18,12 +20,33 @@ class TeamManagementClient:
     async def get_team_ledger(
         self, emp_id: str, fy: str, auth_header: str
     ) -> TeamLedgerResponse:
+        cached = await self.get_team_ledger_raw(emp_id, fy, auth_header)
+        result = TeamLedgerResponse.model_validate_json(cached.body)
+        result.dataAgeSeconds = round(cached.age, 1)
+        return result
+
+    async def get_team_ledger_rows(
+        self, emp_id: str, fy: str, auth_header: str
+    ) -> rows.Page:
+        """The ledger as compact :class:`xmcp.rows.LedgerRow` rows."""
+        cached = await self.get_team_ledger_raw(emp_id, fy, auth_header)
+        page = rows.decode_page(cached.body, rows.LedgerRow)
+        page.meta["dataAgeSeconds"] = round(cached.age, 1)
+        return page
+
+    async def get_team_ledger_raw(
+        self, emp_id: str, fy: str, auth_header: str
+    ) -> cache.Cached:
         params = {"empId": emp_id, "fy": fy}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
+
+        async def load() -> cache.Body:
+            response = await upstream.get(
                 f"{self.base_url}/attendance/leaves/my-team-ledger",
                 params=params,
                 headers={"Authorization": auth_header},
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return TeamLedgerResponse.model_validate(response.json())
+            return cache.body(response)
+
+        return await cache.fetch("team.ledger", auth_header, (self.base_url, emp_id, fy), load)
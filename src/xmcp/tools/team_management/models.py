@@ -41,3 +41,6 @@ class TeamLedgerResponse(BaseModel):
     statusMessage: str
     data: List[LedgerEntry]
     leaveBalance: LeaveBalance
+    dataAgeSeconds: Optional[float] = Field(
+        None, description="Seconds since this data was fetched from HRMS (cached responses)"
+    )
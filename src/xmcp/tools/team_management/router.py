@@ -1,6 +1,13 @@
-from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Request, Response
 import httpx
 
+import xmcp.codec as codec
+
+import xmcp.passthrough as passthrough
+import xmcp.projection as projection
+import xmcp.rows as rows
+import xmcp.streaming as streaming
+
 from .client import TeamManagementClient
 from .models import TeamLedgerResponse
 
@@ -10,12 +17,34 @@ client = TeamManagementClient()
 
 @router.get("/ledger", response_model=TeamLedgerResponse)
 async def team_ledger(
+    request: Request,
+    response: Response,
     empId: str = Query(...),
     fy: str = Query(...),
+    fields: str | None = Query(None, description="Comma-separated row fields to return, e.g. leaveDate,status"),
     authorization: str = Header(...),
 ) -> TeamLedgerResponse:
     """Retrieve leave/comp-off ledger for a team member."""
     try:
-        return await client.get_team_ledger(empId, fy, authorization)
+        selected = projection.parse(fields)
+        if selected or streaming.wants_ndjson(request):
+            page = await client.get_team_ledger_rows(empId, fy, authorization)
+            age = str(int(page.meta["dataAgeSeconds"] or 0))
+            if not streaming.wants_ndjson(request):
+                return codec.JSONResponse(
+                    rows.as_body(page, TeamLedgerResponse, selected), headers={"Age": age}
+                )
+            streamed = await streaming.ndjson_page(page, TeamLedgerResponse, selected)
+            streamed.headers["Age"] = age
+            return streamed
+        if passthrough.enabled("team.ledger"):
+            cached = await client.get_team_ledger_raw(empId, fy, authorization)
+            return passthrough.respond(
+                "team.ledger", cached, TeamLedgerResponse,
+                headers={"Age": str(int(cached.age))},
+            )
+        result = await client.get_team_ledger(empId, fy, authorization)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
+    response.headers["Age"] = str(int(result.dataAgeSeconds or 0))
+    return result
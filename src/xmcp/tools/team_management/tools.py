@@ -8,35 +8,63 @@ import httpx
 from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
 
+import xmcp.projection as projection
+import xmcp.rows as rows
 import xmcp.tools.base as tools_base
+import xmcp.tools.team_management.models as team_models
 
 ToolSpec = tools_base.ToolSpec
+RouterCall = tools_base.RouterCall
+fields_param = tools_base.fields_param
+TeamLedgerResponse = team_models.TeamLedgerResponse
 
 
 class TeamLedgerInput(BaseModel):
     empId: str = Field(..., description="Employee identifier of team member")
     fy: str = Field(..., description="Financial year range, e.g. 2025-2026")
+    fields: Optional[List[str]] = Field(
+        None, description="Only return these row fields, e.g. ['leaveDate', 'type', 'leaveCount']; omit for every field"
+    )
+
+
+# ---- In-process implementations (dispatch="inprocess") ----
+
+def _team_client():
+    # Imported lazily so loopback users don't need HRMS_API_BASE_URL configured.
+    import xmcp.tools.team_management.router as team_router
+
+    return team_router.client
+
+
+async def _get_team_ledger_inprocess(
+    auth_header: str, empId: str, fy: str, fields: Optional[List[str]] = None
+) -> dict:
+    page = await _team_client().get_team_ledger_rows(empId, fy, auth_header)
+    return rows.as_body(page, TeamLedgerResponse, projection.parse(fields))
+
+
+_INPROCESS = {
+    "get_team_ledger": _get_team_ledger_inprocess,
+}
 
 
 def create_tool_specs(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
 ) -> List[ToolSpec]:
     """Create tool specifications for team management APIs."""
 
-    http_client = client or httpx.Client(base_url=base_url)
+    router = tools_base.RouterClient(base_url, auth_header_getter, dispatch, client)
 
-    def _get_team_ledger(empId: str, fy: str) -> dict:
-        response = http_client.get(
+    def _get_team_ledger(empId: str, fy: str, fields: Optional[List[str]] = None) -> RouterCall:
+        return router.get(
             "/team-management/ledger",
-            params={"empId": empId, "fy": fy},
-            headers={"Authorization": auth_header_getter()},
+            params={"empId": empId, "fy": fy, **fields_param(fields)},
         )
-        response.raise_for_status()
-        return response.json()
 
-    return [
+    specs = [
         ToolSpec(
             name="get_team_ledger",
             description="Fetch leave/comp-off ledger for a team member.",
@@ -44,19 +72,22 @@ def create_tool_specs(
             func=_get_team_ledger,
         )
     ]
+    return tools_base.bind_dispatch(specs, router, _INPROCESS)
 
 
 def create_langchain_tools(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
 ) -> List[StructuredTool]:
     """Create LangChain StructuredTool instances for team management APIs."""
 
-    specs = create_tool_specs(base_url, auth_header_getter, client)
+    specs = create_tool_specs(base_url, auth_header_getter, client, dispatch)
     return [
         StructuredTool.from_function(
             func=spec.func,
+            coroutine=spec.coroutine,
             name=spec.name,
             description=spec.description,
             args_schema=spec.args_schema,
@@ -1,6 +1,9 @@
 import os
 from dotenv import load_dotenv
-import httpx
+import xmcp.cache as cache
+import xmcp.pagination as pagination
+import xmcp.rows as rows
+import xmcp.upstream as upstream
 
 from .models import TicketsResponse, TicketOperationResponse
 
@@ -19,40 +22,76 @@ class TicketsClient:
         self, emp_id: str, status: str, page: int, auth_header: str
     ) -> TicketsResponse:
         """Retrieve tickets for the authenticated employee."""
+        cached = await self.get_my_tickets_raw(emp_id, status, page, auth_header)
+        return TicketsResponse.model_validate_json(cached.body)
 
+    async def get_my_tickets_rows(
+        self, emp_id: str, status: str, page: int, auth_header: str
+    ) -> rows.Page:
+        """One page of tickets as compact :class:`xmcp.rows.TicketRow` rows."""
+        cached = await self.get_my_tickets_raw(emp_id, status, page, auth_header)
+        return rows.decode_page(cached.body, rows.TicketRow)
+
+    async def get_my_tickets_raw(
+        self, emp_id: str, status: str, page: int, auth_header: str
+    ) -> cache.Cached:
+        """One page of the HRMS tickets body, unparsed."""
         params = {"id": emp_id, "status": status, "page": page}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(
+
+        async def load() -> cache.Body:
+            response = await upstream.get(
                 f"{self.base_url}/ticket-asset/tickets/my/tickets",
                 params=params,
                 headers={"Authorization": auth_header},
+                timeout=self.timeout,
             )
             response.raise_for_status()
-            return TicketsResponse.model_validate(response.json())
+            return cache.body(response)
+
+        return await cache.fetch(
+            "tickets.list", auth_header, (self.base_url, emp_id, status, page), load
+        )
+
+    def iter_my_tickets(
+        self, emp_id: str, status: str, auth_header: str, max_records: int | None = None
+    ) -> pagination.PageStream:
+        """Every ticket matching ``status``, across pages, up to ``max_records``.
+
+        Rows are dumped from :class:`xmcp.rows.TicketRow`, as on the single-page path.
+        """
+        async def fetch_page(page: int) -> dict:
+            page_rows = await self.get_my_tickets_rows(emp_id, status, page, auth_header)
+            return {**page_rows.meta, "data": [rows.dump(row) for row in page_rows.rows]}
+
+        return pagination.PageStream(fetch_page, max_records)
 
     async def raise_ticket(
         self, auth_header: str, form_data: dict | None = None
     ) -> TicketOperationResponse:
         """Create a new ticket draft."""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/ticket-asset/tickets/employee",
-                data=form_data or {},
-                headers={"Authorization": auth_header},
-            )
-            response.raise_for_status()
-            return TicketOperationResponse.model_validate(response.json())
+        client = upstream.get_client()
+        response = await client.post(
+            f"{self.base_url}/ticket-asset/tickets/employee",
+            data=form_data or {},
+            headers={"Authorization": auth_header},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        await cache.invalidate("tickets.raise_ticket", auth_header)
+        return TicketOperationResponse.model_validate_json(response.content)
 
     async def submit_ticket(
         self, ticket_id: str, auth_header: str
     ) -> TicketOperationResponse:
         """Submit a draft ticket."""
         params = {"id": ticket_id}
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(
-                f"{self.base_url}/ticket-asset/tickets/submit",
-                params=params,
-                headers={"Authorization": auth_header},
-            )
-            response.raise_for_status()
-            return TicketOperationResponse.model_validate(response.json())
+        client = upstream.get_client()
+        response = await client.post(
+            f"{self.base_url}/ticket-asset/tickets/submit",
+            params=params,
+            headers={"Authorization": auth_header},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        await cache.invalidate("tickets.submit_ticket", auth_header)
+        return TicketOperationResponse.model_validate_json(response.content)
@@ -1,6 +1,10 @@
-from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query, Request
 import httpx
 
+import xmcp.pagination as pagination
+import xmcp.passthrough as passthrough
+import xmcp.streaming as streaming
+
 from .client import TicketsClient
 from .models import TicketOperationResponse, TicketsResponse
 
@@ -10,13 +14,27 @@ client = TicketsClient()
 
 @router.get("/my", response_model=TicketsResponse)
 async def my_tickets(
+    request: Request,
     id: str = Query(...),
     status: str = Query(...),
     page: int = Query(1, ge=1),
+    allPages: bool = Query(False, description="Fetch and merge every page"),
+    maxRecords: int | None = Query(None, ge=1, description="Stop after this many rows (allPages)"),
     authorization: str = Header(...),
 ) -> TicketsResponse:
     """Retrieve tickets for the authenticated employee."""
     try:
+        if allPages:
+            stream = client.iter_my_tickets(id, status, authorization, maxRecords)
+            if streaming.wants_ndjson(request):
+                return await streaming.ndjson_response(stream, stream.meta)
+            return TicketsResponse.model_validate(await pagination.collect(stream))
+        if passthrough.enabled("tickets.list") and not streaming.wants_ndjson(request):
+            cached = await client.get_my_tickets_raw(id, status, page, authorization)
+            return passthrough.respond("tickets.list", cached, TicketsResponse)
+        if streaming.wants_ndjson(request):
+            page_rows = await client.get_my_tickets_rows(id, status, page, authorization)
+            return await streaming.ndjson_page(page_rows, TicketsResponse)
         return await client.get_my_tickets(id, status, page, authorization)
     except httpx.HTTPError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
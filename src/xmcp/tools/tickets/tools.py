@@ -8,15 +8,23 @@ import httpx
 from langchain_core.tools import StructuredTool
 from pydantic import BaseModel, Field
 
+import xmcp.pagination as pagination
+import xmcp.rows as rows
 import xmcp.tools.base as tools_base
+import xmcp.tools.tickets.models as tickets_models
 
 ToolSpec = tools_base.ToolSpec
+RouterCall = tools_base.RouterCall
+to_jsonable = tools_base.to_jsonable
+TicketsResponse = tickets_models.TicketsResponse
 
 
 class TicketsInput(BaseModel):
     id: str = Field(..., description="Employee identifier")
     status: str = Field(..., description="Ticket status to filter")
     page: int = Field(1, description="Page number", ge=1)
+    allPages: bool = Field(False, description="Fetch every page and merge the rows (ignores page)")
+    maxRecords: Optional[int] = Field(None, ge=1, description="With allPages, stop after this many rows")
 
 
 class SubmitTicketInput(BaseModel):
@@ -31,42 +39,74 @@ class EmptyInput(BaseModel):
     pass
 
 
+# ---- In-process implementations (dispatch="inprocess") ----
+
+def _tickets_client():
+    # Imported lazily so loopback users don't need HRMS_API_BASE_URL configured.
+    import xmcp.tools.tickets.router as tickets_router
+
+    return tickets_router.client
+
+
+async def _get_tickets_inprocess(
+    auth_header: str,
+    id: str,
+    status: str,
+    page: int = 1,
+    allPages: bool = False,
+    maxRecords: Optional[int] = None,
+) -> dict:
+    if allPages:
+        # Shaped by the model like the router's response, so every dispatch returns the same rows
+        merged = await pagination.collect(_tickets_client().iter_my_tickets(id, status, auth_header, maxRecords))
+        return to_jsonable(TicketsResponse.model_validate(merged))
+    tickets = await _tickets_client().get_my_tickets_rows(id, status, page, auth_header)
+    return rows.as_body(tickets, TicketsResponse)
+
+
+async def _raise_ticket_inprocess(auth_header: str) -> dict:
+    return to_jsonable(await _tickets_client().raise_ticket(auth_header))
+
+
+async def _submit_ticket_inprocess(auth_header: str, id: str) -> dict:
+    return to_jsonable(await _tickets_client().submit_ticket(id, auth_header))
+
+
+_INPROCESS = {
+    "get_tickets": _get_tickets_inprocess,
+    "raise_ticket": _raise_ticket_inprocess,
+    "submit_ticket": _submit_ticket_inprocess,
+}
+
+
 def create_tool_specs(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
 ) -> List[ToolSpec]:
     """Create tool specifications for ticket APIs."""
 
-    http_client = client or httpx.Client(base_url=base_url)
+    router = tools_base.RouterClient(base_url, auth_header_getter, dispatch, client)
 
-    def _get_tickets(id: str, status: str, page: int = 1) -> dict:
-        response = http_client.get(
-            "/tickets/my",
-            params={"id": id, "status": status, "page": page},
-            headers={"Authorization": auth_header_getter()},
-        )
-        response.raise_for_status()
-        return response.json()
+    def _get_tickets(
+        id: str, status: str, page: int = 1, allPages: bool = False, maxRecords: Optional[int] = None
+    ) -> RouterCall:
+        params = {"id": id, "status": status, "page": page}
+        if allPages:
+            params.update(allPages=True, **({"maxRecords": maxRecords} if maxRecords else {}))
+        return router.get("/tickets/my", params=params)
 
-    def _raise_ticket() -> dict:
-        response = http_client.post(
-            "/tickets/draft",
-            headers={"Authorization": auth_header_getter()},
-        )
-        response.raise_for_status()
-        return response.json()
+    def _raise_ticket() -> RouterCall:
+        return router.post("/tickets/draft")
 
-    def _submit_ticket(id: str) -> dict:
-        response = http_client.post(
+    def _submit_ticket(id: str) -> RouterCall:
+        return router.post(
             "/tickets/submit",
             params={"id": id},
-            headers={"Authorization": auth_header_getter()},
         )
-        response.raise_for_status()
-        return response.json()
 
-    return [
+    specs = [
         ToolSpec(
             name="get_tickets",
             description="Fetch tickets for the current employee.",
@@ -86,19 +126,22 @@ def create_tool_specs(
             func=_submit_ticket,
         ),
     ]
+    return tools_base.bind_dispatch(specs, router, _INPROCESS)
 
 
 def create_langchain_tools(
     base_url: str,
     auth_header_getter: Callable[[], str],
     client: Optional[httpx.Client] = None,
+    dispatch: str = tools_base.DISPATCH_LOOPBACK,
 ) -> List[StructuredTool]:
     """Create LangChain StructuredTool instances for ticket APIs."""
 
-    specs = create_tool_specs(base_url, auth_header_getter, client)
+    specs = create_tool_specs(base_url, auth_header_getter, client, dispatch)
     return [
         StructuredTool.from_function(
             func=spec.func,
+            coroutine=spec.coroutine,
             name=spec.name,
             description=spec.description,
             args_schema=spec.args_schema,
@@ -0,0 +1,448 @@
+"""Shared HTTP transport used by the domain clients to reach HRMS.
+
+All domain clients (leaves, attendance, feedback, ...) send their requests
+through :func:`get_client`, which hands out one pooled ``httpx.AsyncClient``
+per event loop.  Connections are kept alive between calls so the TCP/TLS
+handshake to HRMS is paid once per pooled connection instead of once per call.
+
+Pool sizing is configured through environment variables:
+
+- ``HRMS_MAX_CONNECTIONS`` – maximum open connections (default ``100``).
+- ``HRMS_MAX_KEEPALIVE_CONNECTIONS`` – idle connections kept open (default ``20``).
+- ``HRMS_KEEPALIVE_EXPIRY`` – seconds an idle connection is kept (default ``30``).
+- ``HRMS_HTTP2`` – enable HTTP/2 multiplexing when ``h2`` is installed (default off).
+- ``HRMS_DNS_TTL`` – seconds a resolved HRMS address is cached (default ``300``, ``0`` disables).
+- ``HRMS_COALESCE_GETS`` – share one in-flight request between identical
+  concurrent GETs from the same caller (default on); see :func:`get`.
+
+GETs are retried and hedged as described in :mod:`xmcp.resilience`; other
+methods are sent once.  Every request passes the circuit breaker and
+bulkhead of its path family (:mod:`xmcp.breaker`) and is timed for
+``/metrics`` (:mod:`xmcp.metrics`).
+
+The FastAPI app opens the client on startup and closes it on shutdown (see
+``xmcp.main``); callers outside the app get a client created on first use.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Awaitable, Dict, Iterable, List, Mapping, Optional, Tuple, TypeVar
+
+import httpcore
+import httpx
+
+import xmcp.auth_context as auth_context
+import xmcp.breaker as breaker
+import xmcp.metrics as metrics
+import xmcp.resilience as resilience
+import xmcp.singleflight as singleflight
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if not value:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class UpstreamSettings:
+    """Connection pool configuration for the shared HRMS client."""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    dns_ttl: float = 300.0
+
+    @classmethod
+    def from_env(cls) -> "UpstreamSettings":
+        return cls(
+            max_connections=_env_int("HRMS_MAX_CONNECTIONS", cls.max_connections),
+            max_keepalive_connections=_env_int(
+                "HRMS_MAX_KEEPALIVE_CONNECTIONS", cls.max_keepalive_connections
+            ),
+            keepalive_expiry=_env_float("HRMS_KEEPALIVE_EXPIRY", cls.keepalive_expiry),
+            http2=_env_bool("HRMS_HTTP2", cls.http2),
+            dns_ttl=_env_float("HRMS_DNS_TTL", cls.dns_ttl),
+        )
+
+
+class CachingResolverBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that caches DNS answers for ``ttl`` seconds.
+
+    Connections are opened against the cached IP addresses; TLS still uses
+    the original host name for SNI and certificate checks because httpcore
+    passes the origin host to ``start_tls``.
+    """
+
+    def __init__(self, ttl: float, backend: Optional[httpcore.AsyncNetworkBackend] = None) -> None:
+        self.ttl = ttl
+        self._backend = backend or httpcore.AnyIOBackend()
+        self._cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        key = (host, port)
+        cached = self._cache.get(key)
+        now = time.monotonic()
+        if cached and cached[0] > now:
+            return cached[1]
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[key] = (now + self.ttl, addresses)
+        return addresses
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable[httpcore.SOCKET_OPTION]] = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await self._resolve(host, port)
+        except OSError as exc:
+            raise httpcore.ConnectError(str(exc)) from exc
+        last_exc: Optional[Exception] = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as exc:
+                last_exc = exc
+        # Every cached address failed; resolve again on the next attempt.
+        self._cache.pop((host, port), None)
+        assert last_exc is not None
+        raise last_exc
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+# httpcore errors and the httpx errors callers catch, most specific first
+_ERRORS: Tuple[Tuple[type, type], ...] = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+def _httpx_error(exc: Exception, request: httpx.Request) -> Exception:
+    for core, mapped in _ERRORS:
+        if isinstance(exc, core):
+            return mapped(str(exc), request=request)
+    return exc
+
+
+class _ResponseStream(httpx.AsyncByteStream):
+    """A pooled response body; ``done`` runs once when it is closed."""
+
+    def __init__(self, stream: Any, request: httpx.Request, done: Any) -> None:
+        self._stream = stream
+        self._request = request
+        self._done = done
+
+    async def __aiter__(self):
+        try:
+            async for part in self._stream:
+                yield part
+        except Exception as exc:
+            mapped = _httpx_error(exc, self._request)
+            if mapped is exc:
+                raise
+            raise mapped from exc
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            self._done()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """``httpx`` transport over an ``httpcore.AsyncConnectionPool`` built here.
+
+    ``httpx.AsyncHTTPTransport`` does not take a network backend, so the pool
+    is built directly with :class:`CachingResolverBackend` when DNS caching
+    is on.  ``pool`` and ``in_flight`` (requests sent whose response is not
+    closed yet) are read by :func:`pool_stats`.
+    """
+
+    def __init__(self, settings: UpstreamSettings, http2: bool = False) -> None:
+        self.http2 = http2
+        self.in_flight = 0
+        self.pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=CachingResolverBackend(settings.dns_ttl) if settings.dns_ttl > 0 else None,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        self.in_flight += 1
+        closed = False
+
+        def done() -> None:
+            nonlocal closed
+            if not closed:
+                closed = True
+                self.in_flight -= 1
+
+        try:
+            response = await self.pool.handle_async_request(core_request)
+        except Exception as exc:
+            done()
+            mapped = _httpx_error(exc, request)
+            if mapped is exc:
+                raise
+            raise mapped from exc
+        except BaseException:
+            done()
+            raise
+        return httpx.Response(
+            status_code=response.status,
+            headers=response.headers,
+            stream=_ResponseStream(response.stream, request, done),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.pool.aclose()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_client(
+    settings: Optional[UpstreamSettings] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """Build a pooled ``httpx.AsyncClient`` for HRMS calls."""
+    settings = settings or UpstreamSettings.from_env()
+    if transport is None:
+        http2 = settings.http2
+        if http2 and not _http2_available():
+            logger.warning("HRMS_HTTP2 is set but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+        transport = PooledTransport(settings, http2=http2)
+    # Timed inside the breaker, so only requests that reach HRMS are measured
+    client = httpx.AsyncClient(
+        transport=breaker.GuardedTransport(metrics.InstrumentedTransport(transport))
+    )
+    if isinstance(transport, PooledTransport):
+        _pools[client] = transport
+    return client
+
+
+# One client per event loop: pooled connections cannot be shared across loops
+# (e.g. the app's loop and a background loop used by sync callers).
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+_transport_override: Optional[httpx.AsyncBaseTransport] = None
+# The pooled transport under each client, for pool_stats
+_pools: "weakref.WeakKeyDictionary[httpx.AsyncClient, PooledTransport]" = weakref.WeakKeyDictionary()
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared HRMS client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = create_client(transport=_transport_override)
+        _clients[loop] = client
+    return client
+
+
+def set_transport(transport: Optional[httpx.AsyncBaseTransport]) -> None:
+    """Route all HRMS calls through ``transport`` (e.g. ``httpx.MockTransport``).
+
+    Passing ``None`` restores the default pooled network transport.  Clients
+    that were already created are discarded without being closed.
+    """
+    global _transport_override
+    _transport_override = transport
+    _clients.clear()
+
+
+async def startup() -> httpx.AsyncClient:
+    """Open the shared client for the current loop (FastAPI lifespan hook)."""
+    return get_client()
+
+
+async def aclose() -> None:
+    """Close the shared client for the current loop (FastAPI lifespan hook)."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def pool_stats() -> Dict[str, int]:
+    """Connections of the shared clients' pools, and requests waiting for one.
+
+    ``waiting`` counts HTTP/1.1 requests in flight beyond the connection
+    limit (each holds a connection until its response is closed).  A pool
+    that cannot be read is skipped, so the stats endpoints keep answering.
+    """
+    out = {
+        "max_connections": UpstreamSettings.from_env().max_connections,
+        "active": 0,
+        "idle": 0,
+        "waiting": 0,
+    }
+    for client in list(_clients.values()):
+        transport = _pools.get(client)
+        if transport is None:
+            continue
+        try:
+            idle = sum(1 for connection in list(transport.pool.connections) if connection.is_idle())
+            active = len(transport.pool.connections) - idle
+            waiting = 0 if transport.http2 else max(0, transport.in_flight - out["max_connections"])
+        except Exception:
+            logger.debug("Could not read HRMS pool stats", exc_info=True)
+            continue
+        out["idle"] += idle
+        out["active"] += active
+        out["waiting"] += waiting
+    return out
+
+
+# ---- Fan-out ----
+
+T = TypeVar("T")
+
+
+async def gather_limited(calls: Iterable[Awaitable[T]], limit: int) -> List[T]:
+    """Await ``calls`` with at most ``limit`` running at once; results keep call order.
+
+    Used by range and multi-page reads so one tool call cannot flood HRMS.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(call: Awaitable[T]) -> T:
+        async with semaphore:
+            return await call
+
+    tasks = [asyncio.ensure_future(run(call)) for call in calls]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        # One call failed: don't leave the rest running against HRMS
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+# ---- Coalesced reads ----
+
+_reads = singleflight.SingleFlight()
+_read_requests = 0
+
+
+def _read_key(url: str, params: Optional[Mapping[str, Any]], headers: Optional[Mapping[str, str]]) -> tuple:
+    auth_header = (headers or {}).get("Authorization")
+    query = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return (auth_context.principal_key(auth_header), "GET", url, query)
+
+
+async def get(
+    url: str,
+    *,
+    params: Optional[Mapping[str, Any]] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    timeout: Any = httpx.USE_CLIENT_DEFAULT,
+) -> httpx.Response:
+    """GET ``url`` through the shared client, coalescing identical concurrent reads.
+
+    Calls keyed by the same (principal, method, URL, params) while one is in
+    flight share its response, so a burst of identical reads from one user
+    costs a single HRMS request.  The response body is already read, so every
+    waiter can decode it independently.  Transient failures are retried and
+    slow responses hedged (see :mod:`xmcp.resilience`).
+    """
+    global _read_requests
+    _read_requests += 1
+
+    async def _send() -> httpx.Response:
+        return await get_client().get(url, params=params, headers=headers, timeout=timeout)
+
+    async def _fetch() -> httpx.Response:
+        return await resilience.call(_send, httpx.URL(url).path)
+
+    if not _env_bool("HRMS_COALESCE_GETS", True):
+        return await _fetch()
+    return await _reads.do(_read_key(url, params, headers), _fetch)
+
+
+def coalescing_stats() -> Dict[str, int]:
+    """Counters for :func:`get`: reads requested, sent upstream, and coalesced."""
+    stats = _reads.stats()
+    return {
+        "requests": _read_requests,
+        "upstream": _read_requests - stats["coalesced"],
+        "coalesced": stats["coalesced"],
+        "inflight": stats["inflight"],
+    }
@@ -0,0 +1,44 @@
+import os
+
+os.environ.setdefault("HRMS_API_BASE_URL", "http://hrms.test")
+
+import httpx
+import pytest
+
+import xmcp.breaker as breaker
+import xmcp.cache as cache
+import xmcp.resilience as resilience
+import xmcp.upstream as upstream
+
+BASE_URL = "http://hrms.test"
+AUTH = "Bearer test-token"
+
+
+@pytest.fixture(autouse=True)
+def _isolated(monkeypatch):
+    """Fresh cache, breakers and latency samples for every test."""
+    cache.set_backend(None)
+    breaker._breakers.clear()
+    monkeypatch.setattr(resilience, "latency", resilience.LatencyTracker())
+    monkeypatch.setattr(resilience, "budget", resilience.RetryBudget(0.2, 1.0))
+    yield
+    upstream.set_transport(None)
+    cache.set_backend(None)
+    breaker._breakers.clear()
+
+
+@pytest.fixture
+def hrms():
+    """Route HRMS calls to a handler: ``hrms(handler)`` returns the list of requests seen."""
+
+    def install(handler):
+        seen = []
+
+        def record(request: httpx.Request) -> httpx.Response:
+            seen.append(request)
+            return handler(request)
+
+        upstream.set_transport(httpx.MockTransport(record))
+        return seen
+
+    return install
@@ -0,0 +1,48 @@
+import asyncio
+
+import httpx
+import pytest
+
+import xmcp.admission as admission
+import xmcp.main as main
+import xmcp.ratelimit as ratelimit
+
+
+def _limit() -> admission.AdaptiveLimit:
+    return admission.AdaptiveLimit(
+        initial=10, minimum=2, maximum=20, max_latency=1.0, tolerance=3.0, backoff=0.5, cooldown=0.0
+    )
+
+
+def test_rate_limiter_wraps_admission_control():
+    order = [middleware.cls for middleware in main.app.user_middleware]
+    assert order.index(ratelimit.RateLimitMiddleware) < order.index(admission.AdmissionMiddleware)
+
+
+def test_only_slow_requests_cut_the_limit():
+    limit = _limit()
+    for seconds, failed in [(0.01, True), (0.01, False), (2.0, True)]:
+        assert limit.admit(heavy=False)
+        limit.done("/leaves", seconds, failed, heavy=False, busy=0)
+    assert limit.limit == 5
+    assert limit.decreases == 1
+
+
+@pytest.mark.parametrize("status", [500, 502, 503])
+def test_upstream_errors_leave_the_limit_alone(monkeypatch, status):
+    limit = _limit()
+    monkeypatch.setattr(admission, "controller", limit)
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=admission.AdmissionMiddleware(app))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            for _ in range(5):
+                assert (await client.get("/leaves")).status_code == status
+
+    asyncio.run(scenario())
+    assert limit.limit == 10
+    assert limit.inflight == 0
@@ -0,0 +1,33 @@
+import httpx
+from fastapi.testclient import TestClient
+
+import xmcp.main as main
+from conftest import AUTH
+
+
+def _range(start: str, end: str) -> httpx.Response:
+    return TestClient(main.app).get(
+        "/attendance/my-attendance/range",
+        params={"startDate": start, "endDate": end},
+        headers={"Authorization": AUTH},
+    )
+
+
+def test_reversed_range_is_rejected(hrms):
+    seen = hrms(lambda request: httpx.Response(500))
+    response = _range("2025-03-10", "2025-03-01")
+    assert response.status_code == 422
+    assert "endDate" in response.json()["detail"]
+    assert seen == []
+
+
+def test_too_long_range_is_rejected(hrms):
+    hrms(lambda request: httpx.Response(500))
+    assert _range("2023-01-01", "2025-01-01").status_code == 422
+
+
+def test_rows_hrms_no_longer_matches_are_a_bad_gateway(hrms):
+    # A row without its "Id" field
+    row = {"attendanceDate": "2025-03-03", "createdAt": "2025-03-03T09:00:00Z", "updatedAt": "2025-03-03T09:00:00Z"}
+    hrms(lambda request: httpx.Response(200, json={"statusCode": 200, "statusMessage": "OK", "data": [row]}))
+    assert _range("2025-03-01", "2025-03-10").status_code == 502
@@ -0,0 +1,308 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import xmcp.cache as cache
+import xmcp.cache_backends as cache_backends
+import xmcp.main as main
+import xmcp.tools.leaves.client as leaves_client
+import xmcp.tools.leaves.models as leaves_models
+from conftest import AUTH, BASE_URL
+
+
+def _leave(count: float) -> dict:
+    return {
+        "Id": "leave-1",
+        "category": "Casual",
+        "type": "Debit",
+        "status": "Approved",
+        "leaveDate": "2025-06-02",
+        "leaveCount": count,
+        "appliedDate": "2025-05-30",
+        "employeeId": "emp-1",
+        "employeeFinancialYearId": "efy-7c1d",
+        "createdAt": "2025-05-30T10:00:00Z",
+        "updatedAt": "2025-05-30T10:00:00Z",
+    }
+
+
+def test_applying_leave_refreshes_leaves_read_by_fy_id(hrms):
+    # Reads are keyed by the caller's "2025-26"; the write reports the
+    # employee-financial-year record id instead
+    balance = {"count": 1.0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/my-leaves"):
+            assert request.url.params["fyId"] == "2025-26"
+            return httpx.Response(
+                200, json={"statusCode": 200, "statusMessage": "OK", "data": [_leave(balance["count"])]}
+            )
+        balance["count"] += 1
+        return httpx.Response(
+            200, json={"statusCode": 200, "statusMessage": "Applied", "data": _leave(1.0)}
+        )
+
+    seen = hrms(handler)
+    client = leaves_client.LeavesClient(base_url=BASE_URL)
+
+    async def scenario():
+        first = await client.get_leaves("2025-26", AUTH)
+        again = await client.get_leaves("2025-26", AUTH)
+        await client.apply_leave(
+            leaves_models.ApplyLeaveRequest(leaveCount=1, leaveDate="2025-06-09"), AUTH
+        )
+        after = await client.get_leaves("2025-26", AUTH)
+        return first, again, after
+
+    first, again, after = asyncio.run(scenario())
+    assert first.data[0].leaveCount == again.data[0].leaveCount == 1.0
+    assert after.data[0].leaveCount == 2.0
+    reads = [request for request in seen if request.method == "GET"]
+    assert len(reads) == 2
+    assert json.loads(seen[1].content)["leaveDate"] == "2025-06-09"
+
+
+
+def test_accepted_leave_with_unexpected_response_still_refreshes_leaves(hrms):
+    balance = {"count": 1.0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(
+                200, json={"statusCode": 200, "statusMessage": "OK", "data": [_leave(balance["count"])]}
+            )
+        balance["count"] += 1
+        return httpx.Response(200, json={"status": "applied"})
+
+    hrms(handler)
+    client = leaves_client.LeavesClient(base_url=BASE_URL)
+
+    async def scenario():
+        await client.get_leaves("2025-26", AUTH)
+        with pytest.raises(ValueError):
+            await client.apply_leave(
+                leaves_models.ApplyLeaveRequest(leaveCount=1, leaveDate="2025-06-09"), AUTH
+            )
+        return await client.get_leaves("2025-26", AUTH)
+
+    assert asyncio.run(scenario()).data[0].leaveCount == 2.0
+
+
+WRITES = [(write, stale) for write, stales in sorted(cache.INVALIDATES.items()) for stale in stales]
+
+
+@pytest.mark.parametrize("write, stale", WRITES, ids=[f"{w}->{s.endpoint}" for w, s in WRITES])
+def test_write_makes_its_reads_stale(write, stale):
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return b'{"data": %d}' % len(loads)
+
+    async def read(partition):
+        return await cache.cached(stale.endpoint, AUTH, "k", load, partition=partition)
+
+    async def scenario():
+        before = await read((2025, 6))
+        other = await read((2025, 7))
+        await cache.invalidate(write, AUTH, (2025, 6))
+        return before, await read((2025, 6)), other, await read((2025, 7))
+
+    before, after, other, other_after = asyncio.run(scenario())
+    assert before != after
+    # Only a partitioned read keeps the slices the write did not touch
+    assert (other == other_after) is stale.partitioned
+
+
+def test_every_write_invalidates_its_reads(hrms, monkeypatch):
+    import xmcp.tools.attendance.client as attendance_client
+    import xmcp.tools.feedback.client as feedback_client
+    import xmcp.tools.feedback.models as feedback_models
+    import xmcp.tools.tickets.client as tickets_client
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        data = _leave(1.0) if "/attendance/leaves/" in request.url.path else {}
+        return httpx.Response(200, json={"statusCode": 200, "statusMessage": "OK", "data": data})
+
+    hrms(handler)
+    invalidated = []
+
+    async def record(operation, auth_header, partition=None):
+        invalidated.append((operation, partition))
+
+    monkeypatch.setattr(cache, "invalidate", record)
+    leaves = leaves_client.LeavesClient(base_url=BASE_URL)
+    attendance = attendance_client.AttendanceClient(base_url=BASE_URL)
+    tickets = tickets_client.TicketsClient(base_url=BASE_URL)
+    feedback = feedback_client.FeedbackClient(base_url=BASE_URL)
+
+    async def scenario():
+        await leaves.apply_leave(leaves_models.ApplyLeaveRequest(leaveCount=1, leaveDate="2025-06-09"), AUTH)
+        await leaves.apply_comp_off(
+            leaves_models.ApplyCompOffRequest(
+                type="Credit", category="Comp-Off", compOffCount=1, workingDate="2025-06-07",
+                description="Release", status="Pending Approval",
+            ),
+            AUTH,
+        )
+        await attendance.apply_leave({"leaveCount": 1, "leaveDate": "2025-06-09"}, AUTH)
+        await attendance.submit_arr("emp-1", {"attendanceDate": "2025-06-03"}, AUTH)
+        await feedback.add_feedback(
+            feedback_models.AddFeedbackRequest(
+                nextFollowUpDate="2025-07-01", employeeId="emp-2", description="Good", outcome="Positive",
+                stars=5, type="General", year=2025, month=6,
+            ),
+            AUTH,
+        )
+        await tickets.raise_ticket(AUTH, {"title": "Laptop"})
+        await tickets.submit_ticket("ticket-1", AUTH)
+
+    asyncio.run(scenario())
+    assert sorted(operation for operation, _ in invalidated) == sorted(cache.INVALIDATES)
+    assert ("attendance.submit_arr", (2025, 6)) in invalidated
+
+
+def _counting_load():
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return b'{"data": %d}' % len(loads)
+
+    return loads, load
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    monkeypatch.setitem(cache.POLICIES, "feedback.levels", cache.CachePolicy(ttl=0.05, shared=False))
+    loads, load = _counting_load()
+
+    async def scenario():
+        first = await cache.cached("feedback.levels", AUTH, "k", load)
+        again = await cache.cached("feedback.levels", AUTH, "k", load)
+        await asyncio.sleep(0.06)
+        return first, again, await cache.cached("feedback.levels", AUTH, "k", load)
+
+    assert asyncio.run(scenario()) == (b'{"data": 1}', b'{"data": 1}', b'{"data": 2}')
+
+
+def test_memory_backend_evicts_least_recently_used():
+    async def scenario():
+        backend = cache_backends.MemoryBackend(max_bytes=1 << 20, max_entries=2)
+        await backend.set("a", b"1", 60)
+        await backend.set("b", b"2", 60)
+        await backend.get("a")
+        await backend.set("c", b"3", 60)
+        return backend, [await backend.get(key) for key in "abc"]
+
+    backend, values = asyncio.run(scenario())
+    assert values == [b"1", None, b"3"]
+    assert backend.evictions == 1
+
+
+def test_memory_backend_keeps_within_its_byte_cap():
+    async def scenario():
+        backend = cache_backends.MemoryBackend(max_bytes=10, max_entries=100)
+        await backend.set("a", b"x" * 6, 60)
+        await backend.set("b", b"y" * 6, 60)
+        await backend.set("huge", b"z" * 11, 60)
+        return backend, [await backend.get(key) for key in ("a", "b", "huge")]
+
+    backend, values = asyncio.run(scenario())
+    assert values == [None, b"y" * 6, None]
+    assert backend.stats()["bytes"] == 6
+
+
+def test_flush_endpoint_drops_cached_reads():
+    loads, load = _counting_load()
+    client = TestClient(main.app)
+
+    def read(endpoint):
+        return asyncio.run(cache.cached(endpoint, AUTH, "k", load))
+
+    read("feedback.levels")
+    read("tickets.list")
+    assert client.delete("/admin/cache", params={"endpoint": "feedback.levels"}).json() == {"flushed": 1}
+    read("feedback.levels")
+    read("tickets.list")
+    assert len(loads) == 3  # only feedback.levels was loaded again
+    assert client.delete("/admin/cache").json() == {"flushed": 2}
+    response = client.delete("/admin/cache", params={"endpoint": "no.such"})
+    assert response.status_code == 404
+
+
+class _Clock:
+    """Wall clock for the cache module that tests move forward by hand."""
+
+    def __init__(self):
+        self.now = 1_750_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return time.monotonic()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = _Clock()
+    monkeypatch.setattr(cache, "time", fake)
+    return fake
+
+
+def test_stale_entry_is_served_while_one_caller_refreshes_it(clock, monkeypatch):
+    monkeypatch.setitem(cache.POLICIES, "team.ledger", cache.CachePolicy(ttl=600, stale_grace=3600))
+    loads, load = _counting_load()
+
+    async def read():
+        return await cache.fetch("team.ledger", AUTH, "k", load)
+
+    async def scenario():
+        await read()
+        clock.now += 900  # past the TTL, within the grace window
+        stale = await asyncio.gather(*(read() for _ in range(5)))
+        await asyncio.gather(*cache._refreshes)
+        return stale, await read()
+
+    stale, fresh = asyncio.run(scenario())
+    assert {(entry.body, entry.age) for entry in stale} == {(b'{"data": 1}', 900.0)}
+    assert len(loads) == 2  # one background refresh for the five stale reads
+    assert (fresh.body, fresh.age) == (b'{"data": 2}', 0.0)
+
+
+def test_entry_past_the_grace_window_is_reloaded(clock, monkeypatch):
+    monkeypatch.setitem(cache.POLICIES, "team.ledger", cache.CachePolicy(ttl=600, stale_grace=3600))
+    loads, load = _counting_load()
+
+    async def scenario():
+        await cache.fetch("team.ledger", AUTH, "k", load)
+        clock.now += 600 + 3600
+        return await cache.fetch("team.ledger", AUTH, "k", load)
+
+    refreshes = cache.refreshes
+    # The memory backend expires entries on its own clock; here the age alone decides
+    entry = asyncio.run(scenario())
+    assert (entry.body, entry.age) == (b'{"data": 2}', 0.0)
+    assert cache.refreshes == refreshes  # reloaded in line, not in the background
+
+
+def test_ledger_reports_the_age_of_cached_data(clock, hrms):
+    balance = dict.fromkeys(
+        ("leavesAccured", "leavesConsumed", "leavesRemaining", "overConsumedLeaves",
+         "compOffAccrued", "compOffConsumed", "compOffLapsed", "compOffRemaining"),
+        0,
+    )
+    hrms(lambda request: httpx.Response(
+        200, json={"statusCode": 200, "statusMessage": "OK", "data": [], "leaveBalance": balance}
+    ))
+    client = TestClient(main.app)
+    params = {"empId": "emp-2", "fy": "2025-26"}
+    first = client.get("/team-management/ledger", params=params, headers={"Authorization": AUTH})
+    clock.now += 125.5
+    later = client.get("/team-management/ledger", params=params, headers={"Authorization": AUTH})
+    assert (first.headers["Age"], first.json()["dataAgeSeconds"]) == ("0", 0.0)
+    assert (later.headers["Age"], later.json()["dataAgeSeconds"]) == ("125", 125.5)
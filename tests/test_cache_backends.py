@@ -0,0 +1,127 @@
+import asyncio
+import time
+
+import pytest
+
+import xmcp.cache as cache
+import xmcp.cache_backends as cache_backends
+from conftest import AUTH
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+def _redis(server):
+    return cache_backends.RedisBackend(client=fakeredis.aioredis.FakeRedis(server=server))
+
+
+def _fallback(server):
+    return cache_backends.FallbackBackend(
+        _redis(server), cache_backends.MemoryBackend(max_bytes=1 << 20, max_entries=100)
+    )
+
+
+def test_redis_backend_round_trip():
+    async def scenario():
+        backend = _redis(fakeredis.FakeServer())
+        await backend.set("xmcp:c:a|1", b"one", 60)
+        await backend.set("xmcp:c:b|1", b"two", 60)
+        assert await backend.get("xmcp:c:a|1") == b"one"
+        assert await backend.generations(["g1", "g2"]) == [0, 0]
+        await backend.bump("g1", 60)
+        await backend.bump("g1", 60)
+        assert await backend.generations(["g1", "g2"]) == [2, 0]
+        assert await backend.claim("refresh", 30) is True
+        assert await backend.claim("refresh", 30) is False
+        assert await backend.clear("xmcp:c:a|") == 1
+        assert await backend.get("xmcp:c:a|1") is None
+        assert await backend.get("xmcp:c:b|1") == b"two"
+
+    asyncio.run(scenario())
+
+
+def test_cache_shares_entries_and_invalidations_through_redis():
+    server = fakeredis.FakeServer()
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return b'{"data": %d}' % len(loads)
+
+    async def scenario():
+        # Two workers, each with its own backend on the same server
+        cache.set_backend(_fallback(server))
+        first = await cache.cached("leaves.my_leaves", AUTH, "k", load, partition="2025-26")
+        cache.set_backend(_fallback(server))
+        shared = await cache.cached("leaves.my_leaves", AUTH, "k", load, partition="2025-26")
+        await cache.invalidate("leaves.apply_leave", AUTH)
+        cache.set_backend(_fallback(server))
+        fresh = await cache.cached("leaves.my_leaves", AUTH, "k", load, partition="2025-26")
+        return first, shared, fresh
+
+    first, shared, fresh = asyncio.run(scenario())
+    assert first == shared == b'{"data": 1}'
+    assert fresh == b'{"data": 2}'
+
+
+def test_invalidation_during_outage_is_replayed_to_redis():
+    server = fakeredis.FakeServer()
+
+    async def scenario():
+        backend = _fallback(server)
+        await backend.set("entry", b"cached", 60)
+        server.connected = False
+        await backend.bump("g", 60)
+        assert backend.stats()["pending_invalidations"] == 1
+        assert await backend.get("entry") is None  # served from the empty local tier
+        server.connected = True
+        backend._down_until = 0.0
+        assert await backend.generations(["g"]) == [1]
+        assert backend.stats()["pending_invalidations"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_write_between_outages_reaches_the_local_tier():
+    server = fakeredis.FakeServer()
+    loads = []
+
+    async def load():
+        loads.append(1)
+        return b'{"data": %d}' % len(loads)
+
+    async def read(backend):
+        return await cache.cached("leaves.my_leaves", AUTH, "k", load, partition="2025-26")
+
+    async def scenario():
+        backend = _fallback(server)
+        cache.set_backend(backend)
+        server.connected = False
+        during_first = await read(backend)  # cached locally
+        server.connected = True
+        backend._down_until = 0.0
+        await cache.invalidate("leaves.apply_leave", AUTH)
+        server.connected = False
+        backend._down_until = 0.0
+        return during_first, await read(backend)
+
+    during_first, during_second = asyncio.run(scenario())
+    assert during_first == b'{"data": 1}'
+    assert during_second == b'{"data": 2}'
+
+
+def test_memory_generations_expire_and_are_capped():
+    async def scenario():
+        backend = cache_backends.MemoryBackend(max_bytes=1 << 20, max_entries=100, max_generations=2)
+        await backend.bump("short", 0.01)
+        await backend.bump("a", 60)
+        await backend.bump("a", 60)
+        time.sleep(0.02)
+        assert await backend.generations(["short"]) == [0]
+        await backend.bump("b", 60)
+        await backend.bump("c", 60)
+        assert backend.stats()["generations"] == 2
+        # "a" was evicted at 2; it must not read as a value entries were keyed by
+        assert (await backend.generations(["a"]))[0] > 2
+        assert await backend.generations(["b", "c"]) == [1, 1]
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+import pytest
+
+import xmcp.columnar as columnar
+
+LEAVES = [
+    {"Id": "l-1", "leaveDate": "2025-04-01", "comments": None, "createdAt": "2025-03-28T10:15:00.000Z", "approvedDate": None},
+    {"Id": "l-2", "leaveDate": "2025-04-02", "comments": None, "createdAt": "2025-03-29T08:05:30.000Z", "approvedDate": None},
+    {"Id": "l-3", "leaveDate": "2025-04-03", "comments": None, "createdAt": None, "approvedDate": None},
+]
+
+
+@pytest.mark.parametrize(
+    "result",
+    [
+        LEAVES,
+        {"statusCode": 200, "data": LEAVES, "paginate": {"totalPage": 1}},
+        {"data": []},
+        [{"count": 1, "note": "x"}, {"count": 2, "note": "2025-03-28T10:15:00Z"}],
+        {"message": "not a list"},
+    ],
+    ids=["rows", "envelope", "empty", "mixed-column", "no-rows"],
+)
+def test_decode_reverses_encode(result):
+    assert columnar.decode(columnar.encode(result)) == result
+
+
+def test_null_columns_are_sent_once_and_come_back_last():
+    encoded = columnar.encode(LEAVES)
+    assert encoded["nullColumns"] == ["comments", "approvedDate"]
+    assert encoded["columns"] == ["Id", "leaveDate", "createdAt"]
+    decoded = columnar.decode(encoded)
+    assert decoded == LEAVES
+    # Equal as dicts, but the null keys now follow the others
+    assert list(decoded[0]) == ["Id", "leaveDate", "createdAt", "comments", "approvedDate"]
+
+
+def test_timestamps_lose_the_tail_they_share():
+    encoded = columnar.encode(LEAVES)
+    # ":00.000Z" and ":30.000Z" share "0.000Z"; a null in the column does not count
+    assert encoded["suffixes"] == {"createdAt": "0.000Z"}
+    assert [row[2] for row in encoded["rows"]] == ["2025-03-28T10:15:0", "2025-03-29T08:05:3", None]
+    assert "leaveDate" not in encoded["suffixes"]  # dates have no time to shorten
+
+
+def test_timestamps_without_a_shared_tail_are_kept_whole():
+    rows = [{"at": "2025-03-28T10:15:00Z"}, {"at": "2025-03-28T10:15:00+05:30"}]
+    encoded = columnar.encode(rows)
+    assert "suffixes" not in encoded
+    assert columnar.decode(encoded) == rows
+
+
+def test_missing_keys_come_back_as_null():
+    encoded = columnar.encode([{"a": 1, "b": 2}, {"a": 3}])
+    assert columnar.decode(encoded) == [{"a": 1, "b": 2}, {"a": 3, "b": None}]
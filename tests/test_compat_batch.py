@@ -0,0 +1,107 @@
+import asyncio
+import logging
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+import xmcp.compat_rest as compat_rest
+import xmcp.cursors as cursors
+import xmcp.main as main
+import xmcp.tool_registry as tool_registry
+from conftest import AUTH
+from xmcp.tools.base import ToolSpec
+
+
+class ValueInput(BaseModel):
+    value: int
+
+
+def _spec(name, coroutine):
+    return ToolSpec(name=name, description=name, args_schema=ValueInput, func=None, coroutine=coroutine)
+
+
+@pytest.fixture
+def running(monkeypatch):
+    """Install fake tools; returns the peak number of tools seen running at once."""
+    state = {"now": 0, "peak": 0}
+
+    async def echo(value):
+        state["now"] += 1
+        state["peak"] = max(state["peak"], state["now"])
+        # Later items finish first, so order must come from the batch, not completion
+        await asyncio.sleep(0.01 * (5 - value))
+        state["now"] -= 1
+        return {"value": value}
+
+    async def upstream_error(value):
+        request = httpx.Request("GET", "http://hrms.test/app/x")
+        response = httpx.Response(404, json={"detail": "No such employee"}, request=request)
+        raise httpx.HTTPStatusError("404", request=request, response=response)
+
+    async def expired_cursor(value):
+        raise cursors.UnknownCursor("Unknown or expired cursor")
+
+    async def crash(value):
+        raise RuntimeError("password=hunter2")
+
+    registry = tool_registry.ToolRegistry([
+        _spec("echo", echo),
+        _spec("upstream_error", upstream_error),
+        _spec("expired_cursor", expired_cursor),
+        _spec("crash", crash),
+    ])
+    monkeypatch.setattr(compat_rest, "get_registry", lambda: registry)
+    monkeypatch.setattr(compat_rest, "BATCH_CONCURRENCY", 2)
+    return state
+
+
+def _batch(body):
+    return TestClient(main.app).post("/mcp-compat/batch", json=body, headers={"Authorization": AUTH})
+
+
+def test_invalid_item_rejects_the_whole_batch(running):
+    response = _batch({"items": [
+        {"name": "echo", "arguments": {"value": 1}},
+        {"name": "echo", "arguments": {"value": "one"}},
+        {"name": "missing", "arguments": {}},
+    ]})
+    assert response.status_code == 422
+    errors = response.json()["detail"]["errors"]
+    assert [(error["index"], error["status_code"]) for error in errors] == [(1, 422), (2, 404)]
+    assert running["peak"] == 0  # nothing ran
+
+
+def test_results_keep_item_order_and_concurrency_is_clamped(running):
+    items = [{"name": "echo", "arguments": {"value": value}} for value in range(5)]
+    response = _batch({"items": [{"name": "ping", "arguments": {}}] + items, "max_concurrency": 10})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0] == {"name": "ping", "result": "pong"}
+    assert [result["result"]["value"] for result in results[1:]] == list(range(5))
+    assert running["peak"] == 2
+
+
+def test_a_lower_max_concurrency_is_honoured(running):
+    items = [{"name": "echo", "arguments": {"value": value}} for value in range(3)]
+    assert _batch({"items": items, "max_concurrency": 1}).status_code == 200
+    assert running["peak"] == 1
+
+
+def test_failures_are_reported_per_item(running, caplog):
+    with caplog.at_level(logging.ERROR, logger="xmcp.compat_rest"):
+        response = _batch({"items": [
+            {"name": "upstream_error", "arguments": {"value": 1}},
+            {"name": "expired_cursor", "arguments": {"value": 1}},
+            {"name": "crash", "arguments": {"value": 1}},
+            {"name": "echo", "arguments": {"value": 4}},
+        ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["error"] == {"status_code": 404, "detail": "No such employee"}
+    assert results[1]["error"] == {"status_code": 404, "detail": "Unknown or expired cursor"}
+    assert results[2]["error"] == {"status_code": 500, "detail": "Internal error"}
+    assert "hunter2" not in response.text
+    assert "hunter2" in caplog.text
+    assert results[3]["result"] == {"value": 4}
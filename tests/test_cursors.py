@@ -0,0 +1,69 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+import xmcp.auth_context as auth_context
+import xmcp.codec as codec
+import xmcp.cursors as cursors
+import xmcp.main as main
+from conftest import AUTH
+
+ROWS = [{"Id": f"row-{n}", "leaveDate": "2025-06-02", "status": "Approved"} for n in range(30)]
+
+
+@pytest.fixture(autouse=True)
+def _store(monkeypatch):
+    monkeypatch.setattr(cursors, "THRESHOLD_BYTES", 200)
+    monkeypatch.setattr(cursors, "store", cursors.CursorStore(max_bytes=1 << 20, max_entries=10, ttl=60))
+    auth_context.set_request_headers({"Authorization": AUTH})
+    yield
+    auth_context.set_request_headers({})
+
+
+def test_oversized_result_is_served_in_chunks():
+    first = cursors.limit({"statusCode": 200, "data": ROWS})
+    assert first["statusCode"] == 200
+    assert len(codec.dumps(first["data"])) <= 200
+    seen, remaining = list(first["data"]), [first["remainingRecords"]]
+    cursor = first["nextCursor"]
+    while cursor is not None:
+        more = cursors.fetch_more(cursor)
+        assert len(codec.dumps(more["data"])) <= 200
+        seen += more["data"]
+        remaining.append(more["remainingRecords"])
+        cursor = more["nextCursor"]
+    assert seen == ROWS
+    assert remaining == sorted(remaining, reverse=True) and remaining[-1] == 0
+
+
+def test_small_result_is_returned_whole():
+    result = {"data": ROWS[:2]}
+    assert cursors.limit(result) is result
+
+
+def test_cursor_belongs_to_the_caller_that_made_it():
+    cursor = cursors.limit({"data": ROWS})["nextCursor"]
+    auth_context.set_request_headers({"Authorization": "Bearer someone-else"})
+    with pytest.raises(cursors.UnknownCursor):
+        cursors.fetch_more(cursor)
+    auth_context.set_request_headers({"Authorization": AUTH})
+    assert cursors.fetch_more(cursor)["data"]
+
+
+def test_cursor_expires_when_idle(monkeypatch):
+    monkeypatch.setattr(cursors, "store", cursors.CursorStore(max_bytes=1 << 20, max_entries=10, ttl=0.01))
+    cursor = cursors.limit({"data": ROWS})["nextCursor"]
+    time.sleep(0.02)
+    with pytest.raises(cursors.UnknownCursor):
+        cursors.fetch_more(cursor)
+    assert cursors.store.stats()["entries"] == 0
+
+
+def test_unknown_cursor_is_a_404():
+    response = TestClient(main.app).post(
+        "/mcp-compat/invoke",
+        json={"name": "fetch_more", "arguments": {"cursor": "no-such-cursor.1"}},
+        headers={"Authorization": AUTH},
+    )
+    assert response.status_code == 404
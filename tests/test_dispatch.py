@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import xmcp.tool_registry as tool_registry
+import xmcp.tools.base as tools_base
+from conftest import AUTH, BASE_URL
+
+PAGES = 3
+
+
+def _page(request: httpx.Request, rows) -> httpx.Response:
+    if request.method == "POST":
+        page = int(json.loads(request.content)["page"])
+    else:
+        page = int(request.url.params["page"])
+    return httpx.Response(200, json={
+        "statusCode": 200,
+        "statusMessage": "OK",
+        "data": rows(page),
+        "paginate": {"totalRecords": PAGES, "totalPerpage": 1, "totalPage": PAGES, "currentPage": page},
+    })
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    path = request.url.path
+    if path.endswith("/my/tickets"):
+        # HRMS leaves optional fields out; the model fills them with null
+        return _page(request, lambda page: [{"Id": f"t{page}", "status": "Open"}])
+    if path.endswith("/my-regularized-attendance"):
+        return _page(request, lambda page: [{"Id": f"a{page}", "attendanceDate": "2025-06-02"}])
+    return _page(request, lambda page: [{"Id": f"o{page}", "title": "Engineer"}])
+
+
+CALLS = [
+    ("get_tickets", {"id": "emp-1", "status": "Open", "allPages": True}),
+    ("list_arrs", {"year": 2025, "month": 6, "allPages": True}),
+    ("search_openings", {"allPages": True, "pageSize": 1}),
+]
+
+
+def _call(dispatch: str, name: str, args: dict):
+    specs = tool_registry.all_tool_specs(BASE_URL, lambda: AUTH, dispatch=dispatch)
+    spec = next(spec for spec in specs if spec.name == name)
+    return asyncio.run(spec.coroutine(**args))
+
+
+@pytest.mark.parametrize("name,args", CALLS, ids=[name for name, _ in CALLS])
+def test_all_pages_results_match_across_dispatch_modes(hrms, name, args):
+    hrms(_handler)
+    inprocess = _call(tools_base.DISPATCH_INPROCESS, name, args)
+    asgi = _call(tools_base.DISPATCH_ASGI, name, args)
+    assert inprocess == asgi
+    assert len(inprocess["data"]) == PAGES
@@ -0,0 +1,21 @@
+from fastapi.testclient import TestClient
+
+import xmcp.main as main
+import xmcp.projection as projection
+import xmcp.rows as rows
+
+
+def test_selector_cache_stats_count_lookups():
+    projection.selector.cache_clear()
+    rows._selected.cache_clear()
+    for _ in range(3):
+        projection.selector(("leaveDate",))
+        rows._selected(rows.LeaveRow, ("leaveDate",))
+    assert projection.selector_cache_stats() == {"hits": 2, "misses": 1, "size": 1}
+    assert rows.selector_cache_stats() == {"hits": 2, "misses": 1, "size": 1}
+
+
+def test_metrics_endpoint_reports_cache_lookups():
+    response = TestClient(main.app).get("/metrics")
+    assert response.status_code == 200
+    assert 'xmcp_cache_lookups_total{cache="rows",result="hit"}' in response.text
@@ -0,0 +1,40 @@
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import xmcp.main as main
+import xmcp.passthrough as passthrough
+from conftest import AUTH
+
+HOLIDAYS = {
+    "statusCode": 200,
+    "statusMessage": "OK",
+    "data": [{"holidayDate": "2025-01-26", "descText": "Republic Day", "type": "Gazetted"}],
+}
+
+
+@pytest.fixture(autouse=True)
+def _passthrough(monkeypatch):
+    monkeypatch.setattr(passthrough, "PASSTHROUGH", frozenset({"leaves.holidays"}))
+
+
+def test_forwards_hrms_bytes_and_content_type(hrms):
+    body = json.dumps(HOLIDAYS, separators=(",", ":")).encode()
+    seen = hrms(lambda request: httpx.Response(
+        200, content=body, headers={"Content-Type": "application/json; charset=utf-8"}
+    ))
+    client = TestClient(main.app)
+    for _ in range(2):  # the second one is served from the cache
+        response = client.get("/holidays", params={"year": 2025}, headers={"Authorization": AUTH})
+        assert response.status_code == 200
+        assert response.content == body
+        assert response.headers["content-type"] == "application/json; charset=utf-8"
+    assert len(seen) == 1
+
+
+def test_falls_back_to_json_without_content_type(hrms):
+    hrms(lambda request: httpx.Response(200, content=json.dumps(HOLIDAYS).encode()))
+    response = TestClient(main.app).get("/holidays", params={"year": 2025}, headers={"Authorization": AUTH})
+    assert response.headers["content-type"] == "application/json"
@@ -0,0 +1,38 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import xmcp.main as main
+import xmcp.tools.base as tools_base
+
+
+@pytest.mark.parametrize(
+    "dispatch, workers, token, starts",
+    [
+        ("loopback", "4", None, False),
+        ("loopback", "4", "shared-secret", True),
+        ("loopback", None, None, True),
+        ("asgi", "4", None, True),
+        ("inprocess", "4", None, True),
+    ],
+)
+def test_loopback_across_workers_needs_a_shared_token(monkeypatch, dispatch, workers, token, starts):
+    monkeypatch.setenv("XMCP_TOOL_DISPATCH", dispatch)
+    for name, value in (("WEB_CONCURRENCY", workers), ("XMCP_INTERNAL_TOKEN", token)):
+        if value is None:
+            monkeypatch.delenv(name, raising=False)
+        else:
+            monkeypatch.setenv(name, value)
+    if starts:
+        tools_base.check_internal_token(tools_base.default_dispatch())
+    else:
+        with pytest.raises(RuntimeError, match="XMCP_INTERNAL_TOKEN"):
+            tools_base.check_internal_token(tools_base.default_dispatch())
+
+
+def test_app_refuses_to_start_without_a_shared_token(monkeypatch):
+    monkeypatch.setenv("WEB_CONCURRENCY", "2")
+    monkeypatch.delenv("XMCP_TOOL_DISPATCH", raising=False)
+    monkeypatch.delenv("XMCP_INTERNAL_TOKEN", raising=False)
+    with pytest.raises(RuntimeError):
+        with TestClient(main.app):
+            pass
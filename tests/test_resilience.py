@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+import xmcp.breaker as breaker
+import xmcp.resilience as resilience
+
+REQUEST = httpx.Request("GET", "http://hrms.test/app/ping")
+
+
+@pytest.fixture(autouse=True)
+def _fast_retries(monkeypatch):
+    monkeypatch.setattr(resilience, "BASE_DELAY", 0.0)
+    monkeypatch.setattr(resilience, "HEDGE", False)
+
+
+def _failing(sends):
+    async def send():
+        sends.append(1)
+        return httpx.Response(503, request=REQUEST)
+
+    return send
+
+
+def test_breaker_opens_half_opens_and_closes():
+    circuit = breaker.CircuitBreaker("app", failures=2, reset_after=0.05, limit=0)
+    for _ in range(2):
+        probe = circuit.acquire(REQUEST)
+        circuit.release()
+        circuit.record(False, probe)
+    assert circuit.state == breaker.OPEN
+    with pytest.raises(breaker.CircuitOpen):
+        circuit.acquire(REQUEST)
+
+    time.sleep(0.06)
+    probe = circuit.acquire(REQUEST)
+    assert probe and circuit.state == breaker.HALF_OPEN
+    with pytest.raises(breaker.CircuitOpen):  # one probe at a time
+        circuit.acquire(REQUEST)
+    circuit.release()
+    circuit.record(False, probe)
+    assert circuit.state == breaker.OPEN  # a failed probe opens it again
+
+    time.sleep(0.06)
+    probe = circuit.acquire(REQUEST)
+    circuit.release()
+    circuit.record(True, probe)
+    assert circuit.state == breaker.CLOSED
+    assert circuit.stats()["opened"] == 2
+    assert circuit.stats()["short_circuited"] == 2
+
+
+def test_retries_stop_after_the_configured_count():
+    sends = []
+    response = asyncio.run(resilience.call(_failing(sends), "/app/ping"))
+    assert response.status_code == 503
+    assert len(sends) == resilience.RETRIES + 1
+
+
+def test_retries_stay_within_the_budget(monkeypatch):
+    # One token to spend, and none earned by requests or time
+    budget = resilience.RetryBudget(ratio=0.0, min_per_second=0.0, cap=10.0)
+    monkeypatch.setattr(resilience, "budget", budget)
+    sends = []
+
+    async def scenario():
+        for _ in range(5):
+            await resilience.call(_failing(sends), "/app/ping")
+
+    asyncio.run(scenario())
+    assert len(sends) == 5 + 1
+    assert budget.exhausted == 5
+    assert resilience.stats()["budget_exhausted"] == 5
+
+
+def test_connection_errors_are_retried_then_raised():
+    sends = []
+
+    async def send():
+        sends.append(1)
+        raise httpx.ConnectError("refused", request=REQUEST)
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(resilience.call(send, "/app/ping"))
+    assert len(sends) == resilience.RETRIES + 1
@@ -0,0 +1,49 @@
+import json
+from datetime import date
+from typing import Optional
+
+import pytest
+
+import xmcp.rows as rows
+
+LEAVE = {
+    "Id": "leave-1",
+    "category": "Casual",
+    "type": "Debit",
+    "status": "Approved",
+    "leaveDate": "2025-06-02",
+    "leaveCount": 1,
+    "appliedDate": "2025-05-30",
+    "employeeId": "emp-1",
+    "employeeFinancialYearId": "efy-7c1d",
+    "createdAt": "2025-05-30T10:00:00Z",
+    "updatedAt": "2025-05-30T10:00:00Z",
+}
+FIELDS = [
+    ("id", str),
+    ("leaveDate", date),
+    ("leaveCount", float),
+    ("comments", Optional[str], None),
+]
+
+
+@pytest.fixture(params=["msgspec", "pydantic"])
+def row_type(request, monkeypatch):
+    if request.param == "msgspec":
+        pytest.importorskip("msgspec")
+    else:
+        monkeypatch.setattr(rows, "msgspec", None)
+    return rows._row_type("LeaveRow", FIELDS)
+
+
+def test_undeclared_row_keys_are_dropped(row_type):
+    body = json.dumps({"statusCode": 200, "data": [{**LEAVE, "extra": {"nested": 1}}]})
+    page = rows.decode_page(body.encode(), row_type)
+    assert page.meta == {"statusCode": 200}
+    assert rows.dump(page.rows[0]) == {"Id": "leave-1", "leaveDate": "2025-06-02", "leaveCount": 1.0, "comments": None}
+
+
+def test_wrong_field_type_is_a_value_error(row_type):
+    body = json.dumps({"data": [{**LEAVE, "leaveCount": "many"}]})
+    with pytest.raises(ValueError):
+        rows.decode_page(body.encode(), row_type)
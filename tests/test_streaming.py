@@ -0,0 +1,66 @@
+import asyncio
+import json
+
+import httpx
+from fastapi.testclient import TestClient
+
+import xmcp.main as main
+import xmcp.rows as rows
+import xmcp.streaming as streaming
+from conftest import AUTH
+from xmcp.tools.attendance.models import AttendanceResponse
+
+NDJSON = {"Authorization": AUTH, "Accept": streaming.NDJSON}
+
+
+def _ticket(number: int) -> dict:
+    return {"Id": f"t-{number}", "category": "IT", "status": "Open", "assignee": "desk", "createdAt": None, "updatedAt": None}
+
+
+def _tickets(request: httpx.Request) -> httpx.Response:
+    page = int(request.url.params["page"])
+    paginate = {"totalRecords": 4, "totalPerpage": 2, "totalPage": 2, "currentPage": page}
+    data = [_ticket(2 * page - 1), _ticket(2 * page)]
+    return httpx.Response(200, json={"statusCode": 200, "statusMessage": "OK", "data": data, "paginate": paginate})
+
+
+def _lines(response) -> list:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_tickets_stream_one_row_shape_for_one_and_all_pages(hrms):
+    hrms(_tickets)
+    client = TestClient(main.app)
+    params = {"id": "emp-1", "status": "Open"}
+    single = _lines(client.get("/tickets/my", params={**params, "page": 2}, headers=NDJSON))
+    every = _lines(client.get("/tickets/my", params={**params, "allPages": "true"}, headers=NDJSON))
+    assert every[2:4] == single[:2]
+    assert set(every[0]) == {"Id", "category", "status", "createdAt", "updatedAt"}
+    assert every[-1]["_meta"]["paginate"]["totalPage"] == 2
+    assert single[-1]["_meta"]["paginate"]["currentPage"] == 2
+
+
+def test_rows_are_dumped_as_they_are_written(monkeypatch):
+    row = {"Id": "a-1", "attendanceDate": "2025-03-03", "createdAt": "2025-03-03T09:00:00Z", "updatedAt": "2025-03-03T09:00:00Z"}
+    body = {
+        "statusCode": 200,
+        "statusMessage": "OK",
+        "data": [{**row, "Id": f"a-{n}"} for n in range(50)],
+        "paginate": {"totalRecords": 50, "totalPerpage": 50, "totalPage": 1, "currentPage": 1},
+    }
+    page = rows.decode_page(json.dumps(body).encode(), rows.AttendanceRow)
+    dumped = []
+    dump = rows.dump
+    monkeypatch.setattr(rows, "dump", lambda row, fields=None: dumped.append(1) or dump(row, fields))
+
+    async def scenario():
+        response = await streaming.ndjson_page(page, AttendanceResponse, ("attendanceDate",))
+        before = len(dumped)
+        chunks = [chunk async for chunk in response.body_iterator]
+        return before, chunks
+
+    before, chunks = asyncio.run(scenario())
+    assert before == 1  # only the first row, read before the response starts
+    assert len(chunks) == 51
+    assert json.loads(chunks[0]) == {"attendanceDate": "2025-03-03"}
+    assert json.loads(chunks[-1])["_meta"]["paginate"]["totalRecords"] == 50
@@ -0,0 +1,140 @@
+import asyncio
+
+import httpx
+from fastapi.testclient import TestClient
+
+import xmcp.main as main
+import xmcp.upstream as upstream
+from conftest import AUTH
+
+ANSWER = b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 2\r\n\r\n{}"
+
+
+async def _serve():
+    async def handle(reader, writer):
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(ANSWER)
+            await writer.drain()
+
+    return await asyncio.start_server(handle, "localhost", 0)
+
+
+def test_pool_stats_count_connections_of_the_real_pool():
+    async def scenario():
+        server = await _serve()
+        port = server.sockets[0].getsockname()[1]
+        try:
+            response = await upstream.get_client().get(f"http://localhost:{port}/app/ping")
+            stats = upstream.pool_stats()
+            resolver = upstream._pools[upstream.get_client()].pool._network_backend
+            await upstream.aclose()
+            return response, stats, resolver
+        finally:
+            server.close()
+
+    response, stats, resolver = asyncio.run(scenario())
+    assert response.json() == {}
+    assert (stats["active"], stats["idle"], stats["waiting"]) == (0, 1, 0)
+    assert isinstance(resolver, upstream.CachingResolverBackend)
+
+
+def test_pool_errors_surface_as_httpx_errors():
+    async def scenario():
+        server = await _serve()
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        try:
+            await upstream.get_client().get(f"http://localhost:{port}/app/ping")
+        finally:
+            await upstream.aclose()
+
+    try:
+        asyncio.run(scenario())
+    except httpx.ConnectError:
+        pass
+    else:
+        raise AssertionError("expected httpx.ConnectError")
+
+
+def test_pool_stats_skip_a_pool_they_cannot_read():
+    async def scenario():
+        transport = upstream._pools[upstream.get_client()]
+        pool, transport.pool = transport.pool, object()
+        try:
+            return upstream.pool_stats()
+        finally:
+            transport.pool = pool
+            await upstream.aclose()
+
+    stats = asyncio.run(scenario())
+    assert (stats["active"], stats["idle"], stats["waiting"]) == (0, 0, 0)
+
+
+def test_stats_endpoints_answer_with_a_mock_transport(hrms):
+    hrms(lambda request: httpx.Response(200, json={}))
+    client = TestClient(main.app)
+    assert client.get("/admin/stats").json()["pool"]["active"] == 0
+    assert "xmcp_upstream_pool_waiting 0" in client.get("/metrics").text
+
+
+def test_identical_concurrent_reads_share_one_request(hrms):
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        return httpx.Response(200, json={"data": [1]})
+
+    seen = hrms(handler)
+
+    async def scenario():
+        reads = [
+            asyncio.ensure_future(upstream.get("http://hrms.test/app/x", params={"a": 1}, headers={"Authorization": AUTH}))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+        return await asyncio.gather(*reads)
+
+    before = upstream.coalescing_stats()
+    responses = asyncio.run(scenario())
+    after = upstream.coalescing_stats()
+    assert len(seen) == 1
+    assert [response.json() for response in responses] == [{"data": [1]}] * 5
+    assert after["coalesced"] - before["coalesced"] == 4
+
+
+def test_a_failed_read_fails_every_waiter(hrms):
+    release = asyncio.Event()
+
+    async def handler(request):
+        await release.wait()
+        raise httpx.ReadError("connection reset", request=request)
+
+    seen = hrms(handler)
+
+    async def scenario():
+        reads = [
+            asyncio.ensure_future(upstream.get("http://hrms.test/app/x", headers={"Authorization": AUTH}))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        release.set()
+        return await asyncio.gather(*reads, return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert len(seen) == 1
+    assert all(isinstance(result, httpx.ReadError) for result in results)
+
+
+def test_reads_from_different_callers_are_not_shared(hrms):
+    seen = hrms(lambda request: httpx.Response(200, json={}))
+
+    async def scenario():
+        await asyncio.gather(
+            upstream.get("http://hrms.test/app/x", headers={"Authorization": AUTH}),
+            upstream.get("http://hrms.test/app/x", headers={"Authorization": "Bearer other-token"}),
+        )
+
+    asyncio.run(scenario())
+    assert len(seen) == 2